@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Concurrent-writer benchmark for the database profiles in mindtimer/settings.py
+
+Each worker process runs read-then-write transactions (count the task lists,
+then insert a TaskList and a Schedule), which is the pattern that fails with
+"database is locked" under SQLite's default deferred transactions.
+
+Usage (from the reimagined/ directory):
+    python -m benchmarks.concurrent_writers
+    python -m benchmarks.concurrent_writers --workers 8 --writes 200 --profiles sqlite-default sqlite-tuned
+    DB_PROFILE settings for postgres are read from POSTGRES_* environment variables
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+PROFILES = {
+    'sqlite-default': {'DB_PROFILE': 'sqlite', 'SQLITE_TUNED': 'false'},
+    'sqlite-tuned': {'DB_PROFILE': 'sqlite', 'SQLITE_TUNED': 'true'},
+    'postgres': {'DB_PROFILE': 'postgres'},
+}
+
+
+def profile_env(profile, db_path):
+    env = dict(os.environ)
+    env.update(PROFILES[profile])
+    env['SQLITE_PATH'] = db_path
+    env['DJANGO_SETTINGS_MODULE'] = 'mindtimer.settings'
+    return env
+
+
+def migrate(env):
+    subprocess.run(
+        [sys.executable, 'manage.py', 'migrate', '--noinput', '-v', '0'],
+        cwd=BASE_DIR, env=env, check=True,
+    )
+
+
+def writer(args):
+    """Worker process body: returns (latencies in seconds, lock error count)"""
+    env, worker_id, writes = args
+    os.environ.update(env)
+    sys.path.insert(0, str(BASE_DIR))
+
+    import django
+    django.setup()
+    from django.db import OperationalError, transaction
+    from tasks.models import TaskList, Schedule
+
+    latencies = []
+    errors = 0
+    for i in range(writes):
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                TaskList.objects.count()
+                task_list = TaskList.objects.create(name=f"bench-{worker_id}-{i}", raw_input="benchmark")
+                Schedule.objects.create(task_list=task_list)
+        except OperationalError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+    return latencies, errors
+
+
+def run_profile(profile, workers, writes):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = profile_env(profile, os.path.join(tmp, 'bench.sqlite3'))
+        migrate(env)
+
+        ctx = multiprocessing.get_context('spawn')
+        start = time.perf_counter()
+        with ctx.Pool(workers) as pool:
+            results = pool.map(writer, [(env, n, writes) for n in range(workers)])
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(lat for worker_latencies, _ in results for lat in worker_latencies)
+    errors = sum(err for _, err in results)
+    return {
+        'profile': profile,
+        'workers': workers,
+        'attempted': workers * writes,
+        'committed': len(latencies),
+        'lock_errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'tx_per_s': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--writes', type=int, default=100, help="Transactions per worker")
+    parser.add_argument('--profiles', nargs='+', default=['sqlite-default', 'sqlite-tuned'], choices=sorted(PROFILES))
+    parser.add_argument('--json', help="Write results to this file as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for profile in args.profiles:
+        try:
+            result = run_profile(profile, args.workers, args.writes)
+        except Exception as e:  # e.g. postgres not configured or driver missing
+            print(f"{profile}: skipped ({e})")
+            continue
+        results.append(result)
+        print(
+            f"{profile:15} committed {result['committed']}/{result['attempted']}  "
+            f"lock errors {result['lock_errors']:4}  {result['tx_per_s']:8} tx/s  "
+            f"p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms"
+        )
+
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
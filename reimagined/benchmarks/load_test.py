@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+HTTP load test of the ToDo Timeline flow
+
+Each virtual user loops through the real URLs: GET the input page (CSRF
+cookie), POST process/, then GET the dependencies and timeline pages it was
+redirected to. Users start evenly over --ramp seconds and run until
+--duration elapses. Reports throughput and p50/p95/p99 latency per endpoint
+on the console and as JSON.
+
+By default the target is a threaded WSGI server started in a subprocess
+(so it doesn't share a GIL with the load generator) on a throwaway database,
+with ClaudeTaskGroomer.groom_tasks stubbed to return synthetic tasks after
+--llm-latency seconds. --url points it at a running deployment instead; that
+deployment then decides how the groomer behaves.
+
+Usage (from the reimagined/ directory):
+    python -m benchmarks.load_test --users 20 --ramp 5 --duration 30
+    python -m benchmarks.load_test --users 50 --llm-latency 0.5 --output load.json
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --users 10
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urljoin
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FLOW = '/personal-assistance/executive-function/todo-timeline/'
+ENDPOINTS = ('todo_timeline_input', 'process_todo_timeline', 'todo_dependencies', 'timeline_execution')
+
+
+# Server side -----------------------------------------------------------------
+
+def serve(port, tasks_per_flow, llm_latency):
+    """Serve the project on a throwaway SQLite file with a stubbed groomer (subprocess entry point)"""
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mindtimer.settings')
+    os.environ.setdefault('CLAUDE_API_KEY', 'load-test')
+
+    import django
+    django.setup()
+
+    from socketserver import ThreadingMixIn
+    from unittest.mock import patch
+    from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connection
+
+    from tasks.synthetic import TASK_ID_SPACE, dag_edges, task_fields
+
+    class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+        daemon_threads = True
+        request_queue_size = 1024
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    # task_ids are unique across the database: hand them out from a shuffled pool
+    pool = [f"{n:04x}" for n in range(TASK_ID_SPACE)]
+    random.shuffle(pool)
+    pool_lock = threading.Lock()
+    rng = random.Random()
+
+    def groom_tasks(self, todo_text, context=""):
+        time.sleep(llm_latency)
+        with pool_lock:
+            if len(pool) < tasks_per_flow:
+                return {"success": False, "error": "task_id space exhausted", "analysis": "", "tasks": []}
+            task_ids = [pool.pop() for _ in range(tasks_per_flow)]
+        dependencies = defaultdict(list)
+        for i, j in dag_edges(tasks_per_flow, 'layered', 0.5, rng):
+            dependencies[i].append(task_ids[j])
+        tasks = []
+        for index, task_id in enumerate(task_ids):
+            fields = task_fields(index, rng)
+            tasks.append({
+                "task": fields['title'],
+                "task_id": task_id,
+                "time_estimate": f"{fields['estimated_duration'] // 60:02d}:{fields['estimated_duration'] % 60:02d}",
+                "dependencies": dependencies[index],
+                "priority": fields['priority'],
+            })
+        return {"success": True, "analysis": "Load test tasks.", "tasks": tasks}
+
+    connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.mkdtemp(), 'load_test.sqlite3')
+    connection.creation.create_test_db(verbosity=0)
+    connection.close()
+
+    with patch('tasks.services.ClaudeTaskGroomer.groom_tasks', groom_tasks):
+        server = make_server(
+            '127.0.0.1', port, get_wsgi_application(),
+            server_class=ThreadingWSGIServer, handler_class=QuietHandler,
+        )
+        print('ready', flush=True)
+        server.serve_forever()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(tasks_per_flow, llm_latency):
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.load_test', '--serve', '--port', str(port),
+         '--tasks-per-flow', str(tasks_per_flow), '--llm-latency', str(llm_latency)],
+        cwd=BASE_DIR, stdout=subprocess.PIPE, text=True,
+    )
+    if process.stdout.readline().strip() != 'ready':
+        process.kill()
+        raise RuntimeError("Load test server failed to start")
+    return process, f"http://127.0.0.1:{port}"
+
+
+# Load generator --------------------------------------------------------------
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.flows = 0
+
+    def record(self, endpoint, seconds, ok):
+        with self.lock:
+            self.latencies[endpoint].append(seconds)
+            if not ok:
+                self.errors[endpoint] += 1
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def user_loop(base_url, deadline, recorder, timeout):
+    import requests
+
+    session = requests.Session()
+
+    def timed(endpoint, method, url, ok_status, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=timeout, allow_redirects=False, **kwargs)
+            ok = response.status_code == ok_status
+        except requests.RequestException:
+            response, ok = None, False
+        recorder.record(endpoint, time.perf_counter() - start, ok)
+        return response if ok else None
+
+    while time.monotonic() < deadline:
+        if not timed('todo_timeline_input', 'GET', urljoin(base_url, FLOW), 200):
+            continue
+        response = timed(
+            'process_todo_timeline', 'POST', urljoin(base_url, FLOW + 'process/'), 302,
+            data={
+                'csrfmiddlewaretoken': session.cookies.get('csrftoken', ''),
+                'task_list_name': 'Load test',
+                'todo_text': 'Clean the flat, do the laundry and prepare the quarterly report',
+            },
+            headers={'Referer': urljoin(base_url, FLOW)},
+        )
+        if response is None:
+            continue
+        dependencies_url = urljoin(base_url, response.headers['Location'])
+        if not timed('todo_dependencies', 'GET', dependencies_url, 200):
+            continue
+        task_list_id = re.search(r'/(\d+)/?$', dependencies_url).group(1)
+        if timed('timeline_execution', 'GET', urljoin(base_url, f'{FLOW}execute/{task_list_id}/'), 200):
+            with recorder.lock:
+                recorder.flows += 1
+
+
+def run_load(base_url, users, ramp, duration, timeout):
+    recorder = Recorder()
+    started = time.monotonic()
+    deadline = started + duration
+    threads = []
+    for n in range(users):
+        thread = threading.Thread(target=user_loop, args=(base_url, deadline, recorder, timeout), daemon=True)
+        threads.append(thread)
+        delay = started + ramp * n / users - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder, time.monotonic() - started
+
+
+def summarize(recorder, elapsed):
+    endpoints = {}
+    for endpoint in ENDPOINTS:
+        values = sorted(recorder.latencies.get(endpoint, []))
+        endpoints[endpoint] = {
+            'requests': len(values),
+            'errors': recorder.errors.get(endpoint, 0),
+            'throughput_rps': round(len(values) / elapsed, 2),
+            **{
+                f'p{int(q * 100)}_ms': round(percentile(values, q) * 1000, 2) if values else None
+                for q in (0.5, 0.95, 0.99)
+            },
+            'max_ms': round(values[-1] * 1000, 2) if values else None,
+        }
+    return {
+        'elapsed_s': round(elapsed, 2),
+        'flows': recorder.flows,
+        'flows_per_s': round(recorder.flows / elapsed, 2),
+        'endpoints': endpoints,
+    }
+
+
+def print_summary(summary):
+    print(f"{'endpoint':24} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'max ms':>9}")
+    for endpoint, row in summary['endpoints'].items():
+        cells = [row[key] if row[key] is not None else '-' for key in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms')]
+        print(f"{endpoint:24} {row['requests']:>8} {row['errors']:>6} {row['throughput_rps']:>8} "
+              + ' '.join(f"{cell:>9}" for cell in cells))
+    print(f"\n{summary['flows']} complete flows in {summary['elapsed_s']} s ({summary['flows_per_s']} flows/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help="Target a running deployment instead of a local stubbed server")
+    parser.add_argument('--users', type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument('--ramp', type=float, default=5.0, help="Seconds over which users start")
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds of load, including the ramp")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument('--llm-latency', type=float, default=0.0, help="Stubbed groomer delay in seconds")
+    parser.add_argument('--tasks-per-flow', type=int, default=6, help="Tasks the stubbed groomer returns")
+    parser.add_argument('--output', help="Write the summary as JSON to this file")
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.tasks_per_flow, args.llm_latency)
+        return
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server, base_url = start_server(args.tasks_per_flow, args.llm_latency)
+    try:
+        print(f"Load testing {base_url}: {args.users} users, {args.ramp}s ramp, {args.duration}s\n")
+        recorder, elapsed = run_load(base_url, args.users, args.ramp, args.duration, args.timeout)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    summary = summarize(recorder, elapsed)
+    print_summary(summary)
+    if args.output:
+        report = {
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'target': args.url or 'local stubbed server',
+            'users': args.users,
+            'ramp_s': args.ramp,
+            'duration_s': args.duration,
+            'llm_latency_s': args.llm_latency,
+            **summary,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
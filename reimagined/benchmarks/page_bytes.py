@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Bytes on the wire per page, before and after the static asset pipeline
+
+"Before" is the page as it used to ship: uncompressed HTML with every
+stylesheet inlined. "After" is gzipped HTML plus, on the first visit only,
+the precompressed stylesheets (repeat visits hit the browser cache).
+
+Usage (from the reimagined/ directory):
+    python -m benchmarks.page_bytes
+"""
+import gzip
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mindtimer.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.staticfiles import finders  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+STYLESHEET = re.compile(r'<link rel="stylesheet" href="/static/([^"]+)">')
+
+
+def create_sample_task_list():
+    from tasks.models import Task, TaskList
+
+    task_list = TaskList.objects.create(name="Interview prep", raw_input="Prepare for job interview",
+                                        analysis="Research first, then practice.")
+    for n in range(8):
+        Task.objects.create(title=f"Task {n}", description=f"Step {n} of the preparation",
+                            estimated_duration=30, task_list=task_list)
+    return task_list
+
+
+def measure(client, url):
+    html = client.get(url).content
+    stylesheets = [Path(finders.find(name)).read_bytes() for name in STYLESHEET.findall(html.decode())]
+    css = sum(len(sheet) for sheet in stylesheets)
+    css_gz = sum(len(gzip.compress(sheet, 9)) for sheet in stylesheets)
+    html_gz = len(gzip.compress(html, 6))
+    return {
+        'before': len(html) + css,
+        'first_visit': html_gz + css_gz,
+        'repeat_visit': html_gz,
+    }
+
+
+def main():
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        task_list = create_sample_task_list()
+        base = '/personal-assistance/executive-function/todo-timeline/'
+        pages = {
+            'personal_assistance': '/personal-assistance/',
+            'executive_function': '/personal-assistance/executive-function/',
+            'todo_timeline_input': base,
+            'todo_dependencies': f'{base}dependencies/{task_list.id}/',
+            'timeline_execution': f'{base}execute/{task_list.id}/',
+            'results': f'/results/{task_list.id}/',
+        }
+        client = Client()
+        print(f"{'page':22} {'before':>8} {'first visit':>12} {'repeat visit':>13}")
+        for name, url in pages.items():
+            sizes = measure(client, url)
+            print(f"{name:22} {sizes['before']:>8} {sizes['first_visit']:>12} {sizes['repeat_visit']:>13}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Makespan of the exact scheduler (tasks.scheduling) against simpler plans
+
+For synthetic dependency DAGs (tasks.synthetic shapes and durations), each
+row averages over --lists random lists:
+
+- sequential: one task at a time in schedule order, as the task list page runs them
+- naive: schedule order, each task on the first free lane
+- critical path: list schedule by longest remaining chain (the optimizer's first plan)
+- optimized: branch and bound within --budget-ms
+
+"gap" is how far the optimized plan may still be from the lower bound,
+averaged over the lists. It is 0 when every plan is proven optimal.
+
+Usage (from the reimagined/ directory):
+    python -m benchmarks.schedule_bench
+    python -m benchmarks.schedule_bench --sizes 10 30 --lanes 3 --budget-ms 100 --json schedule.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mindtimer.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from tasks.scheduling import (  # noqa: E402
+    critical_path_tails, list_schedule, makespan_of, optimize, sequential_makespan, topological_order,
+)
+from tasks.synthetic import DURATIONS, dag_edges  # noqa: E402
+
+
+def random_list(count, shape, density, rng):
+    durations = [rng.choice(DURATIONS) for _ in range(count)]
+    dependencies = [[] for _ in range(count)]
+    for task, dependency in dag_edges(count, shape, density, rng):
+        dependencies[task].append(dependency)
+    return durations, dependencies
+
+
+def run_case(count, shape, lanes, lists, density, budget_ms, seed):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(lists):
+        durations, dependencies = random_list(count, shape, density, rng)
+        tails = critical_path_tails(durations, dependencies, topological_order(dependencies))
+        plan = optimize(durations, dependencies, lanes, budget_ms)
+        rows.append({
+            'sequential': sequential_makespan(durations),
+            'naive': makespan_of(list_schedule(durations, dependencies, lanes)[0], durations),
+            'critical_path': makespan_of(list_schedule(durations, dependencies, lanes, [-tail for tail in tails])[0], durations),
+            'optimized': plan.makespan,
+            'gap': (plan.makespan - plan.lower_bound) / plan.makespan if plan.makespan else 0.0,
+            'optimal': plan.optimal,
+            'ms': plan.elapsed_ms,
+        })
+    mean = {key: statistics.fmean(row[key] for row in rows) for key in ('sequential', 'naive', 'critical_path', 'optimized', 'gap')}
+    return {
+        'tasks': count, 'shape': shape, 'lanes': lanes, 'lists': lists,
+        **{key: round(value, 1) for key, value in mean.items() if key != 'gap'},
+        'saved_vs_sequential': round(1 - mean['optimized'] / mean['sequential'], 3),
+        'gap': round(mean['gap'], 4),
+        'proven_optimal': sum(row['optimal'] for row in rows),
+        'mean_ms': round(statistics.fmean(row['ms'] for row in rows), 1),
+        'max_ms': round(max(row['ms'] for row in rows), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 20, 40, 80], help="Tasks per list")
+    parser.add_argument('--shapes', nargs='+', default=['layered', 'random'], choices=['chain', 'layered', 'random', 'fanout'])
+    parser.add_argument('--lanes', type=int, nargs='+', default=[2, 3])
+    parser.add_argument('--lists', type=int, default=10, help="Random lists per row")
+    parser.add_argument('--density', type=float, default=0.3, help="dag_edges density")
+    parser.add_argument('--budget-ms', type=int, default=500, help="Optimizer time budget per list")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="Write results to this file as JSON")
+    args = parser.parse_args()
+
+    print(
+        f"{'tasks':>5} {'shape':8} {'lanes':>5} {'sequential':>10} {'naive':>7} {'crit.path':>9} {'optimized':>9} "
+        f"{'saved':>6} {'optimal':>8} {'gap':>6} {'mean ms':>8} {'max ms':>7}"
+    )
+    results = []
+    for count in args.sizes:
+        for shape in args.shapes:
+            for lanes in args.lanes:
+                result = run_case(count, shape, lanes, args.lists, args.density, args.budget_ms, args.seed)
+                results.append(result)
+                print(
+                    f"{count:5} {shape:8} {lanes:5} {result['sequential']:10} {result['naive']:7} "
+                    f"{result['critical_path']:9} {result['optimized']:9} {result['saved_vs_sequential']:6.1%} "
+                    f"{result['proven_optimal']:>4}/{args.lists:<3} {result['gap']:6.2%} {result['mean_ms']:8} {result['max_ms']:7}"
+                )
+
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Requests/sec of `manage.py serve` (gunicorn) against `manage.py runserver`
+
+Both servers run with DEBUG off on the same seeded throwaway SQLite
+database. Each one gets the same closed-loop load: --users threads, each
+looping over the results, dependencies, timeline and API detail pages of
+random task lists for --duration seconds. Reports requests/sec and latency
+percentiles for each server, and the speed-up.
+
+Needs gunicorn. Runs collectstatic first, since the manifest storage used
+without DEBUG needs it (STATIC_ROOT is gitignored).
+
+Usage (from the reimagined/ directory):
+    python -m benchmarks.serve_bench
+    python -m benchmarks.serve_bench --users 32 --duration 20 --workers 4 --threads 8 --output serve.json
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.load_test import free_port, percentile
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FLOW = '/personal-assistance/executive-function/todo-timeline/'
+PAGES = ('/results/{id}/', FLOW + 'dependencies/{id}/', FLOW + 'execute/{id}/', '/api/v1/task-lists/{id}/')
+
+
+def manage(env, *args, **kwargs):
+    return subprocess.run([sys.executable, 'manage.py', *args], cwd=BASE_DIR, env=env, check=True, **kwargs)
+
+
+def prepare(env, lists, tasks):
+    manage(env, 'migrate', '-v0')
+    manage(env, 'seed_synthetic', '--lists', str(lists), '--tasks', str(tasks), '--seed', '1', stdout=subprocess.DEVNULL)
+    manage(env, 'collectstatic', '--noinput', '-v0')
+    return list(range(1, lists + 1))
+
+
+def start(env, command, port):
+    process = subprocess.Popen(
+        [sys.executable, 'manage.py', *command, f'127.0.0.1:{port}' if command[0] == 'runserver' else f'--bind=127.0.0.1:{port}'],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    import requests
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f'http://127.0.0.1:{port}/personal-assistance/', timeout=1).status_code == 200:
+                return process
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{command[0]} did not start")
+
+
+def load(base_url, task_list_ids, users, duration, timeout):
+    import requests
+
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def user(seed):
+        rng = random.Random(seed)
+        session = requests.Session()
+        mine, failed = [], 0
+        while time.monotonic() < deadline:
+            url = base_url + rng.choice(PAGES).format(id=rng.choice(task_list_ids))
+            begin = time.perf_counter()
+            try:
+                ok = session.get(url, timeout=timeout).status_code == 200
+            except requests.RequestException:
+                ok = False
+            mine.append(time.perf_counter() - begin)
+            failed += not ok
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=user, args=(n,)) for n in range(users)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'requests_per_s': round(len(latencies) / elapsed, 1),
+        **{f'p{int(q * 100)}_ms': round(percentile(latencies, q) * 1000, 2) for q in (0.5, 0.95, 0.99)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=16, help="Concurrent client threads")
+    parser.add_argument('--duration', type=float, default=15.0, help="Seconds of load per server")
+    parser.add_argument('--warmup', type=float, default=2.0, help="Seconds of unmeasured load per server first")
+    parser.add_argument('--lists', type=int, default=20, help="Task lists to seed")
+    parser.add_argument('--tasks', type=int, default=30, help="Tasks per list")
+    parser.add_argument('--workers', type=int, help="serve --workers (default: its own CPU-based default)")
+    parser.add_argument('--threads', type=int, help="serve --threads")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='serve_bench-')
+    env = {
+        **os.environ,
+        'SQLITE_PATH': os.path.join(workdir, 'db.sqlite3'),
+        'DEBUG': 'False',
+        'ALLOWED_HOSTS': '127.0.0.1',
+        'CLAUDE_API_KEY': os.environ.get('CLAUDE_API_KEY', 'serve-bench'),
+        'METRICS_DIR': os.path.join(workdir, 'metrics'),
+        # serve refuses several workers over the per-process locmem cache
+        'CACHE_BACKEND': 'file',
+        'CACHE_LOCATION': os.path.join(workdir, 'cache'),
+    }
+    task_list_ids = prepare(env, args.lists, args.tasks)
+
+    serve = ['serve']
+    if args.workers:
+        serve.append(f'--workers={args.workers}')
+    if args.threads:
+        serve.append(f'--threads={args.threads}')
+    servers = {'runserver': ['runserver', '--noreload'], 'serve': serve}
+
+    results = {}
+    for name, command in servers.items():
+        port = free_port()
+        process = start(env, command, port)
+        try:
+            base_url = f'http://127.0.0.1:{port}'
+            load(base_url, task_list_ids, args.users, args.warmup, args.timeout)
+            results[name] = load(base_url, task_list_ids, args.users, args.duration, args.timeout)
+        finally:
+            process.terminate()
+            process.wait()
+        row = results[name]
+        print(f"{name:10} {row['requests_per_s']:8} req/s  p50 {row['p50_ms']:8} ms  p95 {row['p95_ms']:8} ms  "
+              f"p99 {row['p99_ms']:8} ms  errors {row['errors']}")
+
+    speedup = results['serve']['requests_per_s'] / results['runserver']['requests_per_s']
+    print(f"\nserve handles {speedup:.2f}x the requests/sec of runserver ({os.cpu_count()} CPUs, {args.users} users)")
+    if args.output:
+        report = {
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'cpu_count': os.cpu_count(),
+            'users': args.users,
+            'duration_s': args.duration,
+            'servers': results,
+            'speedup': round(speedup, 2),
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Count django_session queries for the ToDo Timeline flow
+
+Compares the previous design (analysis kept in request.session on the
+database session backend) with the current one (analysis stored on the
+TaskList, sessions in signed cookies). The previous views are emulated by
+LegacySessionAnalysisMiddleware, which reads and writes the session the way
+process_todo_timeline / todo_dependencies / results used to.
+
+Usage (from the reimagined/ directory):
+    python -m benchmarks.session_traffic
+"""
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mindtimer.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_test_environment  # noqa: E402
+
+from tests.fixtures.claude_responses import COMPLEX_TODO_RESPONSE  # noqa: E402
+
+DB_SESSIONS = 'django.contrib.sessions.backends.db'
+
+
+class LegacySessionAnalysisMiddleware:
+    """Reproduces the old request.session['analysis'] reads and writes"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method == 'POST':
+            request.session['analysis'] = COMPLEX_TODO_RESPONSE['analysis']
+        else:
+            request.session.get('analysis', '')
+        return self.get_response(request)
+
+
+def run_flow():
+    """Returns [(label, session queries, total queries)] for each request in the flow"""
+    from tasks.models import TaskList
+    TaskList.objects.all().delete()  # fixture task_ids are unique per database
+    client = Client()
+    groomed = {
+        'success': True,
+        'analysis': COMPLEX_TODO_RESPONSE['analysis'],
+        'tasks': COMPLEX_TODO_RESPONSE['tasks'],
+    }
+    base = '/personal-assistance/executive-function/todo-timeline/'
+    rows = []
+
+    def measure(label, method, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(client, method)(url, data or {})
+        session_queries = sum('django_session' in q['sql'] for q in queries.captured_queries)
+        rows.append((label, session_queries, len(queries.captured_queries)))
+        return response
+
+    with override_settings(CLAUDE_API_KEY='benchmark'), \
+            patch('tasks.services.ClaudeTaskGroomer.groom_tasks', return_value=groomed):
+        measure('GET input', 'get', base)
+        response = measure('POST process', 'post', base + 'process/', {
+            'task_list_name': 'Interview prep',
+            'todo_text': 'Prepare for job interview',
+        })
+        task_list_id = response.url.rstrip('/').split('/')[-1]
+        for _ in range(3):
+            measure('GET dependencies', 'get', f'{base}dependencies/{task_list_id}/')
+            measure('GET timeline', 'get', f'{base}execute/{task_list_id}/')
+            measure('GET results', 'get', f'/results/{task_list_id}/')
+    return rows
+
+
+def report(title, rows):
+    print(title)
+    for label, session_queries, total in rows:
+        print(f"  {label:18} session queries {session_queries:2}   total queries {total:3}")
+    print(f"  {'TOTAL':18} session queries {sum(r[1] for r in rows):2}   total queries {sum(r[2] for r in rows):3}")
+
+
+def main():
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        legacy = _with_middleware('benchmarks.session_traffic.LegacySessionAnalysisMiddleware')
+        with override_settings(SESSION_ENGINE=DB_SESSIONS, MIDDLEWARE=legacy):
+            report("Before: analysis in request.session, database sessions", run_flow())
+        report("After: analysis on TaskList, signed-cookie sessions", run_flow())
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def _with_middleware(path):
+    from django.conf import settings
+    middleware = list(settings.MIDDLEWARE)
+    index = middleware.index('django.contrib.sessions.middleware.SessionMiddleware') + 1
+    middleware.insert(index, path)
+    return middleware
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for models, services and views
+
+Runs each benchmark at several data sizes on synthetic data (tasks.synthetic)
+in a throwaway test database and writes machine-readable results, tagged with
+the git commit, so runs can be compared across commits.
+
+Usage (from the reimagined/ directory):
+    python -m benchmarks.suite                      # writes benchmarks/results/<commit>.json
+    python -m benchmarks.suite --quick -k views     # smaller sizes, only names containing "views"
+    python -m benchmarks.suite --compare benchmarks/results/abc1234.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = BASE_DIR / 'benchmarks' / 'results'
+
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mindtimer.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from tasks.models import Task, TaskList  # noqa: E402
+from tasks.synthetic import groomed_result, seed_task_lists  # noqa: E402
+
+
+class QueryCounter:
+    """execute_wrapper that counts queries (connection.queries is reset per request)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Suite:
+    def __init__(self, pattern=None, min_time=0.5, max_rounds=200):
+        self.pattern = pattern
+        self.min_time = min_time
+        self.max_rounds = max_rounds
+        self.results = []
+
+    def bench(self, name, params, fn, setup=None, teardown=None):
+        """
+        Time fn() until min_time has elapsed (at least 3, at most max_rounds
+        rounds). setup/teardown run around every round, untimed; setup's
+        return value is passed to fn and teardown.
+        """
+        label = name + ''.join(f"[{key}={value}]" for key, value in params.items())
+        if self.pattern and self.pattern not in label:
+            return
+
+        def once():
+            state = setup() if setup else None
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                fn(state)
+                elapsed = time.perf_counter() - start
+            if teardown:
+                teardown(state)
+            return elapsed, counter.count
+
+        once()  # warm-up
+        timings, spent = [], 0.0
+        while len(timings) < 3 or (spent < self.min_time and len(timings) < self.max_rounds):
+            elapsed, queries = once()
+            timings.append(elapsed)
+            spent += elapsed
+
+        result = {
+            'name': name,
+            'params': params,
+            'rounds': len(timings),
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'mean': statistics.mean(timings),
+            'stddev': statistics.stdev(timings),
+            'queries': queries,
+        }
+        self.results.append(result)
+        print(f"  {label:70} median {result['median'] * 1000:9.3f} ms  "
+              f"min {result['min'] * 1000:9.3f} ms  queries {queries:4}  ({len(timings)} rounds)")
+
+
+def reset_data():
+    TaskList.objects.all().delete()
+    Task.objects.all().delete()
+    cache.clear()
+
+
+def bench_task_ids(suite, sizes):
+    for existing in sizes['existing']:
+        reset_data()
+        if existing:
+            seed_task_lists(lists=existing // 1000 or 1, tasks_per_list=min(existing, 1000), seed=1)
+        task = Task()
+        suite.bench('models.generate_unique_task_id', {'existing': existing}, lambda _: task.generate_unique_task_id())
+
+
+def bench_cycle_check(suite, sizes):
+    for shape in ('chain', 'layered'):
+        for count in sizes['graph']:
+            reset_data()
+            task_list = seed_task_lists(tasks_per_list=count, shape=shape, density=0.5, seed=1)[0]
+            # The most recently created task has the deepest dependency chain
+            task = task_list.tasks.order_by('-id').first()
+            suite.bench(
+                'models._validate_no_circular_dependencies', {'shape': shape, 'tasks': count},
+                lambda _: task._validate_no_circular_dependencies(),
+            )
+
+
+def bench_import(suite, sizes):
+    from tasks.services import ClaudeTaskGroomer
+
+    groomer = ClaudeTaskGroomer()
+    for count in sizes['import']:
+        reset_data()
+        suite.bench(
+            'services.create_task_list_from_groomed_tasks', {'tasks': count},
+            lambda result: groomer.create_task_list_from_groomed_tasks("Benchmark", "", result),
+            setup=lambda: groomed_result(count, seed=1),
+            teardown=lambda _: reset_data(),
+        )
+
+
+def bench_groom_parsing(suite, sizes):
+    from tasks.services import ClaudeTaskGroomer
+
+    groomer = ClaudeTaskGroomer()
+    for count in sizes['parse']:
+        reset_data()
+        result = groomed_result(count, seed=1)
+        content = json.dumps({'analysis': result['analysis'], 'tasks': result['tasks']})
+        for variant, text in (('json', content), ('wrapped', f"Here is your plan:\n{content}\nGood luck!")):
+            response = Mock()
+            response.json.return_value = {'content': [{'text': text}]}
+            with patch('tasks.services.requests.post', return_value=response):
+                suite.bench(
+                    'services.groom_tasks', {'tasks': count, 'response': variant},
+                    lambda _: groomer.groom_tasks("benchmark"),
+                )
+
+
+def bench_views(suite, sizes):
+    client = Client()
+    base = '/personal-assistance/executive-function/todo-timeline/'
+    views = {
+        'results': '/results/{id}/',
+        'todo_dependencies': base + 'dependencies/{id}/',
+        'timeline_execution': base + 'execute/{id}/',
+    }
+    for count in sizes['views']:
+        reset_data()
+        task_list = seed_task_lists(tasks_per_list=count, shape='layered', seed=1)[0]
+        for view, url in views.items():
+            url = url.format(id=task_list.id)
+
+            def get(_, url=url):
+                response = client.get(url)
+                assert response.status_code == 200, response.status_code
+
+            suite.bench(f'views.{view}', {'tasks': count, 'cache': 'cold'}, get, setup=cache.clear)
+            suite.bench(f'views.{view}', {'tasks': count, 'cache': 'warm'}, get)
+
+
+SIZES = {
+    'full': {
+        'existing': [0, 10000, 50000],
+        'graph': [10, 100, 500],
+        'import': [10, 100, 500],
+        'parse': [10, 100, 1000],
+        'views': [10, 100, 1000],
+    },
+    'quick': {
+        'existing': [0, 1000],
+        'graph': [10, 100],
+        'import': [10, 100],
+        'parse': [10, 100],
+        'views': [10, 100],
+    },
+}
+
+GROUPS = (bench_task_ids, bench_cycle_check, bench_import, bench_groom_parsing, bench_views)
+
+
+def git_commit():
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=BASE_DIR, capture_output=True, text=True).stdout.strip()
+    commit = git('rev-parse', 'HEAD') or 'unknown'
+    return commit, bool(git('status', '--porcelain', '--untracked-files=no'))
+
+
+def compare(baseline_path, results):
+    with open(baseline_path) as fh:
+        baseline = json.load(fh)
+    print(f"\nCompared with {baseline['commit'][:10]} (median, >1 is slower now):")
+    previous = {(b['name'], json.dumps(b['params'], sort_keys=True)): b for b in baseline['benchmarks']}
+    for result in results:
+        before = previous.get((result['name'], json.dumps(result['params'], sort_keys=True)))
+        if before:
+            label = result['name'] + ''.join(f"[{k}={v}]" for k, v in result['params'].items())
+            print(f"  {label:70} {result['median'] / before['median']:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quick', action='store_true', help="Smaller data sizes")
+    parser.add_argument('-k', dest='pattern', help="Only run benchmarks whose label contains this")
+    parser.add_argument('--min-time', type=float, default=0.5, help="Seconds to spend per benchmark")
+    parser.add_argument('--output', help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', help="Earlier results file to compare medians against")
+    args = parser.parse_args()
+
+    suite = Suite(args.pattern, args.min_time)
+    sizes = SIZES['quick' if args.quick else 'full']
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with override_settings(CLAUDE_API_KEY='benchmark', DURATION_ESTIMATOR_ENABLED=False):
+            for group in GROUPS:
+                group(suite, sizes)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    commit, dirty = git_commit()
+    report = {
+        'commit': commit,
+        'dirty': dirty,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'sizes': 'quick' if args.quick else 'full',
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'database': connection.vendor,
+        'benchmarks': suite.results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit[:10]}{'-dirty' if dirty else ''}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {output}")
+    if args.compare:
+        compare(args.compare, suite.results)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,8 @@
 ASGI config for mindtimer project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve with an ASGI server (uvicorn, daphne) to stream live timeline events;
+under WSGI the event stream endpoint cannot be held open.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -0,0 +1,100 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.middleware.gzip import GZipMiddleware as BaseGZipMiddleware
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+# Files written by ManifestStaticFilesStorage carry a 12-character content hash
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^/]+$')
+
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+def accepts_encoding(header, coding):
+    """
+    Whether an Accept-Encoding header allows coding: listed (or covered by *)
+    with a q-value above 0. 'gzip;q=0' refuses gzip.
+    """
+    qualities = {}
+    for item in header.split(','):
+        name, *params = item.split(';')
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+    return qualities.get(coding, qualities.get('*', 0.0)) > 0
+
+
+class StaticFilesMiddleware(MiddlewareMixin):
+    """
+    Serve collected static files from STATIC_ROOT.
+
+    Content-hashed names are cached for a year as immutable; precompressed
+    .br/.gz variants are served when the client accepts them. Enabled by
+    SERVE_STATIC (defaults to on when DEBUG is off, where runserver does not
+    serve static files itself). Sync and async capable, so ASGI requests
+    are not pushed through a thread.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.prefix = '/' + settings.STATIC_URL.lstrip('/')
+        self.enabled = getattr(settings, 'SERVE_STATIC', False) and settings.STATIC_ROOT
+
+    def process_request(self, request):
+        if self.enabled and request.path.startswith(self.prefix) and request.method in ('GET', 'HEAD'):
+            return self.serve(request, request.path[len(self.prefix):])
+        return None
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            raise Http404("Invalid static path")
+        if not os.path.isfile(path):
+            raise Http404("Static file not found")
+
+        content_type, _ = mimetypes.guess_type(path)
+        accepted = request.headers.get('Accept-Encoding', '')
+        encoding = None
+        for candidate, suffix in ENCODINGS:
+            if accepts_encoding(accepted, candidate) and os.path.isfile(path + suffix):
+                path, encoding = path + suffix, candidate
+                break
+
+        response = FileResponse(open(path, 'rb'), content_type=content_type or 'application/octet-stream')
+        if encoding:
+            response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if HASHED_NAME.search(name):
+            response['Cache-Control'] = f'public, max-age={settings.STATIC_MAX_AGE}, immutable'
+        else:
+            response['Cache-Control'] = 'public, max-age=60'
+        return response
+
+
+class GZipMiddleware(BaseGZipMiddleware):
+    """
+    GZipMiddleware that leaves event streams alone (compression buffers them)
+    and honours gzip;q=0, which Django's word match would still compress for
+    """
+
+    def process_response(self, request, response):
+        if response.get('Content-Type', '').startswith('text/event-stream'):
+            return response
+        if not accepts_encoding(request.headers.get('Accept-Encoding', ''), 'gzip'):
+            patch_vary_headers(response, ('Accept-Encoding',))
+            return response
+        return super().process_response(request, response)
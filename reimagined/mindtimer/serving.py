@@ -0,0 +1,140 @@
+"""
+Gunicorn configuration for production.
+
+Used by `manage.py serve`, or directly:
+
+    gunicorn -c python:mindtimer.serving mindtimer.wsgi
+    gunicorn -c python:mindtimer.serving -k uvicorn.workers.UvicornWorker mindtimer.asgi
+
+The app is loaded once in the master (preload_app) and warmed there. That
+covers the URLconf and views, compiled templates, the duration model and the
+requests stack. After warm-up the objects are moved to gc's permanent
+generation, so forked workers share those pages copy-on-write. Each worker
+then opens one database connection per thread before taking traffic.
+
+Sizing: CPU-bound work (templates, ORM) scales with cores, so there are
+cores + 1 worker processes. A grooming request holds its thread for
+several seconds while Claude answers, so every sync worker also runs
+SERVE_THREADS threads. SIGTERM stops workers gracefully: they finish
+in-flight requests for up to graceful_timeout seconds.
+
+More than one worker needs state shared between processes: a cache other
+than locmem (page cache versions) and, under ASGI, the spool timeline
+events backend. Startup stops with an error otherwise.
+
+Environment: BIND, WEB_CONCURRENCY (workers), SERVE_THREADS, SERVE_TIMEOUT,
+SERVE_GRACEFUL_TIMEOUT.
+"""
+import gc
+import os
+import shutil
+import threading
+
+bind = os.getenv("BIND", "127.0.0.1:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 1) + 1))
+threads = int(os.getenv("SERVE_THREADS", "8"))
+worker_class = "gthread"
+preload_app = True
+# Longer than the slowest Claude call, so grooming isn't killed mid-request
+timeout = int(os.getenv("SERVE_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("SERVE_GRACEFUL_TIMEOUT", "60"))
+keepalive = 5
+
+ASGI_WORKER_CLASSES = ("uvicorn.workers.UvicornWorker", "uvicorn_worker.UvicornWorker")
+
+
+def per_process_state(workers, asgi=False):
+    """What would keep state in one worker process when serving with workers processes"""
+    from django.conf import settings
+
+    from tasks.caching import cache_is_per_process
+
+    if workers <= 1:
+        return []
+    problems = []
+    if cache_is_per_process():
+        problems.append(
+            "CACHE_BACKEND=locmem keeps page cache versions per worker, so the other workers serve stale pages "
+            "(set CACHE_BACKEND=file or memcached)"
+        )
+    # WSGI workers can't hold event streams open, so only ASGI needs shared events
+    if asgi and settings.TIMELINE_EVENTS['BACKEND'] == 'tasks.events.InProcessBackend':
+        problems.append(
+            "TIMELINE_EVENTS_BACKEND=inprocess only reaches streams on the publishing worker "
+            "(set TIMELINE_EVENTS_BACKEND=spool)"
+        )
+    return problems
+
+
+def warm_up():
+    """Load what every worker needs, once, before forking"""
+    from django.template import engines
+    from django.urls import get_resolver
+
+    from tasks.estimator import get_estimator
+    from tasks.services import requests
+
+    get_resolver().url_patterns
+    for engine in engines.all():
+        for directory in engine.template_dirs:
+            for root, _, files in os.walk(directory):
+                for filename in files:
+                    if filename.endswith('.html'):
+                        engine.get_template(os.path.relpath(os.path.join(root, filename), directory))
+    get_estimator()
+    requests.Session  # executes the lazily imported module
+
+
+def on_starting(server):
+    from django.conf import settings
+
+    problems = per_process_state(server.cfg.workers, 'uvicorn' in server.cfg.worker_class_str.lower())
+    if problems:
+        raise RuntimeError(f"Refusing to start {server.cfg.workers} workers: {'; '.join(problems)}")
+
+    # Metric snapshots of the previous run's workers would be summed forever
+    if settings.METRICS_DIR:
+        shutil.rmtree(settings.METRICS_DIR, ignore_errors=True)
+
+
+def when_ready(server):
+    from django.db import connections
+
+    if server.cfg.preload_app:
+        warm_up()
+        # Sockets and SQLite handles must not be shared with the children
+        connections.close_all()
+        gc.collect()
+        gc.freeze()
+    server.log.info("MindTimer ready: %s workers x %s threads", server.cfg.workers, server.cfg.threads)
+
+
+def post_worker_init(worker):
+    """Open a database connection in every thread of a gthread worker before it takes requests"""
+    from django.db import connection
+
+    pool = getattr(worker, 'tpool', None)
+    if pool is None:
+        return
+    count = worker.cfg.threads
+    # Each job waits until all have started, so every pool thread runs one
+    barrier = threading.Barrier(count)
+
+    def connect():
+        connection.ensure_connection()
+        try:
+            barrier.wait(timeout=10)
+        except threading.BrokenBarrierError:
+            pass
+
+    for future in [pool.submit(connect) for _ in range(count)]:
+        future.result()
+
+
+def worker_exit(server, worker):
+    from django.db import connections
+
+    from tasks import metrics
+
+    connections.close_all()
+    metrics.flush(force=True)
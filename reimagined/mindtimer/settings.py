@@ -12,13 +12,19 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Load the nearest .env above this file, like load_dotenv() does, but only
+# import python-dotenv when there is one (keeps worker and command startup lean)
+for directory in Path(__file__).resolve().parents:
+    if (directory / ".env").is_file():
+        from dotenv import load_dotenv
+
+        load_dotenv(directory / ".env")
+        break
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -32,7 +38,8 @@ DEBUG = os.getenv("DEBUG", "True").lower() == "true"
 # Claude API configuration for AI integration
 CLAUDE_API_KEY = os.getenv("CLAUDE_API_KEY")
 
-ALLOWED_HOSTS = []
+# Comma-separated host names to serve when DEBUG is off, e.g. "mindtimer.example.com"
+ALLOWED_HOSTS = [host.strip() for host in os.getenv("ALLOWED_HOSTS", "").split(",") if host.strip()]
 
 
 # Application definition
@@ -48,7 +55,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "tasks.metrics.MetricsMiddleware",
+    "tasks.tracing.TracingMiddleware",
+    "tasks.profiling.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "mindtimer.middleware.StaticFilesMiddleware",
+    "mindtimer.middleware.GZipMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -80,12 +92,118 @@ WSGI_APPLICATION = "mindtimer.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# DB_PROFILE selects the backend: "sqlite" (default) or "postgres".
+DB_PROFILE = os.getenv("DB_PROFILE", "sqlite").lower()
+
+# Persistent connections: seconds to keep a connection open between requests
+CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", "600"))
+
+# Set SQLITE_TUNED=false to fall back to the stock sqlite3 configuration
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "True").lower() == "true"
+
+if DB_PROFILE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("POSTGRES_DB", "mindtimer"),
+            "USER": os.getenv("POSTGRES_USER", "mindtimer"),
+            "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
+            "HOST": os.getenv("POSTGRES_HOST", "localhost"),
+            "PORT": os.getenv("POSTGRES_PORT", "5432"),
+            "CONN_MAX_AGE": CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+        }
     }
-}
+elif SQLITE_TUNED:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                # Seconds a writer waits on a locked database before failing
+                "timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "20")),
+                # Take the write lock at BEGIN so read-then-write transactions
+                # queue on the busy timeout instead of failing with "database is locked"
+                "transaction_mode": "IMMEDIATE",
+            },
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+        }
+    }
+
+# Applied to every new SQLite connection by tasks.db.configure_sqlite_connection
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 268435456,  # 256 MiB
+    "cache_size": -20000,  # ~20 MB page cache
+    "temp_store": "MEMORY",
+} if SQLITE_TUNED else {}
+
+
+# Cache
+# CACHE_BACKEND: "locmem" (default, per process), "file" or "memcached".
+# Use file or memcached when running more than one worker process so page
+# cache versions are shared; check --deploy warns about locmem (tasks.W001).
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem").lower()
+
+if CACHE_BACKEND == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv("CACHE_LOCATION", BASE_DIR / ".cache" / "django"),
+        }
+    }
+elif CACHE_BACKEND == "memcached":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": os.getenv("CACHE_LOCATION", "127.0.0.1:11211"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "mindtimer",
+        }
+    }
+
+# Seconds a rendered task list page stays cached (entries are also
+# invalidated by version bumps whenever the list or its tasks change)
+PAGE_CACHE_TIMEOUT = int(os.getenv("PAGE_CACHE_TIMEOUT", "600"))
+
+
+# Sessions
+# Signed cookies keep session reads and writes off the database. Set
+# SESSION_ENGINE=django.contrib.sessions.backends.cache to use CACHES instead.
+SESSION_ENGINE = os.getenv("SESSION_ENGINE", "django.contrib.sessions.backends.signed_cookies")
+
+
+# Timeline push events (Server-Sent Events, served under ASGI)
+# TIMELINE_EVENTS_BACKEND: "inprocess" (default, one worker process) or
+# "spool" (file spool shared by every worker process on the host).
+TIMELINE_EVENTS_BACKEND = os.getenv("TIMELINE_EVENTS_BACKEND", "inprocess").lower()
+
+if TIMELINE_EVENTS_BACKEND == "spool":
+    TIMELINE_EVENTS = {
+        "BACKEND": "tasks.events.FileSpoolBackend",
+        "OPTIONS": {
+            "directory": os.getenv("TIMELINE_EVENTS_DIR", BASE_DIR / ".events"),
+        },
+    }
+else:
+    TIMELINE_EVENTS = {"BACKEND": "tasks.events.InProcessBackend", "OPTIONS": {}}
+
+# Seconds between keepalive comments on idle event streams
+TIMELINE_EVENTS_HEARTBEAT = int(os.getenv("TIMELINE_EVENTS_HEARTBEAT", "15"))
 
 
 # Password validation
@@ -107,6 +225,67 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Local duration estimator (tasks.estimator), refreshed by the
+# train_duration_model command. Without an artifact, groomer estimates are
+# used as-is.
+DURATION_MODEL_PATH = os.getenv("DURATION_MODEL_PATH", BASE_DIR / "models" / "duration_model.json")
+DURATION_ESTIMATOR_ENABLED = os.getenv("DURATION_ESTIMATOR_ENABLED", "true").lower() == "true"
+
+
+# Near-duplicate tasks (tasks.dedup): the estimated Jaccard similarity of
+# two tasks' title/description shingles at which they count as duplicates.
+# Used to merge duplicates at import, seed durations from tracked
+# near-duplicates, and by the similar-tasks endpoint.
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.7"))
+
+
+# Exact schedules (tasks.scheduling): parallel lanes to plan for, and how
+# long the branch and bound may search before it settles for the best plan
+# found so far.
+SCHEDULE_LANES = int(os.getenv("SCHEDULE_LANES", "2"))
+SCHEDULE_BUDGET_MS = int(os.getenv("SCHEDULE_BUDGET_MS", "500"))
+
+
+# On-demand request profiling (tasks.profiling): requests are profiled only
+# with a signed X-MindTimer-Profile header (manage.py profiling_token) or a
+# ProfilingRule enabled in the admin.
+PROFILING_DIR = os.getenv("PROFILING_DIR", BASE_DIR / "profiles")
+PROFILING_TOKEN_MAX_AGE = int(os.getenv("PROFILING_TOKEN_MAX_AGE", "3600"))
+PROFILING_TOP_N = 30
+
+
+# Prometheus metrics at /metrics (tasks.metrics). Under a multi-process
+# server set METRICS_DIR to a directory shared by the workers (cleared on
+# start) so every scrape sees the totals of all of them. With METRICS_TOKEN
+# set, scrapes must send "Authorization: Bearer <token>".
+METRICS_DIR = os.getenv("METRICS_DIR") or None
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "1"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+
+
+# Request tracing (tasks.tracing): spans for requests, grooming and SQL,
+# appended to TRACING_FILE as OTLP/JSON lines. TRACING_SAMPLE_RATE is the
+# share of requests traced (0.0-1.0).
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+TRACING_FILE = os.getenv("TRACING_FILE", BASE_DIR / "traces" / "spans.jsonl")
+TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+
+
+# Record/replay of Claude API traffic (tasks.cassettes). CLAUDE_CASSETTE_MODE
+# is "off", "record", "replay" or "once" (replay what is recorded, record the
+# rest). Outside tests, traffic goes through the cassette named
+# CLAUDE_CASSETTE, e.g. "production" to capture live grooming requests for
+# manage.py replay_traffic. Cassettes contain users' todo text.
+CLAUDE_CASSETTE_MODE = os.getenv("CLAUDE_CASSETTE_MODE", "off").lower()
+CLAUDE_CASSETTE_DIR = os.getenv("CLAUDE_CASSETTE_DIR", BASE_DIR / "tests" / "cassettes")
+CLAUDE_CASSETTE = os.getenv("CLAUDE_CASSETTE", "default")
+
+
+# Test runner with per-test timings, --shard K/N and migrated template
+# databases (mindtimer.testing)
+TEST_RUNNER = "mindtimer.testing.TimedTestRunner"
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -124,6 +303,31 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+STATICFILES_DIRS = [BASE_DIR / "static"]
+
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# Outside DEBUG, collectstatic writes content-hashed names plus .gz/.br copies
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "django.contrib.staticfiles.storage.StaticFilesStorage"
+            if DEBUG
+            else "mindtimer.storage.CompressedManifestStaticFilesStorage"
+        ),
+    },
+}
+
+# Serve STATIC_ROOT from Django (mindtimer.middleware.StaticFilesMiddleware).
+# Turn off when a reverse proxy or CDN serves /static/.
+SERVE_STATIC = os.getenv("SERVE_STATIC", str(not DEBUG)).lower() == "true"
+
+# Cache lifetime for content-hashed static files (one year)
+STATIC_MAX_AGE = 31536000
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,48 @@
+"""
+Static files storage that writes precompressed variants next to each hashed file.
+
+collectstatic produces e.g. css/base.3f2a1c9e.css plus css/base.3f2a1c9e.css.gz
+and (when the optional brotli package is installed) css/base.3f2a1c9e.css.br.
+mindtimer.middleware.StaticFilesMiddleware serves whichever variant the client accepts.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.map')
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        for name in self.hashed_files.values():
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            with self.open(name) as source:
+                content = source.read()
+            for compressed_name in self.write_compressed_variants(name, content):
+                yield name, compressed_name, True
+
+    def write_compressed_variants(self, name, content):
+        """Write .gz (and .br) copies of content that are smaller than the original"""
+        variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content)))
+
+        for suffix, compressed in variants:
+            if len(compressed) >= len(content):
+                continue
+            compressed_name = name + suffix
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(compressed))
+            yield compressed_name
@@ -0,0 +1,292 @@
+"""
+Test runner (TEST_RUNNER) for `manage.py test` and test_runner.py.
+
+On top of DiscoverRunner:
+
+- Per-test durations: recorded in serial and --parallel runs, the slowest
+  are printed after the run (--slowest N), and unsharded runs merge all of
+  them into --durations-file.
+- Sharding: --shard K/N runs one of N shards. TestCase classes are dealt out
+  longest-first by recorded duration, so shards finish together. With
+  --parallel, longer classes are also handed to the worker pool first.
+- Template databases: the migrated SQLite test database is saved once per
+  migration state under .test-templates/. Later runs restore it with the
+  SQLite backup API instead of migrating. --parallel workers then fork
+  in-memory copies of it, as DiscoverRunner always does for SQLite.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import statistics
+import time
+import unittest
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.test.runner import DiscoverRunner, ParallelTestSuite, RemoteTestResult, RemoteTestRunner
+
+try:
+    import tblib  # noqa: F401
+except ImportError:
+    tblib = None
+
+DEFAULT_DURATION = 0.1
+
+
+class RemoteError(Exception):
+    """Stands in for a worker's exception when tracebacks can't be pickled (no tblib)"""
+
+
+def test_id(test):
+    return test.id()
+
+
+def case_id(test):
+    return f"{type(test).__module__}.{type(test).__qualname__}"
+
+
+class TimedTextTestResult(unittest.TextTestResult):
+    """Records how long each test took, keyed by test id"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.durations = {}
+        self._started = {}
+
+    def startTest(self, test):
+        self._started[test_id(test)] = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        started = self._started.pop(test_id(test), None)
+        if started is not None:
+            # A duration reported by a --parallel worker takes precedence
+            self.durations.setdefault(test_id(test), time.perf_counter() - started)
+
+    def addDuration(self, test, elapsed):
+        if hasattr(super(), 'addDuration'):
+            super().addDuration(test, elapsed)
+        self.durations[test_id(test)] = elapsed
+
+
+class TimedRemoteTestResult(RemoteTestResult):
+    """Worker-side result that sends each test's duration back with its events"""
+
+    def startTest(self, test):
+        self._test_started = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        self.events.append(('addDuration', self.test_index, time.perf_counter() - self._test_started))
+        super().stopTest(test)
+
+    def addDuration(self, test, elapsed):
+        pass  # Python 3.12+ reports durations itself; stopTest already sent one
+
+    def _picklable(self, test, err):
+        if tblib is not None:
+            return err
+        # RemoteTestResult._exc_info_to_string() is a stub; format with unittest's
+        formatted = unittest.TestResult._exc_info_to_string(self, err, test)
+        return RemoteError, RemoteError(formatted), None
+
+    def addError(self, test, err):
+        super().addError(test, self._picklable(test, err))
+
+    def addFailure(self, test, err):
+        super().addFailure(test, self._picklable(test, err))
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err if err is None else self._picklable(test, err))
+
+
+class TimedRemoteTestRunner(RemoteTestRunner):
+    resultclass = TimedRemoteTestResult
+
+
+class TimedParallelTestSuite(ParallelTestSuite):
+    runner_class = TimedRemoteTestRunner
+
+
+def parse_shard(value):
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"--shard must look like K/N, got {value!r}")
+    if not 1 <= index <= count:
+        raise ValueError(f"--shard {value}: K must be between 1 and N")
+    return index, count
+
+
+def assign_shards(cases, durations, count):
+    """
+    {case id: shard number (1-based)} dealing cases out longest first to the
+    least loaded shard. cases maps case id -> list of test ids; tests
+    without a recorded duration count as the median of those that have one.
+    """
+    known = list(durations.values())
+    fallback = statistics.median(known) if known else DEFAULT_DURATION
+    weights = {
+        case: sum(durations.get(test, fallback) for test in tests)
+        for case, tests in cases.items()
+    }
+    loads = [0.0] * count
+    shards = {}
+    for case in sorted(weights, key=lambda case: (-weights[case], case)):
+        shard = min(range(count), key=lambda n: (loads[n], n))
+        loads[shard] += weights[case]
+        shards[case] = shard + 1
+    return shards
+
+
+def migrations_fingerprint(alias):
+    """Hash of everything that decides what a freshly migrated test database contains"""
+    digest = hashlib.sha256()
+    digest.update(django.get_version().encode())
+    digest.update(json.dumps(settings.INSTALLED_APPS).encode())
+    digest.update(json.dumps(connections[alias].settings_dict.get('TEST', {}), sort_keys=True, default=str).encode())
+    for app_config in apps.get_app_configs():
+        migrations = Path(app_config.path) / 'migrations'
+        for path in sorted(migrations.glob('*.py')):
+            digest.update(str(path.relative_to(app_config.path)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+@contextmanager
+def template_database(connection, directory, log):
+    """
+    Make connection.creation.create_test_db restore an in-memory SQLite test
+    database from a saved template, or save one after migrating.
+    """
+    creation = connection.creation
+    if connection.vendor != 'sqlite' or not creation.is_in_memory_db(creation._get_test_db_name()):
+        yield
+        return
+
+    template = Path(directory) / f"{connection.alias}-{migrations_fingerprint(connection.alias)}.sqlite3"
+    create_test_db = creation.create_test_db
+
+    def create_from_template(verbosity=1, autoclobber=False, serialize=True, keepdb=False):
+        if not template.exists():
+            name = create_test_db(verbosity, autoclobber, serialize, keepdb)
+            template.parent.mkdir(parents=True, exist_ok=True)
+            partial = template.with_suffix('.tmp')
+            target = sqlite3.connect(partial)
+            connection.connection.backup(target)
+            target.close()
+            os.replace(partial, template)
+            log(f"Saved migrated test database template {template.name}")
+            return name
+
+        name = creation._get_test_db_name()
+        log(f"Restoring test database for alias '{connection.alias}' from template {template.name}...")
+        connection.close()
+        settings.DATABASES[connection.alias]['NAME'] = name
+        connection.settings_dict['NAME'] = name
+        connection.ensure_connection()
+        source = sqlite3.connect(template)
+        source.backup(connection.connection)
+        source.close()
+        if serialize:
+            connection._test_serialized_contents = creation.serialize_db_to_string()
+        return name
+
+    creation.create_test_db = create_from_template
+    try:
+        yield
+    finally:
+        del creation.create_test_db
+
+
+class TimedTestRunner(DiscoverRunner):
+    parallel_test_suite = TimedParallelTestSuite
+
+    def __init__(self, shard=None, durations_file=None, slowest=10, template_db=True, **kwargs):
+        super().__init__(**kwargs)
+        self.shard = parse_shard(shard) if shard else None
+        self.durations_file = Path(durations_file or Path(settings.BASE_DIR) / '.test-durations.json')
+        self.slowest = slowest
+        self.template_db = template_db
+        self.template_dir = Path(settings.BASE_DIR) / '.test-templates'
+        self.recorded = self.load_durations()
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--shard', help="Run only shard K of N (e.g. 2/4), balanced by recorded durations")
+        parser.add_argument('--durations-file', help="Where per-test durations are read and merged (default: .test-durations.json)")
+        parser.add_argument('--slowest', type=int, default=10, help="Print the N slowest tests (0 to disable)")
+        parser.add_argument(
+            '--no-template-db', action='store_false', dest='template_db',
+            help="Migrate the test database instead of restoring a saved template",
+        )
+
+    def load_durations(self):
+        try:
+            with open(self.durations_file) as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def test_suite(self, tests=()):
+        """Build the suite from this shard's tests only"""
+        tests = list(tests)
+        if self.shard:
+            index, count = self.shard
+            cases = {}
+            for test in tests:
+                cases.setdefault(case_id(test), []).append(test_id(test))
+            shards = assign_shards(cases, self.recorded, count)
+            tests = [test for test in tests if shards[case_id(test)] == index]
+            self.log(f"Shard {index}/{count}: running {len(tests)} test(s).")
+        return unittest.TestSuite(tests)
+
+    def build_suite(self, *args, **kwargs):
+        suite = super().build_suite(*args, **kwargs)
+        if isinstance(suite, ParallelTestSuite):
+            # Longest classes first, so no worker is left with a slow one at the end
+            suite.subsuites.sort(
+                key=lambda subsuite: -sum(self.recorded.get(test_id(test), DEFAULT_DURATION) for test in subsuite)
+            )
+        return suite
+
+    def setup_databases(self, **kwargs):
+        if not self.template_db or self.keepdb:
+            return super().setup_databases(**kwargs)
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(template_database(connections[alias], self.template_dir, self.log))
+            return super().setup_databases(**kwargs)
+
+    def get_resultclass(self):
+        return super().get_resultclass() or TimedTextTestResult
+
+    def run_suite(self, suite, **kwargs):
+        result = super().run_suite(suite, **kwargs)
+        durations = getattr(result, 'durations', None)
+        if durations:
+            self.report_slowest(durations)
+            # Every shard has to split the suite from the same recorded durations
+            if not self.shard:
+                self.save_durations(durations)
+        return result
+
+    def report_slowest(self, durations):
+        if not self.slowest:
+            return
+        print(f"\nSlowest {min(self.slowest, len(durations))} test(s):")
+        for name, seconds in sorted(durations.items(), key=lambda item: -item[1])[:self.slowest]:
+            print(f"  {seconds:7.3f}s  {name}")
+
+    def save_durations(self, durations):
+        merged = {**self.load_durations(), **{name: round(seconds, 4) for name, seconds in durations.items()}}
+        partial = self.durations_file.with_suffix('.tmp')
+        partial.write_text(json.dumps(merged, indent=0, sort_keys=True))
+        os.replace(partial, self.durations_file)
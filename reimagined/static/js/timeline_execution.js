@@ -0,0 +1,168 @@
+// Timeline: complete the "Now" task in place, advance to the next ready task,
+// and follow completions made elsewhere over Server-Sent Events
+document.addEventListener('DOMContentLoaded', function() {
+    const container = document.querySelector('.timeline-container');
+    const current = document.querySelector('.current-task');
+    if (!container || !current) {
+        return;
+    }
+
+    function label(text) {
+        return '<' + text + '>';
+    }
+
+    function hoursMinutes(seconds) {
+        const minutes = Math.max(0, Math.ceil(seconds / 60));
+        return Math.floor(minutes / 60) + ':' + String(minutes % 60).padStart(2, '0');
+    }
+
+    function clock(date) {
+        return date.toLocaleTimeString([], {hour: '2-digit', minute: '2-digit'});
+    }
+
+    // Countdown and progress run on the client; the server only pushes changes
+    const startedAt = new Date();
+    const totalMinutes = Number(container.dataset.totalMinutes) || 0;
+    let nowMinutes = Number(current.dataset.estimatedDuration) || 0;
+    let trackedSeconds = Number(current.dataset.actualSeconds) || 0;
+    let runningSince = current.dataset.runningSince ? Number(current.dataset.runningSince) * 1000 : null;
+    // The clock only starts when the user presses Start; viewing the page isn't working on the task
+    let started = Boolean(runningSince || trackedSeconds);
+
+    function tick() {
+        const open = runningSince ? (Date.now() - runningSince) / 1000 : 0;
+        current.querySelector('.time-left').textContent = label(hoursMinutes(nowMinutes * 60 - trackedSeconds - open));
+    }
+
+    // Time tracking events are queued and sent in batches
+    const pending = [];
+
+    function track(type) {
+        pending.push({task: current.dataset.taskId, type: type, at: Date.now() / 1000});
+    }
+
+    function flush() {
+        if (!pending.length) {
+            return Promise.resolve(null);
+        }
+        return fetch(container.dataset.trackUrl, {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({events: pending.splice(0)})
+        }).then(function(response) { return response.ok ? response.json() : Promise.reject(response); });
+    }
+
+    function setRunning(running) {
+        current.querySelector('.btn-pause').textContent = running ? 'Pause' : (started ? 'Resume' : 'Start');
+    }
+
+    function renderProgress(remainingMinutes) {
+        const finish = new Date(Date.now() + remainingMinutes * 60000);
+        document.querySelector('.progress-start').textContent = label(clock(startedAt));
+        document.querySelector('.progress-end').textContent = label(clock(finish));
+        const done = totalMinutes ? (totalMinutes - remainingMinutes) / totalMinutes : 0;
+        document.querySelector('.progress-fill').style.width = Math.round(done * 100) + '%';
+    }
+
+    function renderParallel(tasks) {
+        const list = document.querySelector('.parallel-tasks');
+        list.replaceChildren();
+        const cards = tasks.length ? tasks : [{title: 'No parallel tasks'}];
+        cards.forEach(function(task) {
+            const card = document.createElement('div');
+            card.className = 'parallel-task';
+            const title = document.createElement('h4');
+            title.textContent = label(task.title);
+            card.appendChild(title);
+            if (task.task_id) {
+                const time = document.createElement('div');
+                time.textContent = 'Time: ' + label(hoursMinutes(task.estimated_duration * 60));
+                const deps = document.createElement('div');
+                deps.textContent = 'Dependencies: ' + label(task.dependencies.join(', ') || 'None');
+                card.append(time, deps);
+            }
+            list.appendChild(card);
+        });
+    }
+
+    function renderFrontier(data) {
+        if (data.remaining_minutes !== undefined) {
+            renderProgress(data.remaining_minutes);
+        }
+        data.completed.forEach(function(taskId) {
+            const item = document.querySelector('.todo-summary li[data-task-id="' + taskId + '"]');
+            if (item) {
+                item.classList.add('done');
+            }
+        });
+
+        const sequential = data.ready.filter(function(task) { return !task.can_run_parallel; });
+        renderParallel(data.ready.filter(function(task) { return task.can_run_parallel; }));
+
+        if (!sequential.length) {
+            current.querySelector('.current-title').textContent = label('All done');
+            current.querySelector('.next-title').textContent = 'Next: ' + label('Nothing queued');
+            current.querySelector('.btn-done').disabled = true;
+            current.querySelector('.btn-pause').disabled = true;
+            nowMinutes = trackedSeconds = 0;
+            runningSince = null;
+            tick();
+            return;
+        }
+        const now = sequential[0];
+        const next = sequential[1];
+        if (current.dataset.taskId !== now.task_id) {
+            current.dataset.taskId = now.task_id;
+            nowMinutes = now.estimated_duration;
+            trackedSeconds = now.actual_seconds || 0;
+            runningSince = now.running_since ? Date.parse(now.running_since) : null;
+            started = Boolean(runningSince || trackedSeconds);
+            setRunning(Boolean(runningSince));
+        }
+        current.querySelector('.current-title').textContent = label(now.title);
+        current.querySelector('.next-title').textContent = 'Next: ' + label(next ? next.title : 'Nothing queued');
+        tick();
+    }
+
+    setRunning(Boolean(runningSince));
+    renderProgress(Number(container.dataset.remainingMinutes) || 0);
+    tick();
+    setInterval(tick, 1000);
+    setInterval(flush, 15000);
+
+    document.addEventListener('visibilitychange', function() {
+        if (document.visibilityState === 'hidden' && pending.length) {
+            const body = new Blob([JSON.stringify({events: pending.splice(0)})], {type: 'application/json'});
+            navigator.sendBeacon(container.dataset.trackUrl, body);
+        }
+    });
+
+    if (window.EventSource && container.dataset.eventsUrl) {
+        const events = new EventSource(container.dataset.eventsUrl);
+        events.addEventListener('task_completed', function(message) {
+            renderFrontier(JSON.parse(message.data));
+        });
+    }
+
+    current.querySelector('.btn-pause').addEventListener('click', function() {
+        if (runningSince) {
+            trackedSeconds += (Date.now() - runningSince) / 1000;
+            runningSince = null;
+            track('pause');
+        } else {
+            runningSince = Date.now();
+            track(started ? 'resume' : 'start');
+            started = true;
+        }
+        setRunning(Boolean(runningSince));
+        tick();
+    });
+
+    // Done goes out with the queued events, so the completion closes the timer
+    current.querySelector('.btn-done').addEventListener('click', function() {
+        track('complete');
+        flush()
+            .then(renderFrontier)
+            .catch(function() { window.location.reload(); });
+    });
+});
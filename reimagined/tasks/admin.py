@@ -1,3 +1,26 @@
 from django.contrib import admin
+from django.utils.html import format_html
 
-# Register your models here.
+from .models import ProfileArtifact, ProfilingRule
+
+
+@admin.register(ProfilingRule)
+class ProfilingRuleAdmin(admin.ModelAdmin):
+    list_display = ('path_prefix', 'remaining', 'enabled', 'created_at')
+    list_editable = ('remaining', 'enabled')
+
+
+@admin.register(ProfileArtifact)
+class ProfileArtifactAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'method', 'path', 'status_code', 'duration_ms', 'trigger')
+    list_filter = ('trigger', 'method')
+    search_fields = ('path',)
+    fields = ('created_at', 'method', 'path', 'status_code', 'duration_ms', 'trigger', 'profile_file', 'report_text')
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description="Report")
+    def report_text(self, artifact):
+        return format_html('<pre style="white-space: pre-wrap">{}</pre>', artifact.report)
@@ -0,0 +1,487 @@
+"""
+JSON API (v1) over TaskList, Task and Schedule.
+
+List endpoints use keyset pagination (?after=<id>&limit=<n>) and accept
+sparse fieldsets (?fields=id,title,completed). Tasks are addressed by their
+4-hex task_id. The bulk endpoint applies completions, duration edits and
+dependency changes for one task list in a single transaction; the events
+endpoint takes batched time-tracking events. /search/ is full-text search
+over tasks and task lists, paged by an opaque ?after=<cursor>, and
+.../tasks/<task_id>/similar/ lists a task's near-duplicates in other lists
+(or, with ?same_list=1, in its own).
+.../schedules/optimize/ plans the shortest schedule on parallel lanes.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from .caching import bump_task_list_version, task_list_conditional
+from .dedup import similar_tasks
+from .models import Schedule, Task, TaskDependency, TaskList
+from .scheduling import CycleError, save_schedule, topological_order
+from .search import KINDS as SEARCH_KINDS, search as full_text_search
+from .tracking import EVENT_TYPES, record_events
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+MAX_EVENTS = 1000
+# Minutes; a week is longer than any one task, and far inside an integer column
+MAX_DURATION = 7 * 24 * 60
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+MAX_LANES = 16
+# Requests wait for the search, so it gets less time than manage.py optimize_schedule may
+MAX_SCHEDULE_BUDGET_MS = 2000
+
+TASK_LIST_FIELDS = ('id', 'name', 'raw_input', 'analysis', 'created_at', 'updated_at')
+TASK_FIELDS = (
+    'id', 'task_id', 'title', 'description', 'priority', 'estimated_duration', 'completed',
+    'schedule_order', 'can_run_parallel', 'actual_seconds', 'running_since', 'created_at', 'updated_at',
+    'dependencies',
+)
+SCHEDULE_FIELDS = ('id', 'optimization_algorithm', 'total_estimated_duration', 'parallel_blocks', 'created_at')
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def api_view(view):
+    """Turn ApiError into a JSON error response"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as e:
+            return JsonResponse({'error': str(e)}, status=e.status)
+    return wrapper
+
+
+def parse_fields(request, allowed):
+    """?fields=a,b,c -> tuple of requested fields (all allowed fields by default)"""
+    raw = request.GET.get('fields')
+    if not raw:
+        return allowed
+    fields = tuple(field.strip() for field in raw.split(',') if field.strip())
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ApiError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+
+def parse_page(request):
+    try:
+        after = int(request.GET.get('after', 0))
+        limit = min(int(request.GET.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+    except ValueError:
+        raise ApiError("after and limit must be integers")
+    if limit < 1:
+        raise ApiError("limit must be positive")
+    return after, limit
+
+
+def paginate(request, queryset, fields):
+    """Keyset pagination on id: fetch limit + 1 rows to know whether there is a next page"""
+    after, limit = parse_page(request)
+    db_fields = [field for field in fields if field != 'dependencies']
+    if 'id' not in db_fields:
+        db_fields.append('id')
+    rows = list(queryset.filter(id__gt=after).order_by('id').values(*db_fields)[:limit + 1])
+
+    next_url = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        query = request.GET.copy()
+        query['after'] = rows[-1]['id']
+        next_url = f"{request.path}?{query.urlencode()}"
+    return rows, next_url
+
+
+def encode_cursor(hit):
+    return base64.urlsafe_b64encode(json.dumps([hit['rank'], hit['kind'], hit['id']]).encode()).decode()
+
+
+def decode_cursor(value):
+    try:
+        rank, kind, pk = json.loads(base64.urlsafe_b64decode(value.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise ApiError("Invalid after cursor")
+    if not isinstance(rank, (int, float)) or kind not in SEARCH_KINDS or not isinstance(pk, int):
+        raise ApiError("Invalid after cursor")
+    return rank, kind, pk
+
+
+def is_task_id_list(value):
+    return isinstance(value, list) and all(isinstance(task_id, str) for task_id in value)
+
+
+def get_task_list(task_list_id):
+    try:
+        return TaskList.objects.get(pk=task_list_id)
+    except TaskList.DoesNotExist:
+        raise ApiError("Task list not found", status=404)
+
+
+def attach_dependencies(rows):
+    """Add a 'dependencies' list of task_ids to each task row with one query"""
+    ids = [row['id'] for row in rows]
+    dependencies = {}
+    edges = TaskDependency.objects.filter(from_task_id__in=ids).values_list('from_task_id', 'to_task__task_id')
+    for from_id, to_task_id in edges:
+        dependencies.setdefault(from_id, []).append(to_task_id)
+    for row in rows:
+        row['dependencies'] = dependencies.get(row['id'], [])
+
+
+def shape(rows, fields):
+    return [{field: row[field] for field in fields} for row in rows]
+
+
+@require_GET
+@api_view
+def task_lists(request):
+    fields = parse_fields(request, TASK_LIST_FIELDS)
+    rows, next_url = paginate(request, TaskList.objects.all(), fields)
+    return JsonResponse({'results': shape(rows, fields), 'next': next_url})
+
+
+@require_GET
+@api_view
+def search(request):
+    """
+    ?q=dentist appointment -> ranked matches, best first. Every word must
+    match, the last one as a prefix. ?in=task or ?in=task_list limits the
+    kinds searched. title and snippet are HTML with matches in <mark>.
+    """
+    query = request.GET.get('q', '').strip()
+    if not query:
+        raise ApiError("q is required")
+    kinds = SEARCH_KINDS
+    if request.GET.get('in'):
+        kinds = tuple(kind.strip() for kind in request.GET['in'].split(','))
+        if not set(kinds) <= set(SEARCH_KINDS):
+            raise ApiError(f"in must be one or more of: {', '.join(SEARCH_KINDS)}")
+    after = decode_cursor(request.GET['after']) if request.GET.get('after') else None
+    try:
+        limit = min(int(request.GET.get('limit', SEARCH_DEFAULT_LIMIT)), SEARCH_MAX_LIMIT)
+    except ValueError:
+        raise ApiError("limit must be an integer")
+    if limit < 1:
+        raise ApiError("limit must be positive")
+
+    try:
+        hits = full_text_search(query, after=after, limit=limit + 1, kinds=kinds)
+    except NotImplementedError as e:
+        raise ApiError(str(e), status=501)
+    next_url = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        params = request.GET.copy()
+        params['after'] = encode_cursor(hits[-1])
+        next_url = f"{request.path}?{params.urlencode()}"
+    return JsonResponse({'results': hits, 'next': next_url})
+
+
+@require_GET
+@task_list_conditional
+@api_view
+def task_list_detail(request, task_list_id):
+    fields = parse_fields(request, TASK_LIST_FIELDS)
+    row = TaskList.objects.filter(pk=task_list_id).values(*fields).first()
+    if row is None:
+        raise ApiError("Task list not found", status=404)
+    return JsonResponse(row)
+
+
+@require_GET
+@task_list_conditional
+@api_view
+def task_list_tasks(request, task_list_id):
+    fields = parse_fields(request, TASK_FIELDS)
+    task_list = get_task_list(task_list_id)
+    rows, next_url = paginate(request, Task.objects.filter(task_list=task_list), fields)
+    if 'dependencies' in fields:
+        attach_dependencies(rows)
+    return JsonResponse({'results': shape(rows, fields), 'next': next_url})
+
+
+@require_GET
+@api_view
+def task_similar(request, task_list_id, task_id):
+    """
+    Near-duplicates of a task in other task lists, best first. Each one carries
+    its similarity (estimated Jaccard, 0-1) and tracked time, so a client can
+    offer to reuse an earlier task's breakdown or duration. With ?same_list=1,
+    near-duplicates in the task's own list instead, as merge suggestions.
+    """
+    task_list = get_task_list(task_list_id)
+    try:
+        task = Task.objects.get(task_list=task_list, task_id=task_id)
+    except Task.DoesNotExist:
+        raise ApiError("Task not found", status=404)
+    try:
+        min_similarity = float(request.GET['min_similarity']) if 'min_similarity' in request.GET else None
+        limit = min(int(request.GET.get('limit', 20)), MAX_LIMIT)
+    except ValueError:
+        raise ApiError("min_similarity must be a number and limit an integer")
+
+    results = [
+        {
+            'task_list_id': other.task_list_id, 'task_id': other.task_id, 'title': other.title,
+            'estimated_duration': other.estimated_duration, 'actual_seconds': other.actual_seconds,
+            'completed': other.completed, 'similarity': score,
+        }
+        for other, score in similar_tasks(task, min_similarity, limit, same_list=request.GET.get('same_list') == '1')
+    ]
+    return JsonResponse({'results': results})
+
+
+@require_GET
+@task_list_conditional
+@api_view
+def task_list_schedules(request, task_list_id):
+    fields = parse_fields(request, SCHEDULE_FIELDS)
+    task_list = get_task_list(task_list_id)
+    rows, next_url = paginate(request, Schedule.objects.filter(task_list=task_list), fields)
+    return JsonResponse({'results': shape(rows, fields), 'next': next_url})
+
+
+@csrf_exempt
+@require_POST
+@api_view
+def task_list_optimize(request, task_list_id):
+    """
+    Plan the list's incomplete tasks on parallel lanes for the shortest
+    makespan and save the plan as a 'dependency' Schedule. Body (optional):
+    {"lanes": 2, "budget_ms": 500}. optimal says whether the plan is proven
+    shortest within the budget, lower_bound is how short it could be, and
+    sequential_duration is the makespan of doing the tasks one at a time.
+    """
+    try:
+        body = json.loads(request.body or b'{}')
+    except json.JSONDecodeError:
+        raise ApiError("Request body must be JSON")
+    if not isinstance(body, dict):
+        raise ApiError("Request body must be a JSON object")
+    lanes = body.get('lanes', settings.SCHEDULE_LANES)
+    budget_ms = body.get('budget_ms', settings.SCHEDULE_BUDGET_MS)
+    for name, value, high in (('lanes', lanes, MAX_LANES), ('budget_ms', budget_ms, MAX_SCHEDULE_BUDGET_MS)):
+        if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= high:
+            raise ApiError(f"{name} must be an integer from 1 to {high}")
+
+    task_list = get_task_list(task_list_id)
+    try:
+        schedule, plan = save_schedule(task_list, lanes, budget_ms)
+    except CycleError as e:
+        raise ApiError(str(e))
+    row = {field: getattr(schedule, field) for field in SCHEDULE_FIELDS}
+    row.update(optimal=plan.optimal, lower_bound=plan.lower_bound, sequential_duration=plan.sequential)
+    return JsonResponse(row, status=201)
+
+
+@csrf_exempt
+@require_POST
+@api_view
+def task_list_bulk(request, task_list_id):
+    """
+    Apply many task changes in one transaction. Body:
+
+        {
+            "complete": ["a101", "a102"],
+            "durations": {"a103": 45},
+            "add_dependencies": {"a104": ["a101"]},
+            "remove_dependencies": {"a104": ["a102"]}
+        }
+
+    Any invalid entry rolls back the whole request.
+    """
+    try:
+        body = json.loads(request.body or b'{}')
+    except json.JSONDecodeError:
+        raise ApiError("Request body must be JSON")
+    if not isinstance(body, dict):
+        raise ApiError("Request body must be a JSON object")
+
+    complete = body.get('complete', [])
+    durations = body.get('durations', {})
+    add_dependencies = body.get('add_dependencies', {})
+    remove_dependencies = body.get('remove_dependencies', {})
+    if not is_task_id_list(complete) or not all(
+        isinstance(value, dict) for value in (durations, add_dependencies, remove_dependencies)
+    ):
+        raise ApiError("complete must be a list of task_ids; durations and *_dependencies must be objects")
+    if not all(is_task_id_list(targets) for targets in [*add_dependencies.values(), *remove_dependencies.values()]):
+        raise ApiError("*_dependencies values must be lists of task_ids")
+
+    referenced = set(complete) | set(durations) | set(add_dependencies) | set(remove_dependencies)
+    for targets in list(add_dependencies.values()) + list(remove_dependencies.values()):
+        referenced |= set(targets)
+
+    task_list = get_task_list(task_list_id)
+    with transaction.atomic():
+        tasks = {task.task_id: task for task in Task.objects.filter(task_list=task_list, task_id__in=referenced)}
+        missing = sorted(referenced - set(tasks))
+        if missing:
+            raise ApiError(f"Unknown task_id(s) in this task list: {', '.join(missing)}")
+
+        now = timezone.now()
+        for task_id, minutes in durations.items():
+            if not isinstance(minutes, int) or isinstance(minutes, bool) or not 0 <= minutes <= MAX_DURATION:
+                raise ApiError(f"Duration for {task_id} must be an integer from 0 to {MAX_DURATION} (minutes)")
+            tasks[task_id].estimated_duration = minutes
+            tasks[task_id].updated_at = now
+        Task.objects.bulk_update([tasks[task_id] for task_id in durations], ['estimated_duration', 'updated_at'])
+
+        unblocked = Task.objects.filter(task_list=task_list, task_id__in=complete).complete()
+
+        try:
+            for task_id, targets in add_dependencies.items():
+                for target in targets:
+                    tasks[task_id].add_dependency(target)
+        except ValidationError as e:
+            raise ApiError(f"{task_id}: {'; '.join(e.messages)}")
+        for task_id, targets in remove_dependencies.items():
+            tasks[task_id].dependencies.remove(*[tasks[target] for target in targets])
+        if add_dependencies and has_cycle(task_list):
+            raise ApiError("add_dependencies would create a dependency cycle")
+
+    # bulk_update sends no signals, so invalidate cached pages here
+    bump_task_list_version(task_list.id)
+
+    return JsonResponse({
+        'updated': sorted(set(complete) | set(durations)),
+        'dependencies_changed': sorted(set(add_dependencies) | set(remove_dependencies)),
+        'unblocked': [task.task_id for task in unblocked],
+    })
+
+
+def has_cycle(task_list):
+    """Whether the dependencies between a task list's tasks contain a cycle (self-dependencies included)"""
+    index = {pk: position for position, pk in enumerate(task_list.tasks.values_list('pk', flat=True))}
+    dependencies = [[] for _ in index]
+    edges = TaskDependency.objects.filter(from_task_id__in=index, to_task_id__in=index)
+    for from_id, to_id in edges.values_list('from_task_id', 'to_task_id'):
+        dependencies[index[from_id]].append(index[to_id])
+    try:
+        topological_order(dependencies)
+    except CycleError:
+        return True
+    return False
+
+
+def serialize_tasks(tasks):
+    rows = [{field: getattr(task, field) for field in TASK_FIELDS if field != 'dependencies'} for task in tasks]
+    attach_dependencies(rows)
+    return rows
+
+
+@csrf_exempt
+@require_POST
+@api_view
+def task_list_complete(request, task_list_id):
+    """
+    Complete tasks with one UPDATE. Body: {"tasks": ["a101", ...]}
+
+    Returns the tasks this unblocked and the new ready frontier, so the
+    timeline can advance without reloading the page.
+    """
+    try:
+        body = json.loads(request.body or b'{}')
+    except json.JSONDecodeError:
+        raise ApiError("Request body must be JSON")
+    task_ids = body.get('tasks') if isinstance(body, dict) else None
+    if not is_task_id_list(task_ids) or not task_ids:
+        raise ApiError("tasks must be a non-empty list of task_ids")
+
+    task_list = get_task_list(task_list_id)
+    tasks = Task.objects.filter(task_list=task_list, task_id__in=task_ids)
+    missing = sorted(set(task_ids) - set(tasks.values_list('task_id', flat=True)))
+    if missing:
+        raise ApiError(f"Unknown task_id(s) in this task list: {', '.join(missing)}")
+
+    unblocked = tasks.complete()
+    ready = Task.objects.filter(task_list=task_list).ready()
+    return JsonResponse({
+        'completed': sorted(task_ids),
+        'unblocked': serialize_tasks(unblocked),
+        'ready': serialize_tasks(ready),
+    })
+
+
+def parse_event_time(value, now):
+    """Epoch seconds or ISO 8601; missing means now, and the future is clamped to now"""
+    if value is None:
+        return now
+    try:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            timestamp = datetime.fromtimestamp(value, tz=dt_timezone.utc)
+        else:
+            timestamp = datetime.fromisoformat(value)
+    except (TypeError, ValueError, OverflowError, OSError):
+        raise ApiError(f"Invalid event time: {value!r}")
+    if timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp)
+    return min(timestamp, now)
+
+
+@csrf_exempt
+@require_POST
+@api_view
+def task_list_events(request, task_list_id):
+    """
+    Record a batch of time-tracking events. Body:
+
+        {"events": [{"task": "a101", "type": "start", "at": 1718000000.0}, ...]}
+
+    type is start, pause, resume or complete; at is epoch seconds or ISO 8601
+    (default: now). Completions return the new ready frontier like /complete/.
+    """
+    try:
+        body = json.loads(request.body or b'{}')
+    except json.JSONDecodeError:
+        raise ApiError("Request body must be JSON")
+    events = body.get('events') if isinstance(body, dict) else None
+    if not isinstance(events, list) or not events:
+        raise ApiError("events must be a non-empty list")
+    if len(events) > MAX_EVENTS:
+        raise ApiError(f"At most {MAX_EVENTS} events per request")
+    if not all(isinstance(event, dict) for event in events):
+        raise ApiError("Each event must be an object")
+    if not all(isinstance(event.get('task'), str) and isinstance(event.get('type'), str) for event in events):
+        raise ApiError("Each event needs string task and type fields")
+
+    task_list = get_task_list(task_list_id)
+    referenced = {event.get('task') for event in events}
+    tasks = dict(Task.objects.filter(task_list=task_list, task_id__in=referenced).values_list('task_id', 'pk'))
+    missing = sorted(str(task_id) for task_id in referenced - set(tasks))
+    if missing:
+        raise ApiError(f"Unknown task_id(s) in this task list: {', '.join(missing)}")
+
+    now = timezone.now()
+    parsed = []
+    for event in events:
+        if event.get('type') not in EVENT_TYPES:
+            raise ApiError(f"Event type must be one of: {', '.join(EVENT_TYPES)}")
+        parsed.append((tasks[event['task']], EVENT_TYPES[event['type']], parse_event_time(event.get('at'), now)))
+
+    completed, unblocked = record_events(parsed)
+    tracked = Task.objects.filter(pk__in=set(tasks.values())).order_by('id')
+    return JsonResponse({
+        'recorded': len(parsed),
+        'completed': sorted(task.task_id for task in completed),
+        'unblocked': serialize_tasks(unblocked),
+        'ready': serialize_tasks(Task.objects.filter(task_list=task_list).ready()),
+        'tasks': list(tracked.values('task_id', 'actual_seconds', 'running_since')),
+    })
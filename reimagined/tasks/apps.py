@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.core import checks
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 
 
 class TasksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tasks"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .caching import check_shared_cache
+        from .db import configure_sqlite_connection
+        from .search import install_after_migrate
+
+        connection_created.connect(configure_sqlite_connection, dispatch_uid="tasks_sqlite_pragmas")
+        post_migrate.connect(install_after_migrate, sender=self, dispatch_uid="tasks_search_index")
+        checks.register(check_shared_cache, checks.Tags.caches, deploy=True)
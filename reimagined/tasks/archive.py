@@ -0,0 +1,122 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from .caching import bump_task_list_version
+from .compression import compress_json
+from .models import Schedule, Task, TaskDependency, TaskList, TaskListArchive
+
+SNAPSHOT_VERSION = 2
+
+TASK_FIELDS = [
+    'id', 'task_id', 'title', 'description', 'priority', 'estimated_duration',
+    'completed', 'schedule_order', 'can_run_parallel', 'actual_seconds', 'created_at', 'updated_at',
+]
+
+
+def archivable_task_lists(older_than_days=None):
+    """
+    TaskLists ready for cold storage: every task completed, or (when
+    older_than_days is given) not updated for that many days.
+    """
+    incomplete = Task.objects.filter(task_list=OuterRef('pk'), completed=False)
+    completed = Q(task_count__gt=0) & ~Q(Exists(incomplete))
+    condition = completed
+    if older_than_days is not None:
+        cutoff = timezone.now() - timedelta(days=older_than_days)
+        condition |= Q(updated_at__lt=cutoff)
+    return TaskList.objects.annotate(task_count=Count('tasks')).filter(condition).order_by('id')
+
+
+def snapshot_task_list(task_list):
+    """
+    Build the JSON-serializable snapshot of a TaskList. Must run inside a
+    transaction: the tasks are read with select_for_update.
+
+    Dependencies on tasks in other lists go into external_dependencies, and
+    other lists' tasks that depend on this list's into external_dependents,
+    both as {task_list_id, task_id}.
+    """
+    tasks = list(Task.objects.select_for_update().filter(task_list=task_list).order_by('id').values(*TASK_FIELDS))
+    hex_ids = {task['id']: task['task_id'] for task in tasks}
+
+    dependencies, external = defaultdict(list), defaultdict(lambda: defaultdict(list))
+    edges = TaskDependency.objects.filter(Q(from_task_id__in=hex_ids) | Q(to_task_id__in=hex_ids)).values_list(
+        'from_task_id', 'to_task_id',
+        'from_task__task_list_id', 'from_task__task_id', 'to_task__task_list_id', 'to_task__task_id',
+    )
+    for from_id, to_id, from_list_id, from_hex, to_list_id, to_hex in edges.order_by('id'):
+        if from_id in hex_ids and to_id in hex_ids:
+            dependencies[from_id].append(to_hex)
+        elif from_id in hex_ids:
+            external[from_id]['external_dependencies'].append({'task_list_id': to_list_id, 'task_id': to_hex})
+        else:
+            external[to_id]['external_dependents'].append({'task_list_id': from_list_id, 'task_id': from_hex})
+    for task in tasks:
+        task['dependencies'] = dependencies[task['id']]
+        task['external_dependencies'] = external[task['id']]['external_dependencies']
+        task['external_dependents'] = external[task['id']]['external_dependents']
+
+    schedules = list(
+        Schedule.objects.filter(task_list=task_list).order_by('id').values(
+            'optimization_algorithm', 'total_estimated_duration', 'parallel_blocks', 'created_at'
+        )
+    )
+
+    return {
+        'version': SNAPSHOT_VERSION,
+        'task_list': {
+            'id': task_list.id,
+            'name': task_list.name,
+            'raw_input': task_list.raw_input,
+            'analysis': task_list.analysis,
+            'created_at': task_list.created_at,
+            'updated_at': task_list.updated_at,
+        },
+        'tasks': tasks,
+        'schedules': schedules,
+    }
+
+
+def archive_task_list(task_list, batch_size=500):
+    """
+    Move a TaskList into a TaskListArchive row and delete its hot rows.
+
+    The snapshot and the delete share one transaction, and the rows are read
+    with select_for_update, so nothing written in between is lost. Tasks are
+    deleted batch_size per statement. Lists whose tasks lose a cross-list
+    dependency are touched, as their ready sets may change.
+    """
+    with transaction.atomic():
+        task_list = TaskList.objects.select_for_update().filter(pk=task_list.pk).first() or task_list
+        archive = TaskListArchive.objects.filter(original_id=task_list.id).first()
+        if archive is None:
+            snapshot = snapshot_task_list(task_list)
+            archive = TaskListArchive.objects.create(
+                original_id=task_list.id,
+                name=task_list.name,
+                task_count=len(snapshot['tasks']),
+                created_at=task_list.created_at,
+                snapshot=compress_json(snapshot),
+            )
+
+        ids = list(Task.objects.select_for_update().filter(task_list=task_list).values_list('id', flat=True))
+        dependents = set(
+            TaskDependency.objects.filter(to_task_id__in=ids).exclude(from_task__task_list=task_list)
+            .values_list('from_task__task_list_id', flat=True)
+        ) - {None}
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            TaskDependency.objects.filter(Q(from_task_id__in=batch) | Q(to_task_id__in=batch)).delete()
+            Task.objects.filter(id__in=batch).delete()
+
+        Schedule.objects.filter(task_list=task_list).delete()
+        TaskList.objects.filter(id=task_list.id).delete()
+        TaskList.objects.filter(id__in=dependents).update(updated_at=timezone.now())
+
+    for task_list_id in dependents:
+        bump_task_list_version(task_list_id)
+    return archive
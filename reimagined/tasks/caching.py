@@ -0,0 +1,117 @@
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from django.db.models import Max
+from django.views.decorators.http import condition
+
+from .events import can_stream
+from .metrics import PAGE_CACHE
+
+
+# Cache backends whose entries live in one process's memory
+PER_PROCESS_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+def cache_is_per_process():
+    """
+    True when the default cache lives in each process's own memory. A version
+    bumped by one worker process is then invisible to the others, which keep
+    serving their cached pages and 304s until PAGE_CACHE_TIMEOUT.
+    """
+    return settings.CACHES['default']['BACKEND'] in PER_PROCESS_CACHES
+
+
+def check_shared_cache(app_configs, **kwargs):
+    """Deploy check (manage.py check --deploy); manage.py serve refuses to fork workers over such a cache"""
+    if not cache_is_per_process():
+        return []
+    return [checks.Warning(
+        "The default cache is per process (CACHE_BACKEND=locmem), so page cache versions are not shared "
+        "between worker processes and pages go stale.",
+        hint="Set CACHE_BACKEND=file or memcached, or run a single worker process.",
+        id='tasks.W001',
+    )]
+
+
+def _version_key(task_list_id):
+    return f"tasklist:{task_list_id}:version"
+
+
+def _new_version():
+    # Time-based so a version lost to eviction is never reissued
+    return time.time_ns()
+
+
+def task_list_version(task_list_id):
+    """Current cache version for a TaskList, created on first use"""
+    key = _version_key(task_list_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_task_list_version(task_list_id):
+    """Invalidate every cached page for a TaskList"""
+    if task_list_id is not None:
+        cache.set(_version_key(task_list_id), _new_version(), None)
+
+
+def cache_task_list_page(view):
+    """
+    Cache a task list view's full response, keyed on the view, the TaskList id
+    and its version. A hit is served from the cache without touching the ORM.
+    ASGI and WSGI renders are kept apart: only the former link the event stream.
+    """
+    @wraps(view)
+    def wrapper(request, task_list_id, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, task_list_id, *args, **kwargs)
+
+        handler = 'asgi' if can_stream(request) else 'wsgi'
+        key = f"page:{view.__name__}:{handler}:{task_list_id}:{task_list_version(task_list_id)}"
+        response = cache.get(key)
+        PAGE_CACHE.inc(view=view.__name__, result='miss' if response is None else 'hit')
+        if response is None:
+            response = view(request, task_list_id, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+        return response
+
+    return wrapper
+
+
+def task_list_etag(request, task_list_id, *args, **kwargs):
+    return f"tasklist-{task_list_id}-{task_list_version(task_list_id)}"
+
+
+def task_list_last_modified(request, task_list_id, *args, **kwargs):
+    """
+    Latest of TaskList.updated_at and its tasks' updated_at. Computed with one
+    indexed aggregate query and cached under the current version.
+    """
+    version = task_list_version(task_list_id)
+    key = f"tasklist:{task_list_id}:last_modified:{version}"
+    last_modified = cache.get(key)
+    if last_modified is None:
+        from .models import TaskList
+
+        row = (
+            TaskList.objects.filter(pk=task_list_id)
+            .annotate(latest_task=Max('tasks__updated_at'))
+            .values_list('updated_at', 'latest_task')
+            .first()
+        )
+        if row is None:
+            return None
+        last_modified = max(value for value in row if value is not None)
+        cache.set(key, last_modified, settings.PAGE_CACHE_TIMEOUT)
+    return last_modified
+
+
+# Answers If-None-Match / If-Modified-Since with 304 before the view runs
+task_list_conditional = condition(etag_func=task_list_etag, last_modified_func=task_list_last_modified)
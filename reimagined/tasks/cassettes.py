@@ -0,0 +1,241 @@
+"""
+Record/replay of Claude API traffic ("cassettes").
+
+ClaudeTaskGroomer sends its requests through post(). With no cassette in
+use, that is requests.post(). With one, each request is keyed by a
+fingerprint: a sha256 of the method, URL, JSON body and headers, leaving out
+the API key. Modes:
+
+- record: call Claude, then append the exchange to the cassette
+- replay: answer only from the cassette; a request it doesn't hold raises
+  CassetteMiss, and nothing is sent over the network
+- once: replay what is recorded, record the rest
+
+A cassette is a gzip file of JSON lines, one exchange per line. Each line
+holds the request, the caller's inputs, and the response: status, headers,
+and the body as the chunks read from the socket with their arrival times.
+So streamed responses replay chunk by chunk. With latency > 0 they also
+replay at their recorded pace (1.0 = as recorded), which makes captured
+production traffic usable for performance work (manage.py replay_traffic).
+Each exchange is appended as its own gzip member with a single O_APPEND
+write, so several server processes can record into one cassette.
+
+Outside tests, CLAUDE_CASSETTE_MODE and CLAUDE_CASSETTE pick the cassette;
+use_cassette() overrides them for a block of code. Cassettes hold the full
+prompts, so they contain users' todo text.
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from django.conf import settings
+
+from .lazy import lazy_import
+
+requests = lazy_import('requests')
+
+MODES = ('off', 'record', 'replay', 'once')
+SUFFIX = '.jsonl.gz'
+# Never part of a fingerprint, never written to disk
+SECRET_HEADERS = frozenset({'x-api-key', 'authorization', 'cookie', 'set-cookie'})
+# Describe the wire format, which replay doesn't reproduce
+TRANSPORT_HEADERS = frozenset({'content-length', 'content-encoding', 'transfer-encoding', 'connection', 'user-agent'})
+
+_active = ContextVar('mindtimer_cassette', default=None)
+_default = {}
+_default_lock = threading.Lock()
+
+
+class CassetteMiss(Exception):
+    """A replayed request that the cassette has no recording of"""
+
+
+def cassette_path(name):
+    return Path(settings.CLAUDE_CASSETTE_DIR) / f"{name}{SUFFIX}"
+
+
+def _kept_headers(headers):
+    return {
+        key.lower(): value for key, value in (headers or {}).items()
+        if key.lower() not in SECRET_HEADERS | TRANSPORT_HEADERS
+    }
+
+
+def fingerprint(method, url, headers=None, body=None):
+    material = json.dumps(
+        [method.upper(), url, sorted(_kept_headers(headers).items()), body],
+        sort_keys=True, separators=(',', ':'),
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class ReplayBody:
+    """Stands in for urllib3's response: hands requests the recorded chunks, optionally at their recorded pace"""
+
+    def __init__(self, chunks, offsets, latency=0.0):
+        self.chunks = chunks
+        self.offsets = offsets
+        self.latency = latency
+
+    def stream(self, chunk_size=None, decode_content=True):
+        started = time.perf_counter()
+        for chunk, offset in zip(self.chunks, self.offsets):
+            if self.latency:
+                delay = offset * self.latency - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            yield chunk
+
+    def read(self, amt=None, decode_content=True):
+        return b''.join(self.stream())
+
+    def close(self):
+        pass
+
+
+class Cassette:
+    def __init__(self, path, mode='replay', latency=0.0):
+        if mode not in MODES or mode == 'off':
+            raise ValueError(f"cassette mode must be one of record, replay, once; got {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._recorded = None
+        self._played = defaultdict(int)
+
+    def exchanges(self):
+        """Every recorded exchange, oldest first"""
+        if not self.path.exists():
+            return []
+        exchanges = []
+        with gzip.open(self.path, 'rt', encoding='utf-8') as fh:
+            try:
+                for line in fh:
+                    exchanges.append(json.loads(line))
+            except (EOFError, gzip.BadGzipFile, ValueError):
+                pass  # A recorder stopped mid-write; keep everything before it
+        return exchanges
+
+    def _lookup(self, key):
+        with self._lock:
+            if self._recorded is None:
+                self._recorded = defaultdict(list)
+                for exchange in self.exchanges():
+                    self._recorded[exchange['fingerprint']].append(exchange)
+            recorded = self._recorded.get(key)
+            if not recorded:
+                return None
+            # Repeated requests get the recordings in order, then the last one again
+            index = min(self._played[key], len(recorded) - 1)
+            self._played[key] += 1
+            return recorded[index]
+
+    def post(self, url, *, headers=None, json=None, inputs=None, **kwargs):
+        key = fingerprint('POST', url, headers, json)
+        if self.mode != 'record':
+            exchange = self._lookup(key)
+            if exchange is not None:
+                return self.play(exchange)
+            if self.mode == 'replay':
+                raise CassetteMiss(f"No recording of POST {url} ({key[:12]}) in {self.path}")
+        return self.record(key, url, headers, json, inputs, **kwargs)
+
+    def play(self, exchange):
+        recorded = exchange['response']
+        response = requests.Response()
+        response.status_code = recorded['status']
+        response.reason = recorded['reason']
+        response.url = exchange['request']['url']
+        response.headers = requests.structures.CaseInsensitiveDict(recorded['headers'])
+        response.encoding = recorded['encoding']
+        response.elapsed = timedelta(seconds=recorded['elapsed'])
+        response.raw = ReplayBody(
+            [base64.b64decode(chunk) for chunk in recorded['chunks']], recorded['offsets'], self.latency,
+        )
+        return response
+
+    def record(self, key, url, headers, body, inputs, **kwargs):
+        started = time.perf_counter()
+        response = requests.post(url, headers=headers, json=body, stream=True, **kwargs)
+        chunks, offsets = [], []
+        for chunk in response.iter_content(chunk_size=None):
+            chunks.append(chunk)
+            offsets.append(round(time.perf_counter() - started, 4))
+        # The caller gets the body as if it hadn't asked to stream
+        response._content = b''.join(chunks)
+        exchange = {
+            'fingerprint': key,
+            'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'request': {'method': 'POST', 'url': url, 'headers': _kept_headers(headers), 'json': body},
+            'inputs': inputs,
+            'response': {
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': _kept_headers(response.headers),
+                'encoding': response.encoding,
+                'elapsed': round(response.elapsed.total_seconds(), 4),
+                'chunks': [base64.b64encode(chunk).decode('ascii') for chunk in chunks],
+                'offsets': offsets,
+            },
+        }
+        self.append(exchange)
+        return response
+
+    def append(self, exchange):
+        member = gzip.compress(json.dumps(exchange, separators=(',', ':')).encode() + b'\n')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, member)
+        finally:
+            os.close(fd)
+        with self._lock:
+            if self._recorded is not None:
+                self._recorded[exchange['fingerprint']].append(exchange)
+
+
+@contextmanager
+def use_cassette(name_or_path, mode='once', latency=0.0):
+    """Send the groomer's requests in this block through a cassette (a name under CLAUDE_CASSETTE_DIR, or a path)"""
+    path = Path(name_or_path)
+    if not str(name_or_path).endswith(SUFFIX):
+        path = cassette_path(name_or_path)
+    token = _active.set(Cassette(path, mode, latency))
+    try:
+        yield _active.get()
+    finally:
+        _active.reset(token)
+
+
+def current():
+    """The cassette in use: use_cassette()'s, else the CLAUDE_CASSETTE one if CLAUDE_CASSETTE_MODE isn't off"""
+    cassette = _active.get()
+    if cassette is not None:
+        return cassette
+    mode = settings.CLAUDE_CASSETTE_MODE
+    if mode == 'off':
+        return None
+    path = cassette_path(settings.CLAUDE_CASSETTE)
+    with _default_lock:
+        cassette = _default.get((path, mode))
+        if cassette is None:
+            cassette = _default[path, mode] = Cassette(path, mode)
+    return cassette
+
+
+def post(url, *, headers=None, json=None, inputs=None, **kwargs):
+    """requests.post(), through the cassette in use if there is one. inputs are saved with a recording for replay_traffic"""
+    cassette = current()
+    if cassette is None:
+        return requests.post(url, headers=headers, json=json, **kwargs)
+    return cassette.post(url, headers=headers, json=json, inputs=inputs, **kwargs)
@@ -0,0 +1,13 @@
+import json
+import zlib
+
+
+def compress_json(data, level=6):
+    """Serialize data as compact JSON and zlib-compress it"""
+    payload = json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+    return zlib.compress(payload, level)
+
+
+def decompress_json(blob):
+    """Inverse of compress_json"""
+    return json.loads(zlib.decompress(bytes(blob)).decode('utf-8'))
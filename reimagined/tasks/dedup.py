@@ -0,0 +1,239 @@
+"""
+Near-duplicate tasks, found with MinHash and LSH.
+
+Each task's title and description are cut into character 3-gram shingles,
+and summarized by a 64-value MinHash signature (256 bytes in
+TaskSignature). The share of equal values between two signatures
+estimates the Jaccard similarity of their shingle sets. The signature is
+split into 16 bands of 4 values, and each band is hashed to a TaskBucket
+key. Tasks that share a bucket are candidates. Only those candidates'
+signatures are compared, so a lookup reads a handful of index entries
+instead of comparing against every task. With 16 x 4 bands, a pair at
+Jaccard 0.7 shares a bucket ~98% of the time; one at 0.3 ~12%.
+
+Used to seed a new task's duration from tracked time of earlier
+near-duplicates, and by the similar-tasks API endpoint, which offers
+near-duplicates as suggestions. Import only merges exact duplicates
+(merge_duplicates): "Write chapter 1" and "Write chapter 2" score well above
+the threshold. Tasks are indexed when they are
+created or their text changes (tasks.signals); tasks written with
+bulk_create, like seed_synthetic's, need manage.py index_similar_tasks.
+"""
+import hashlib
+import re
+import statistics
+import struct
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import Task, TaskBucket, TaskSignature
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+PACKED = struct.Struct(f'<{NUM_PERM}I')
+
+MIN_ACTUAL_SECONDS = 60
+WORD = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset({'a', 'an', 'and', 'the', 'to', 'of', 'for', 'in', 'on', 'at', 'with', 'my', 'your', 'some'})
+
+
+def task_text(title, description=''):
+    """The text a task is compared by; the groomer often repeats the title as the description"""
+    if description and description != title:
+        return f'{title} {description}'
+    return title
+
+
+def normalize(text):
+    """Lowercased words without punctuation or stopwords: 'Call the dentist!' -> 'call dentist'"""
+    return ' '.join(word for word in WORD.findall(text.lower()) if word not in STOPWORDS)
+
+
+def shingles(text):
+    joined = f" {normalize(text)} "
+    return {joined[i:i + SHINGLE] for i in range(max(len(joined) - SHINGLE + 1, 1))}
+
+
+def minhash(text):
+    """
+    64 MinHash values of text's shingles. One 256-byte SHAKE-128 digest per
+    shingle gives its 64 independent 32-bit hashes (stable across processes),
+    and the per-column minimum runs in C.
+    """
+    hashed = [PACKED.unpack(hashlib.shake_128(shingle.encode('utf-8')).digest(PACKED.size)) for shingle in shingles(text)]
+    return tuple(map(min, zip(*hashed)))
+
+
+def pack(signature):
+    return PACKED.pack(*signature)
+
+
+def unpack(data):
+    return PACKED.unpack(bytes(data))
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(first, second)) / NUM_PERM
+
+
+def band_keys(signature):
+    """One signed 64-bit bucket key per band"""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(struct.pack(f'<B{ROWS}I', band, *signature[band * ROWS:(band + 1) * ROWS]), digest_size=8).digest(),
+            'little', signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def threshold():
+    return settings.DEDUP_THRESHOLD
+
+
+def index_tasks(tasks):
+    """Store the signatures and buckets of tasks, replacing any they had"""
+    signatures = {task.pk: minhash(task_text(task.title, task.description)) for task in tasks}
+    if not signatures:
+        return
+    with transaction.atomic():
+        TaskSignature.objects.filter(task_id__in=signatures).delete()
+        TaskBucket.objects.filter(task_id__in=signatures).delete()
+        TaskSignature.objects.bulk_create(
+            [TaskSignature(task_id=pk, minhash=pack(signature)) for pk, signature in signatures.items()]
+        )
+        # 16 rows per task; executemany skips bulk_create's per-object overhead
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {quote(TaskBucket._meta.db_table)} ({quote('key')}, {quote('task_id')}) VALUES (%s, %s)",
+                [(key, pk) for pk, signature in signatures.items() for key in band_keys(signature)],
+            )
+
+
+def index_task(task):
+    """Index one task, unless its stored signature is already current"""
+    signature = pack(minhash(task_text(task.title, task.description)))
+    if not TaskSignature.objects.filter(task_id=task.pk, minhash=signature).exists():
+        index_tasks([task])
+
+
+def find_similar(signatures, min_similarity=None, exclude=()):
+    """
+    {name: [(task pk, similarity), ...] best first} for a {name: signature}
+    dict, with two queries for the whole batch. exclude holds task pks to
+    leave out.
+    """
+    min_similarity = threshold() if min_similarity is None else min_similarity
+    by_key = defaultdict(set)
+    for name, signature in signatures.items():
+        for key in band_keys(signature):
+            by_key[key].add(name)
+    if not by_key:
+        return {}
+
+    candidates = defaultdict(set)
+    buckets = TaskBucket.objects.filter(key__in=list(by_key)).exclude(task_id__in=exclude).values_list('key', 'task_id')
+    for key, task_pk in buckets.iterator():
+        for name in by_key[key]:
+            candidates[name].add(task_pk)
+
+    stored = dict(
+        TaskSignature.objects.filter(task_id__in={pk for pks in candidates.values() for pk in pks})
+        .values_list('task_id', 'minhash')
+    )
+    found = {}
+    for name, pks in candidates.items():
+        scored = [(pk, similarity(signatures[name], unpack(stored[pk]))) for pk in pks if pk in stored]
+        found[name] = sorted(
+            [(pk, score) for pk, score in scored if score >= min_similarity], key=lambda item: (-item[1], item[0])
+        )
+    return found
+
+
+def similar_tasks(task, min_similarity=None, limit=20, same_list=False):
+    """
+    Near-duplicates of task in other task lists (or, with same_list, in its
+    own list), as [(Task, similarity)] best first
+    """
+    signature = minhash(task_text(task.title, task.description))
+    matches = find_similar({task.pk: signature}, min_similarity, exclude=[task.pk]).get(task.pk, [])
+    candidates = Task.objects.filter(pk__in=[pk for pk, _ in matches])
+    if same_list:
+        candidates = candidates.filter(task_list_id=task.task_list_id)
+    else:
+        candidates = candidates.exclude(task_list_id=task.task_list_id)
+    allowed = set(candidates.values_list('pk', flat=True))
+    matches = [(pk, score) for pk, score in matches if pk in allowed][:limit]
+    tasks = Task.objects.in_bulk([pk for pk, _ in matches])
+    return [(tasks[pk], score) for pk, score in matches]
+
+
+def depends_on(dependencies, task_id, other_id):
+    """Whether a dependency path leads from task_id to other_id in {task_id: {dependency ids}}"""
+    seen, stack = set(), [task_id]
+    while stack:
+        current = stack.pop()
+        if current == other_id:
+            return True
+        if current not in seen:
+            seen.add(current)
+            stack.extend(dependencies.get(current, ()))
+    return False
+
+
+def merge_duplicates(tasks_data):
+    """
+    Drop groomed tasks whose normalized title repeats an earlier task's in the
+    same list. Returns (kept tasks, {dropped task_id: kept task_id}).
+
+    A repeat joined to the earlier task by a dependency path is kept: folding
+    its dependencies onto the earlier task would make a cycle.
+    """
+    dependencies = defaultdict(set)
+    for task_data in tasks_data:
+        dependencies[task_data.get('task_id')].update(task_data.get('dependencies') or ())
+    first, kept, merged = {}, [], {}
+    for task_data in tasks_data:
+        task_id, key = task_data.get('task_id'), normalize(task_data.get('task', ''))
+        duplicate_of = first.get(key)
+        if duplicate_of is not None and task_id and not (
+            depends_on(dependencies, task_id, duplicate_of) or depends_on(dependencies, duplicate_of, task_id)
+        ):
+            merged[task_id] = duplicate_of
+            dependencies[duplicate_of] |= dependencies.pop(task_id)
+            for deps in dependencies.values():
+                if task_id in deps:
+                    deps.remove(task_id)
+                    deps.add(duplicate_of)
+            continue
+        if key and task_id:
+            first.setdefault(key, task_id)
+        kept.append(task_data)
+    return kept, merged
+
+
+def tracked_minutes(texts, min_similarity=None):
+    """
+    {index: minutes} for the texts (see task_text) that near-duplicate
+    completed tasks with tracked time: the median of those tasks' actual minutes.
+    """
+    signatures = {index: minhash(text) for index, text in enumerate(texts)}
+    matches = find_similar(signatures, min_similarity)
+    actual = dict(
+        Task.objects.filter(
+            pk__in={pk for found in matches.values() for pk, _ in found},
+            completed=True, actual_seconds__gte=MIN_ACTUAL_SECONDS,
+        ).values_list('pk', 'actual_seconds')
+    )
+    seeded = {}
+    for index, found in matches.items():
+        seconds = [actual[pk] for pk, _ in found if pk in actual]
+        if seconds:
+            seeded[index] = max(1, round(statistics.median(seconds) / 60))
+    return seeded
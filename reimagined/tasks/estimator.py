@@ -0,0 +1,175 @@
+"""
+Local duration estimator.
+
+A ridge regression of log(actual minutes) on hashed title tokens, priority and
+log(groomer estimate), trained on completed tasks with tracked time. Training
+needs NumPy (train_duration_model command); prediction is a sparse dot
+product over a JSON artifact, so calibrating a task at import costs
+microseconds and works without NumPy.
+"""
+import json
+import math
+import os
+import re
+import zlib
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+from .lazy import lazy_import
+
+# Only training needs NumPy; None when it isn't installed
+np = lazy_import('numpy')
+
+ARTIFACT_VERSION = 1
+N_BUCKETS = 1024
+PRIORITIES = ('low', 'medium', 'high')
+# Offsets of the dense features after the token buckets
+PRIORITY_OFFSET = N_BUCKETS
+LOG_ESTIMATE = N_BUCKETS + len(PRIORITIES)
+BIAS = LOG_ESTIMATE + 1
+N_FEATURES = BIAS + 1
+
+# Calibrated estimates stay within this factor of the groomer's estimate
+MAX_ADJUSTMENT = 4.0
+MIN_ACTUAL_SECONDS = 60
+
+TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def title_buckets(title):
+    """Hashed token buckets of a title (crc32, so stable across processes)"""
+    return [zlib.crc32(token.encode('utf-8')) % N_BUCKETS for token in TOKEN.findall(title.lower())]
+
+
+def feature_indices(title, priority, estimate_minutes):
+    """Active feature indices plus the log(estimate) value"""
+    indices = title_buckets(title)
+    if priority in PRIORITIES:
+        indices.append(PRIORITY_OFFSET + PRIORITIES.index(priority))
+    indices.append(BIAS)
+    return indices, math.log(max(estimate_minutes, 1))
+
+
+class DurationEstimator:
+    def __init__(self, weights, samples=0, metrics=None, trained_at=None):
+        self.weights = weights
+        self.samples = samples
+        self.metrics = metrics or {}
+        self.trained_at = trained_at
+
+    def predict(self, title, priority, estimate_minutes):
+        """Calibrated duration in minutes for a task the groomer estimated at estimate_minutes"""
+        indices, log_estimate = feature_indices(title, priority, estimate_minutes)
+        log_minutes = sum(self.weights[i] for i in indices) + self.weights[LOG_ESTIMATE] * log_estimate
+        estimate = max(estimate_minutes, 1)
+        minutes = min(max(math.exp(log_minutes), estimate / MAX_ADJUSTMENT), estimate * MAX_ADJUSTMENT)
+        return max(1, round(minutes))
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        artifact = {
+            'version': ARTIFACT_VERSION,
+            'n_buckets': N_BUCKETS,
+            'weights': [round(weight, 6) for weight in self.weights],
+            'samples': self.samples,
+            'metrics': self.metrics,
+            'trained_at': self.trained_at,
+        }
+        # Write then rename so running processes never read a partial file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as fh:
+            json.dump(artifact, fh, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as fh:
+            artifact = json.load(fh)
+        if artifact.get('version') != ARTIFACT_VERSION or artifact.get('n_buckets') != N_BUCKETS:
+            raise ValueError(f"Incompatible duration model artifact: {path}")
+        return cls(artifact['weights'], artifact.get('samples', 0), artifact.get('metrics'), artifact.get('trained_at'))
+
+
+_cached = {'key': None, 'estimator': None}
+
+
+def get_estimator():
+    """The current artifact's estimator, reloaded when the file changes; None if untrained"""
+    if not getattr(settings, 'DURATION_ESTIMATOR_ENABLED', True):
+        return None
+    path = str(settings.DURATION_MODEL_PATH)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if _cached['key'] != key:
+        _cached['estimator'] = DurationEstimator.load(path)
+        _cached['key'] = key
+    return _cached['estimator']
+
+
+def training_rows(chunk_size=2000):
+    """(title, priority, groomer estimate, actual minutes) of completed, tracked tasks"""
+    from .models import Task
+
+    tasks = Task.objects.filter(completed=True, actual_seconds__gte=MIN_ACTUAL_SECONDS).values_list(
+        'title', 'priority', 'original_estimate', 'estimated_duration', 'actual_seconds'
+    )
+    for title, priority, original_estimate, estimated_duration, actual_seconds in tasks.iterator(chunk_size=chunk_size):
+        yield title, priority, original_estimate or estimated_duration, actual_seconds / 60
+
+
+def design_matrix(rows):
+    X = np.zeros((len(rows), N_FEATURES))
+    for row, (title, priority, estimate, _) in enumerate(rows):
+        indices, log_estimate = feature_indices(title, priority, estimate)
+        np.add.at(X[row], indices, 1.0)
+        X[row, LOG_ESTIMATE] = log_estimate
+    y = np.log(np.array([actual for _, _, _, actual in rows]))
+    return X, y
+
+
+def fit(rows, alpha=1.0, chunk_size=2000):
+    """Ridge regression via the normal equations, accumulated chunk by chunk"""
+    if np is None:
+        raise RuntimeError("Training the duration model requires NumPy")
+    gram = np.zeros((N_FEATURES, N_FEATURES))
+    moment = np.zeros(N_FEATURES)
+    for start in range(0, len(rows), chunk_size):
+        X, y = design_matrix(rows[start:start + chunk_size])
+        gram += X.T @ X
+        moment += X.T @ y
+    penalty = np.full(N_FEATURES, alpha)
+    # Barely shrink the intercept and estimate slope; keeps the system solvable
+    penalty[BIAS] = penalty[LOG_ESTIMATE] = 1e-6
+    return np.linalg.solve(gram + np.diag(penalty), moment)
+
+
+def mean_absolute_error(rows, predict):
+    return sum(abs(predict(title, priority, estimate) - actual) for title, priority, estimate, actual in rows) / len(rows)
+
+
+def train(alpha=1.0, holdout_every=5):
+    """
+    Fit on tracked completions and return the estimator.
+
+    Every holdout_every-th row is held out to compare the model's mean
+    absolute error against the groomer's estimates; the final model is then
+    refit on all rows.
+    """
+    rows = list(training_rows())
+    metrics = {}
+    holdout = rows[::holdout_every] if holdout_every else []
+    training = [row for i, row in enumerate(rows) if not holdout_every or i % holdout_every]
+    if holdout and training:
+        candidate = DurationEstimator(fit(training, alpha).tolist())
+        metrics = {
+            'holdout_samples': len(holdout),
+            'holdout_mae_minutes': round(mean_absolute_error(holdout, candidate.predict), 2),
+            'groomer_mae_minutes': round(mean_absolute_error(holdout, lambda title, priority, estimate: estimate), 2),
+        }
+    weights = fit(rows, alpha).tolist()
+    trained_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    return DurationEstimator(weights, samples=len(rows), metrics=metrics, trained_at=trained_at)
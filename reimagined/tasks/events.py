@@ -0,0 +1,218 @@
+"""
+Timeline push events.
+
+EventBroker fans events out to asyncio subscribers in this process (one
+bounded queue per connection, no thread per connection). Delivery between
+processes goes through a pluggable backend:
+
+- InProcessBackend: single process (runserver, one ASGI worker)
+- FileSpoolBackend: local cross-process stand-in; publishers append JSON lines
+  to <directory>/<channel>.jsonl and every process tails the files it has
+  subscribers for. Swap in a Redis/NATS backend with the same two methods
+  for multi-host deployments.
+
+Configure with settings.TIMELINE_EVENTS = {"BACKEND": "...", "OPTIONS": {...}}.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Sum
+from django.utils.module_loading import import_string
+
+QUEUE_SIZE = 100
+
+
+class InProcessBackend:
+    def __init__(self, broker):
+        self.broker = broker
+
+    def publish(self, channel, event):
+        self.broker.dispatch(channel, event)
+
+    def channel_subscribed(self, channel):
+        pass
+
+
+class FileSpoolBackend:
+    def __init__(self, broker, directory, poll_interval=0.25):
+        self.broker = broker
+        self.directory = str(directory)
+        self.poll_interval = poll_interval
+        self.offsets = {}
+        self.lock = threading.Lock()
+        self.thread = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, channel):
+        return os.path.join(self.directory, channel.replace(':', '_') + '.jsonl')
+
+    def publish(self, channel, event):
+        line = json.dumps({'channel': channel, 'event': event}, separators=(',', ':'), default=str) + '\n'
+        # O_APPEND keeps concurrent single-line writes from interleaving
+        fd = os.open(self.path(channel), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode('utf-8'))
+        finally:
+            os.close(fd)
+
+    def channel_subscribed(self, channel):
+        with self.lock:
+            if channel not in self.offsets:
+                path = self.path(channel)
+                # New subscribers only see events published from now on
+                self.offsets[channel] = os.path.getsize(path) if os.path.exists(path) else 0
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.tail, name='timeline-events', daemon=True)
+                self.thread.start()
+
+    def tail(self):
+        while True:
+            with self.lock:
+                channels = list(self.offsets.items())
+            for channel, offset in channels:
+                self.read_new_events(channel, offset)
+            time.sleep(self.poll_interval)
+
+    def read_new_events(self, channel, offset):
+        path = self.path(channel)
+        try:
+            if os.path.getsize(path) <= offset:
+                return
+            with open(path, 'rb') as fh:
+                fh.seek(offset)
+                data = fh.read()
+        except FileNotFoundError:
+            return
+        complete = data[:data.rfind(b'\n') + 1]
+        with self.lock:
+            self.offsets[channel] = offset + len(complete)
+        for line in complete.splitlines():
+            message = json.loads(line)
+            self.broker.dispatch(message['channel'], message['event'])
+
+
+class EventBroker:
+    def __init__(self, backend_path=None, options=None):
+        self.subscribers = defaultdict(set)
+        self.lock = threading.Lock()
+        config = getattr(settings, 'TIMELINE_EVENTS', {})
+        backend_class = import_string(backend_path or config.get('BACKEND', 'tasks.events.InProcessBackend'))
+        self.backend = backend_class(self, **(options if options is not None else config.get('OPTIONS', {})))
+
+    def publish(self, channel, event):
+        """Publish from any thread or process"""
+        self.backend.publish(channel, event)
+
+    def dispatch(self, channel, event):
+        """Deliver an event to this process's subscribers (called by the backend)"""
+        with self.lock:
+            subscribers = list(self.subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._enqueue, queue, event)
+
+    @staticmethod
+    def _enqueue(queue, event):
+        if queue.full():
+            queue.get_nowait()  # slow consumer: drop the oldest event
+        queue.put_nowait(event)
+
+    def subscriber_count(self, channel=None):
+        with self.lock:
+            if channel is not None:
+                return len(self.subscribers.get(channel, ()))
+            return sum(len(subscribers) for subscribers in self.subscribers.values())
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        queue = asyncio.Queue(QUEUE_SIZE)
+        entry = (asyncio.get_running_loop(), queue)
+        with self.lock:
+            self.subscribers[channel].add(entry)
+        self.backend.channel_subscribed(channel)
+        try:
+            yield queue
+        finally:
+            with self.lock:
+                self.subscribers[channel].discard(entry)
+                if not self.subscribers[channel]:
+                    del self.subscribers[channel]
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = EventBroker()
+    return _broker
+
+
+def task_list_channel(task_list_id):
+    return f"tasklist:{task_list_id}"
+
+
+def timeline_state(task_list_id):
+    """Ready frontier and remaining work, shaped like the completion API response"""
+    from .api import serialize_tasks
+    from .models import Task
+
+    tasks = Task.objects.filter(task_list_id=task_list_id)
+    remaining = tasks.filter(completed=False).aggregate(minutes=Sum('estimated_duration'))['minutes']
+    return {
+        'ready': serialize_tasks(tasks.ready()),
+        'remaining_minutes': remaining or 0,
+        'server_time': time.time(),
+    }
+
+
+def publish_tasks_completed(task_list_id, task_ids):
+    """Push a task_completed event with the task list's new timeline state"""
+    event = {'type': 'task_completed', 'completed': sorted(task_ids), **timeline_state(task_list_id)}
+    get_broker().publish(task_list_channel(task_list_id), event)
+
+
+def publish_on_commit(completed_by_list):
+    """Publish task_completed events once the surrounding transaction commits"""
+    def publish():
+        for task_list_id, task_ids in completed_by_list.items():
+            publish_tasks_completed(task_list_id, task_ids)
+
+    transaction.on_commit(publish)
+
+
+def can_stream(request):
+    """
+    True when the request came through the ASGI handler. Under WSGI an open
+    event stream holds its worker thread forever, so timelines served that way
+    get no stream and rely on their own API responses.
+    """
+    return isinstance(request, ASGIRequest)
+
+
+def format_sse(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'), default=str)}\n\n"
+
+
+async def event_stream(channel, heartbeat):
+    """Server-Sent Events for one connection: events as they arrive, keepalives when idle"""
+    async with get_broker().subscribe(channel) as queue:
+        yield 'retry: 5000\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            yield format_sse(event)
@@ -0,0 +1,54 @@
+import zlib
+
+from django.db import models
+
+PLAIN_MARKER = b't'
+COMPRESSED_MARKER = b'z'
+
+
+class CompressedTextField(models.BinaryField):
+    """
+    Text stored as bytes, zlib-compressed once it exceeds compress_threshold bytes.
+
+    The first stored byte records the encoding, so short values stay readable
+    and the threshold can change without rewriting existing rows.
+    """
+
+    def __init__(self, *args, compress_threshold=1024, **kwargs):
+        self.compress_threshold = compress_threshold
+        kwargs.setdefault('default', b'')
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.compress_threshold != 1024:
+            kwargs['compress_threshold'] = self.compress_threshold
+        return name, path, args, kwargs
+
+    def get_default(self):
+        return self.to_python(super().get_default())
+
+    def from_db_value(self, value, expression, connection):
+        return self.to_python(value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        value = bytes(value)
+        if not value:
+            return ''
+        marker, payload = value[:1], value[1:]
+        if marker == COMPRESSED_MARKER:
+            payload = zlib.decompress(payload)
+        return payload.decode('utf-8')
+
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            encoded = value.encode('utf-8')
+            if len(encoded) > self.compress_threshold:
+                value = COMPRESSED_MARKER + zlib.compress(encoded)
+            else:
+                value = PLAIN_MARKER + encoded
+        return super().get_prep_value(value)
@@ -0,0 +1,26 @@
+"""
+Deferred imports for heavy optional modules.
+
+`requests` (through urllib3 and the SSL stack) and NumPy together cost
+~130 ms to import. Most processes never use them: migrate, a worker
+serving timeline pages, or the test runner. lazy_import() returns a module
+whose code runs on first attribute access, so `requests.post(...)` and
+`mock.patch('tasks.services.requests.post')` work unchanged.
+"""
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """The module `name`, executed on first attribute access; None if it isn't installed"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
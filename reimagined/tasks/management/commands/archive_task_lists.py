@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from tasks.archive import archivable_task_lists, archive_task_list
+
+
+class Command(BaseCommand):
+    help = "Move completed (or stale) task lists into compressed archive snapshots"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=int, default=None,
+            help="Also archive task lists not updated for this many days",
+        )
+        parser.add_argument('--limit', type=int, default=100, help="Maximum task lists to archive in this run")
+        parser.add_argument('--batch-size', type=int, default=500, help="Tasks deleted per DELETE statement")
+        parser.add_argument('--dry-run', action='store_true', help="List candidates without archiving")
+
+    def handle(self, *args, **options):
+        candidates = archivable_task_lists(options['older_than_days'])[:options['limit']]
+
+        archived = 0
+        for task_list in candidates:
+            if options['dry_run']:
+                self.stdout.write(f"Would archive #{task_list.id} {task_list.name} ({task_list.task_count} tasks)")
+                continue
+            archive_task_list(task_list, batch_size=options['batch_size'])
+            archived += 1
+            self.stdout.write(f"Archived #{task_list.id} {task_list.name} ({task_list.task_count} tasks)")
+
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"Archived {archived} task list(s)"))
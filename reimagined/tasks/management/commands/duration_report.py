@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.tracking import duration_report
+
+
+class Command(BaseCommand):
+    help = "Report estimated vs actual time of tracked, completed tasks (from DurationRollup)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help="Only include the last N days")
+        parser.add_argument('--by', choices=['priority', 'day'], default='priority', help="Grouping")
+
+    def handle(self, *args, **options):
+        since = None
+        if options['days'] is not None:
+            since = timezone.localdate() - timedelta(days=options['days'] - 1)
+        rows = duration_report(since, options['by'])
+        if not rows:
+            self.stdout.write("No tracked completions yet")
+            return
+
+        self.stdout.write(f"{options['by']:<12} {'tasks':>7} {'estimated h':>12} {'actual h':>10} {'actual/est':>11}")
+        totals = [0, 0, 0]
+        for row in rows:
+            self.stdout.write(self.format_row(str(row[options['by']]), row['tasks'], row['estimated_minutes'], row['actual_seconds']))
+            totals = [totals[0] + row['tasks'], totals[1] + row['estimated_minutes'], totals[2] + row['actual_seconds']]
+        self.stdout.write(self.format_row('total', *totals))
+
+    def format_row(self, label, tasks, estimated_minutes, actual_seconds):
+        ratio = f"{actual_seconds / (estimated_minutes * 60):.2f}" if estimated_minutes else '-'
+        return f"{label:<12} {tasks:>7} {estimated_minutes / 60:>12.1f} {actual_seconds / 3600:>10.1f} {ratio:>11}"
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.export import CHUNK_SIZE, FORMATS, export, parse_start
+
+
+class Command(BaseCommand):
+    help = "Stream tasks (all, or selected task lists) as CSV, JSONL or iCalendar"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv', help="Output format")
+        parser.add_argument(
+            '--task-list', type=int, action='append', dest='task_lists',
+            help="TaskList id to export (repeatable; default: every task)",
+        )
+        parser.add_argument('--output', default=None, help="File to write (default: stdout)")
+        parser.add_argument('--start', default=None, help="Calendar start time, ISO 8601 (default: now)")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Rows fetched per database round trip")
+
+    def handle(self, *args, **options):
+        try:
+            start = parse_start(options['start']) if options['start'] else None
+        except ValueError:
+            raise CommandError("--start must be an ISO 8601 date/time")
+
+        chunks = export(options['format'], options['task_lists'], start=start, chunk_size=options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as fh:
+                for chunk in chunks:
+                    fh.write(chunk)
+            self.stderr.write(f"Wrote {options['output']}")
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from tasks.dedup import index_tasks
+from tasks.models import Task, TaskBucket, TaskSignature
+
+
+class Command(BaseCommand):
+    help = "Compute MinHash signatures and LSH buckets for tasks that have none (e.g. bulk-created ones)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help="Re-index every task, not just unindexed ones")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Tasks indexed per transaction")
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            TaskBucket.objects.all().delete()
+            TaskSignature.objects.all().delete()
+        pending = Task.objects.filter(signature__isnull=True).order_by('id').only('id', 'title', 'description')
+
+        indexed, after = 0, 0
+        while True:
+            batch = list(pending.filter(id__gt=after)[:options['batch_size']])
+            if not batch:
+                break
+            index_tasks(batch)
+            indexed += len(batch)
+            after = batch[-1].id
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} task(s)"))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.models import TaskList
+from tasks.scheduling import CycleError, save_schedule
+
+
+class Command(BaseCommand):
+    help = "Plan the shortest schedule of a task list's incomplete tasks on parallel lanes and save it"
+
+    def add_arguments(self, parser):
+        parser.add_argument('task_list_id', type=int, nargs='+')
+        parser.add_argument('--lanes', type=int, help="Parallel lanes (default: SCHEDULE_LANES)")
+        parser.add_argument('--budget-ms', type=int, help="Search time per task list (default: SCHEDULE_BUDGET_MS)")
+
+    def handle(self, *args, **options):
+        for task_list_id in options['task_list_id']:
+            try:
+                task_list = TaskList.objects.get(pk=task_list_id)
+            except TaskList.DoesNotExist:
+                raise CommandError(f"Task list {task_list_id} does not exist")
+            try:
+                schedule, plan = save_schedule(task_list, options['lanes'], options['budget_ms'])
+            except CycleError as e:
+                raise CommandError(f"{task_list}: {e}")
+            proof = "optimal" if plan.optimal else f"lower bound {plan.lower_bound} min"
+            self.stdout.write(
+                f"{task_list}: {plan.makespan} min on {len(schedule.parallel_blocks)} lane(s) ({proof}), "
+                f"{plan.sequential} min one at a time; {plan.nodes} nodes in {plan.elapsed_ms:.0f} ms"
+            )
@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.profiling import HEADER, make_token
+
+
+class Command(BaseCommand):
+    help = "Print a signed header value that enables profiling for requests that send it"
+
+    def handle(self, *args, **options):
+        token = make_token()
+        self.stdout.write(f"{HEADER}: {token}")
+        self.stderr.write(f"Valid for {settings.PROFILING_TOKEN_MAX_AGE} seconds")
@@ -0,0 +1,58 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.cassettes import Cassette, cassette_path, use_cassette
+from tasks.services import ClaudeTaskGroomer
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-run recorded grooming requests (e.g. a CLAUDE_CASSETTE=production capture) through ClaudeTaskGroomer, "
+        "answered from the cassette, and report timings"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('cassette', help="Cassette name under CLAUDE_CASSETTE_DIR, or a path to a .jsonl.gz file")
+        parser.add_argument(
+            '--latency', type=float, default=0.0,
+            help="Replay Claude's recorded response times scaled by this factor (1.0 = as recorded, default: none)",
+        )
+        parser.add_argument('--repeat', type=int, default=1, help="Replay the whole cassette this many times")
+        parser.add_argument('--save', action='store_true', help="Also create the task lists, as the web flow does")
+
+    def handle(self, *args, **options):
+        path = options['cassette']
+        if not path.endswith('.jsonl.gz'):
+            path = cassette_path(path)
+        exchanges = [exchange for exchange in Cassette(path).exchanges() if exchange.get('inputs')]
+        if not exchanges:
+            raise CommandError(f"{path} holds no recorded grooming requests")
+
+        # Replay never sends the key, but the groomer insists on one
+        settings.CLAUDE_API_KEY = settings.CLAUDE_API_KEY or 'cassette-replay'
+        groomer = ClaudeTaskGroomer()
+        timings, failures = [], 0
+        with use_cassette(path, 'replay', latency=options['latency']):
+            for _ in range(options['repeat']):
+                for number, exchange in enumerate(exchanges, 1):
+                    inputs = exchange['inputs']
+                    # Part of the fingerprint, so it has to be the recorded endpoint
+                    groomer.api_url = exchange['request']['url']
+                    started = time.perf_counter()
+                    result = groomer.groom_tasks(inputs['todo_text'], inputs.get('context', ''))
+                    if result['success'] and options['save']:
+                        groomer.create_task_list_from_groomed_tasks(f"Replay {number}", inputs['todo_text'], result)
+                    timings.append(time.perf_counter() - started)
+                    if not result['success']:
+                        failures += 1
+                        self.stderr.write(f"#{number}: {result['error']}")
+
+        timings.sort()
+        quantiles = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+        self.stdout.write(
+            f"{len(timings)} request(s) in {sum(timings):.3f}s, {failures} failed: "
+            f"p50 {quantiles[49] * 1000:.1f} ms, p95 {quantiles[94] * 1000:.1f} ms, max {timings[-1] * 1000:.1f} ms"
+        )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.synthetic import SHAPES, seed_task_lists, synthetic_task_lists
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic task lists with dependency DAGs (for load tests and benchmarks)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lists', type=int, default=10, help="Number of task lists")
+        parser.add_argument('--tasks', type=int, default=100, help="Tasks per list")
+        parser.add_argument('--shape', choices=SHAPES, default='layered', help="Dependency DAG shape")
+        parser.add_argument('--density', type=float, default=0.3, help="Edge probability (layered, random)")
+        parser.add_argument('--parallel-ratio', type=float, default=0.1, help="Share of tasks that can run in parallel")
+        parser.add_argument('--seed', type=int, default=None, help="Random seed for reproducible data")
+        parser.add_argument('--clear', action='store_true', help="Delete previously generated synthetic lists first")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted, _ = synthetic_task_lists().delete()
+            self.stdout.write(f"Deleted {deleted} synthetic rows")
+
+        try:
+            task_lists = seed_task_lists(
+                lists=options['lists'], tasks_per_list=options['tasks'], shape=options['shape'],
+                density=options['density'], parallel_ratio=options['parallel_ratio'], seed=options['seed'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(task_lists)} task list(s) with {options['tasks']} {options['shape']} tasks each"
+        ))
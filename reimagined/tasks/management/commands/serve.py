@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from mindtimer import serving
+
+HOOKS = ('on_starting', 'when_ready', 'post_worker_init', 'worker_exit')
+
+
+class Command(BaseCommand):
+    help = "Serve MindTimer with gunicorn: preloaded app, prefork workers, graceful shutdown (see mindtimer/serving.py)"
+
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bind', default=serving.bind, help="Address to listen on (default: %(default)s)")
+        parser.add_argument('--workers', type=int, default=serving.workers, help="Worker processes (default: %(default)s)")
+        parser.add_argument('--threads', type=int, default=serving.threads, help="Threads per worker (default: %(default)s)")
+        parser.add_argument('--timeout', type=int, default=serving.timeout, help="Seconds before a stuck worker is restarted")
+        parser.add_argument(
+            '--asgi', action='store_true',
+            help="Serve mindtimer.asgi with uvicorn workers (needed for the live timeline stream)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from gunicorn.app.base import BaseApplication
+        except ImportError:
+            raise CommandError("manage.py serve needs gunicorn: pip install gunicorn")
+
+        config = {
+            'bind': options['bind'],
+            'workers': options['workers'],
+            'threads': options['threads'],
+            'worker_class': serving.worker_class,
+            'preload_app': serving.preload_app,
+            'timeout': options['timeout'],
+            'graceful_timeout': serving.graceful_timeout,
+            'keepalive': serving.keepalive,
+            **{hook: getattr(serving, hook) for hook in HOOKS},
+        }
+        if options['asgi']:
+            config['worker_class'] = asgi_worker_class()
+        problems = serving.per_process_state(options['workers'], options['asgi'])
+        if problems:
+            raise CommandError(
+                f"Refusing to start {options['workers']} workers: " + '; '.join(problems)
+                + ". Use --workers 1 to serve from one process."
+            )
+
+        class Application(BaseApplication):
+            def load_config(self):
+                for key, value in config.items():
+                    self.cfg.set(key, value)
+
+            def load(self):
+                if options['asgi']:
+                    from mindtimer.asgi import application
+                else:
+                    from mindtimer.wsgi import application
+                return application
+
+        Application().run()
+
+
+def asgi_worker_class():
+    from importlib.util import find_spec
+
+    for path in serving.ASGI_WORKER_CLASSES:
+        try:
+            if find_spec(path.rsplit('.', 1)[0]):
+                return path
+        except ModuleNotFoundError:
+            continue
+    raise CommandError("--asgi needs uvicorn: pip install 'uvicorn[standard]'")
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import estimator
+
+
+class Command(BaseCommand):
+    help = "Train the local duration estimator on tracked task durations and write its artifact"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--alpha', type=float, default=1.0, help="Ridge regularization strength")
+        parser.add_argument('--min-samples', type=int, default=50, help="Refuse to train on fewer completed tasks")
+        parser.add_argument('--output', default=None, help="Artifact path (default: DURATION_MODEL_PATH)")
+
+    def handle(self, *args, **options):
+        if estimator.np is None:
+            raise CommandError("Training the duration model requires NumPy (pip install numpy)")
+
+        model = estimator.train(alpha=options['alpha'])
+        if model.samples < options['min_samples']:
+            raise CommandError(
+                f"Only {model.samples} tracked completions; need at least {options['min_samples']}"
+            )
+
+        output = options['output'] or str(settings.DURATION_MODEL_PATH)
+        model.save(output)
+        self.stdout.write(f"Trained on {model.samples} tasks")
+        if model.metrics:
+            self.stdout.write(
+                f"Holdout MAE: {model.metrics['holdout_mae_minutes']} min "
+                f"(groomer estimates: {model.metrics['groomer_mae_minutes']} min)"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Wrote {output}"))
@@ -0,0 +1,305 @@
+"""
+Prometheus metrics, served in the text exposition format at /metrics.
+
+Every metric here is a counter or a histogram, so the values of several
+processes add up. Each process keeps its values in memory behind one small
+lock per metric. When METRICS_DIR is set, the process also writes a snapshot
+to METRICS_DIR/<pid>.json, at most every METRICS_FLUSH_INTERVAL seconds and
+when it exits. /metrics sums the snapshots of the other processes with its
+own live values, so the numbers are right under a pre-fork server whichever
+worker answers the scrape. Clear METRICS_DIR when the server starts.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REGISTRY = {}
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.values = {}
+        REGISTRY[name] = self
+
+    def label_values(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def reset(self):
+        with self.lock:
+            self.values = {}
+
+    def snapshot(self):
+        with self.lock:
+            return [[list(labels), self.copy(value)] for labels, value in self.values.items()]
+
+    def merge(self, values, snapshot):
+        for labels, value in snapshot:
+            labels = tuple(labels)
+            values[labels] = self.add(values[labels], value) if labels in values else value
+
+    def format_labels(self, labels, extra=()):
+        pairs = list(zip(self.labelnames, labels)) + list(extra)
+        if not pairs:
+            return ''
+        escaped = (f'{name}="{escape(value)}"' for name, value in pairs)
+        return '{' + ','.join(escaped) + '}'
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self.label_values(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def copy(self, value):
+        return value
+
+    def add(self, a, b):
+        return a + b
+
+    def samples(self, values):
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}{self.format_labels(labels)} {format_value(value)}"
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram; each value is [bucket counts..., sum, count]"""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self.label_values(labels)
+        with self.lock:
+            row = self.values.get(key)
+            if row is None:
+                row = self.values[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[index] += 1
+                    break
+            row[-2] += value
+            row[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def copy(self, value):
+        return list(value)
+
+    def add(self, a, b):
+        return [x + y for x, y in zip(a, b)]
+
+    def samples(self, values):
+        for labels, row in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                yield f"{self.name}_bucket{self.format_labels(labels, [('le', format_value(bound))])} {cumulative}"
+            yield f"{self.name}_bucket{self.format_labels(labels, [('le', '+Inf')])} {row[-1]}"
+            yield f"{self.name}_sum{self.format_labels(labels)} {format_value(row[-2])}"
+            yield f"{self.name}_count{self.format_labels(labels)} {row[-1]}"
+
+
+def escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+REQUESTS = Counter(
+    'mindtimer_http_requests_total', "HTTP requests by URL name, method and status code",
+    ('view', 'method', 'status'),
+)
+REQUEST_SECONDS = Histogram(
+    'mindtimer_http_request_duration_seconds', "Time to produce a response, by URL name", ('view',),
+)
+DB_QUERIES = Counter('mindtimer_db_queries_total', "Database queries run by requests, by URL name", ('view',))
+DB_SECONDS = Histogram(
+    'mindtimer_db_request_duration_seconds', "Database time spent per request, by URL name", ('view',),
+)
+GROOM_SECONDS = Histogram(
+    'mindtimer_groom_duration_seconds', "ClaudeTaskGroomer.groom_tasks latency, including the API call",
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+)
+GROOM_TOKENS = Counter('mindtimer_groom_tokens_total', "Claude API tokens used by grooming", ('direction',))
+GROOM_ERRORS = Counter('mindtimer_groom_errors_total', "Failed groom_tasks calls by cause", ('reason',))
+PAGE_CACHE = Counter(
+    'mindtimer_page_cache_requests_total', "Cached task list page lookups by view and result (hit or miss)",
+    ('view', 'result'),
+)
+
+
+def record_groom_tokens(usage):
+    """Count the usage block of a Messages API response"""
+    if not isinstance(usage, dict):
+        return
+    for direction in ('input', 'output'):
+        tokens = usage.get(f'{direction}_tokens')
+        if isinstance(tokens, int):
+            GROOM_TOKENS.inc(tokens, direction=direction)
+
+
+# Multi-process storage ---------------------------------------------------------
+
+_last_flush = 0.0
+
+
+def reset():
+    """Forget this process's values (a forked worker starts from zero)"""
+    global _last_flush
+    for metric in REGISTRY.values():
+        metric.reset()
+    _last_flush = 0.0
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset)
+
+
+def snapshot():
+    return {name: metric.snapshot() for name, metric in REGISTRY.items()}
+
+
+def flush(force=False):
+    """Write this process's snapshot to METRICS_DIR (throttled unless force)"""
+    global _last_flush
+    directory = getattr(settings, 'METRICS_DIR', None)
+    now = time.monotonic()
+    if not directory or (not force and _last_flush and now - _last_flush < settings.METRICS_FLUSH_INTERVAL):
+        return
+    _last_flush = now
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{os.getpid()}.json")
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as fh:
+        json.dump(snapshot(), fh)
+    os.replace(tmp, path)
+
+
+atexit.register(lambda: flush(force=True))
+
+
+def collect():
+    """{name: {labels: value}} summed over this process and the other processes' snapshots"""
+    snapshots = [snapshot()]
+    directory = getattr(settings, 'METRICS_DIR', None)
+    if directory and os.path.isdir(directory):
+        own = f"{os.getpid()}.json"
+        for filename in os.listdir(directory):
+            if filename.endswith('.json') and filename != own:
+                try:
+                    with open(os.path.join(directory, filename)) as fh:
+                        snapshots.append(json.load(fh))
+                except (OSError, ValueError):
+                    continue  # a file being replaced or left half-written by a killed worker
+    totals = {name: {} for name in REGISTRY}
+    for data in snapshots:
+        for name, values in data.items():
+            if name in REGISTRY:
+                REGISTRY[name].merge(totals[name], values)
+    return totals
+
+
+def render():
+    lines = []
+    for name, values in collect().items():
+        metric = REGISTRY[name]
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.type}")
+        lines.extend(metric.samples(values))
+    return '\n'.join(lines) + '\n'
+
+
+# Request instrumentation ------------------------------------------------------
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name or match._func_path
+
+
+class DatabaseTimer:
+    """execute_wrapper that counts queries and adds up their time"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+def record_request(request, response, seconds, database=None):
+    view = view_name(request)
+    REQUESTS.inc(view=view, method=request.method, status=response.status_code)
+    REQUEST_SECONDS.observe(seconds, view=view)
+    if database is not None:
+        DB_QUERIES.inc(database.count, view=view)
+        DB_SECONDS.observe(database.seconds, view=view)
+    flush()
+
+
+class MetricsMiddleware:
+    """
+    Record latency and database time per URL name. Async requests (the live
+    timeline stream) are timed without database figures, since their queries
+    run in worker threads.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        database = DatabaseTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(database):
+            response = self.get_response(request)
+        record_request(request, response, time.perf_counter() - start, database)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        record_request(request, response, time.perf_counter() - start)
+        return response
@@ -0,0 +1,111 @@
+import secrets
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_task_ids(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    used = set()
+    for task in Task.objects.only("pk").iterator():
+        task_id = secrets.token_hex(2)
+        while task_id in used:
+            task_id = secrets.token_hex(2)
+        used.add(task_id)
+        Task.objects.filter(pk=task.pk).update(task_id=task_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="priority",
+            field=models.CharField(
+                choices=[("low", "Low"), ("medium", "Medium"), ("high", "High")],
+                default="medium",
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="task_id",
+            field=models.CharField(default="", max_length=4),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_task_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="task",
+            name="task_id",
+            field=models.CharField(
+                help_text="Unique 4-byte hexadecimal task identifier",
+                max_length=4,
+                unique=True,
+            ),
+        ),
+        # Promote the auto-created M2M table to an explicit through model.
+        # The table already exists, so only the migration state changes.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="TaskDependency",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "from_task",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="+",
+                                to="tasks.task",
+                            ),
+                        ),
+                        (
+                            "to_task",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="+",
+                                to="tasks.task",
+                            ),
+                        ),
+                    ],
+                    options={
+                        "db_table": "tasks_task_dependencies",
+                        "unique_together": {("from_task", "to_task")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="task",
+                    name="dependencies",
+                    field=models.ManyToManyField(
+                        blank=True,
+                        related_name="dependents",
+                        through="tasks.TaskDependency",
+                        to="tasks.task",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["task_list", "completed", "schedule_order"],
+                name="task_list_ready_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskdependency",
+            index=models.Index(fields=["to_task", "from_task"], name="task_dep_reverse_idx"),
+        ),
+    ]
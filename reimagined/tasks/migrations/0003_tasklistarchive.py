@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0002_task_priority_task_id_ready_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskListArchive",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "original_id",
+                    models.PositiveBigIntegerField(
+                        help_text="id of the archived TaskList", unique=True
+                    ),
+                ),
+                ("name", models.CharField(max_length=200)),
+                ("task_count", models.PositiveIntegerField(default=0)),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        help_text="When the original TaskList was created"
+                    ),
+                ),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "snapshot",
+                    models.BinaryField(help_text="zlib-compressed JSON snapshot"),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:56
+
+import tasks.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0003_tasklistarchive"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tasklist",
+            name="analysis",
+            field=tasks.fields.CompressedTextField(
+                blank=True,
+                default=b"",
+                help_text="Claude's analysis of the groomed list",
+            ),
+        ),
+    ]
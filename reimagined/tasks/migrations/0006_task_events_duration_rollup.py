@@ -0,0 +1,101 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0005_task_list_updated_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="actual_seconds",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Tracked working time in seconds"
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="running_since",
+            field=models.DateTimeField(
+                blank=True, help_text="Start of the open tracking interval", null=True
+            ),
+        ),
+        migrations.CreateModel(
+            name="DurationRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("low", "Low"),
+                            ("medium", "Medium"),
+                            ("high", "High"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("task_count", models.PositiveIntegerField(default=0)),
+                ("estimated_minutes", models.PositiveBigIntegerField(default=0)),
+                ("actual_seconds", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "unique_together": {("day", "priority")},
+            },
+        ),
+        migrations.CreateModel(
+            name="TaskEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "event_type",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (1, "Start"),
+                            (2, "Pause"),
+                            (3, "Resume"),
+                            (4, "Complete"),
+                        ]
+                    ),
+                ),
+                ("timestamp", models.DateTimeField()),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="events",
+                        to="tasks.task",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["task", "timestamp"], name="task_event_task_ts_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0006_task_events_duration_rollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="original_estimate",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Groomer's estimate in minutes, before local calibration",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0007_task_original_estimate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfileArtifact",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("path", models.CharField(max_length=500)),
+                ("method", models.CharField(max_length=10)),
+                (
+                    "status_code",
+                    models.PositiveSmallIntegerField(blank=True, null=True),
+                ),
+                ("duration_ms", models.FloatField()),
+                (
+                    "trigger",
+                    models.CharField(help_text="header or rule", max_length=20),
+                ),
+                (
+                    "profile_file",
+                    models.CharField(
+                        help_text="pstats dump (open with pstats or snakeviz)",
+                        max_length=500,
+                    ),
+                ),
+                (
+                    "report",
+                    models.TextField(help_text="Top functions and allocation diff"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ProfilingRule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "path_prefix",
+                    models.CharField(
+                        default="/",
+                        help_text="e.g. /results/ or / for any request",
+                        max_length=200,
+                    ),
+                ),
+                (
+                    "remaining",
+                    models.PositiveIntegerField(
+                        default=1, help_text="Matching requests still to profile"
+                    ),
+                ),
+                ("enabled", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from tasks.search import install
+
+    install(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    from tasks.search import uninstall
+
+    uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    """FTS5 tables and triggers on SQLite, GIN indexes on PostgreSQL (see tasks.search)"""
+
+    dependencies = [
+        ("tasks", "0008_profiling"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0009_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskSignature",
+            fields=[
+                (
+                    "task",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="signature",
+                        serialize=False,
+                        to="tasks.task",
+                    ),
+                ),
+                (
+                    "minhash",
+                    models.BinaryField(
+                        help_text="64 little-endian uint32 MinHash values"
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="TaskBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.BigIntegerField()),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="tasks.task",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["key", "task"], name="task_bucket_key_idx")
+                ],
+            },
+        ),
+    ]
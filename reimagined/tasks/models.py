@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Exists, F, OuterRef, Q
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+from .fields import CompressedTextField
 import secrets
 import re
 
@@ -7,6 +10,7 @@ import re
 class TaskList(models.Model):
     name = models.CharField(max_length=200)
     raw_input = models.TextField(help_text="Original free-form todo list input")
+    analysis = CompressedTextField(blank=True, help_text="Claude's analysis of the groomed list")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -17,6 +21,58 @@ class TaskList(models.Model):
         return sum(task.estimated_duration for task in self.tasks.all())
 
 
+class TaskQuerySet(models.QuerySet):
+    def ready(self):
+        """Incomplete tasks whose dependencies are all completed, in schedule order"""
+        blocking = TaskDependency.objects.filter(from_task=OuterRef('pk'), to_task__completed=False)
+        return self.filter(completed=False).filter(~Exists(blocking)).order_by(
+            F('schedule_order').asc(nulls_last=True), 'id'
+        )
+
+    def complete(self, track=True):
+        """
+        Mark every incomplete task in the queryset completed with a single UPDATE
+        and return the tasks that this made ready.
+
+        QuerySet.update() sends no signals, so the owning TaskLists' updated_at
+        and page cache versions are refreshed here. Connected timelines get a
+        task_completed event after commit. Tracked tasks have their clocks
+        stopped and join the duration rollups; record_events() passes
+        track=False because it has already done that.
+        """
+        from .caching import bump_task_list_version
+        from .events import publish_on_commit
+        from .tracking import close_tracking
+
+        with transaction.atomic():
+            rows = list(self.filter(completed=False).values_list('pk', 'task_id', 'task_list_id'))
+            if not rows:
+                return []
+            ids = [pk for pk, _, _ in rows]
+            completed_by_list = {}
+            for _, task_id, task_list_id in rows:
+                if task_list_id is not None:
+                    completed_by_list.setdefault(task_list_id, []).append(task_id)
+            task_list_ids = set(completed_by_list)
+
+            now = timezone.now()
+            Task.objects.filter(pk__in=ids).update(completed=True, updated_at=now)
+            if track:
+                tracked = Task.objects.select_for_update().filter(pk__in=ids).filter(
+                    Q(running_since__isnull=False) | Q(actual_seconds__gt=0)
+                )
+                tracked = close_tracking(tracked, now)
+                if tracked:
+                    Task.objects.bulk_update(tracked, ['actual_seconds', 'running_since'])
+            TaskList.objects.filter(pk__in=task_list_ids).update(updated_at=now)
+            publish_on_commit(completed_by_list)
+        for task_list_id in task_list_ids:
+            bump_task_list_version(task_list_id)
+
+        dependents = TaskDependency.objects.filter(to_task_id__in=ids).values('from_task_id')
+        return list(Task.objects.filter(pk__in=dependents).ready())
+
+
 class Task(models.Model):
     PRIORITY_CHOICES = [
         ('low', 'Low'),
@@ -29,20 +85,45 @@ class Task(models.Model):
     task_id = models.CharField(max_length=4, help_text="Unique 4-byte hexadecimal task identifier", unique=True)
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium')
     estimated_duration = models.PositiveIntegerField(help_text="Duration in minutes")
+    original_estimate = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Groomer's estimate in minutes, before local calibration"
+    )
     completed = models.BooleanField(default=False)
     task_list = models.ForeignKey(TaskList, related_name='tasks', on_delete=models.CASCADE, null=True, blank=True)
     schedule_order = models.PositiveIntegerField(null=True, blank=True)
-    dependencies = models.ManyToManyField('self', blank=True, symmetrical=False, related_name='dependents')
+    dependencies = models.ManyToManyField(
+        'self', blank=True, symmetrical=False, related_name='dependents', through='TaskDependency'
+    )
     can_run_parallel = models.BooleanField(default=False, help_text="Can this task run in parallel with others?")
+    # Materialized from TaskEvent as events are recorded (see tasks.tracking)
+    actual_seconds = models.PositiveIntegerField(default=0, help_text="Tracked working time in seconds")
+    running_since = models.DateTimeField(null=True, blank=True, help_text="Start of the open tracking interval")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['task_list', 'completed', 'schedule_order'], name='task_list_ready_idx'),
+            models.Index(fields=['task_list', 'updated_at'], name='task_list_updated_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.estimated_duration} min)"
 
     def mark_completed(self):
-        self.completed = True
-        self.save()
+        from .events import publish_on_commit
+        from .tracking import close_tracking
+
+        with transaction.atomic():
+            self.completed = True
+            fields = ['completed', 'updated_at']
+            if close_tracking([self], timezone.now()):
+                fields += ['actual_seconds', 'running_since']
+            self.save(update_fields=fields)
+        if self.task_list_id is not None:
+            publish_on_commit({self.task_list_id: [self.task_id]})
 
     def save(self, *args, **kwargs):
         if not self.task_id:
@@ -134,6 +215,23 @@ class Task(models.Model):
         return ", ".join(deps)
 
 
+class TaskDependency(models.Model):
+    """Through table for Task.dependencies: from_task is blocked until to_task is completed"""
+    from_task = models.ForeignKey(Task, related_name='+', on_delete=models.CASCADE)
+    to_task = models.ForeignKey(Task, related_name='+', on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = 'tasks_task_dependencies'
+        unique_together = [('from_task', 'to_task')]
+        indexes = [
+            # Reverse lookups: which tasks does completing to_task unblock?
+            models.Index(fields=['to_task', 'from_task'], name='task_dep_reverse_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.from_task_id} -> {self.to_task_id}"
+
+
 class Schedule(models.Model):
     OPTIMIZATION_CHOICES = [
         ('sequential', 'Sequential'),
@@ -152,3 +250,114 @@ class Schedule(models.Model):
 
     def total_duration(self):
         return sum(task.estimated_duration for task in self.task_list.tasks.all())
+
+
+class TaskEvent(models.Model):
+    """Append-only time-tracking log; Task.actual_seconds is derived from it"""
+    START = 1
+    PAUSE = 2
+    RESUME = 3
+    COMPLETE = 4
+    EVENT_TYPE_CHOICES = [
+        (START, 'Start'),
+        (PAUSE, 'Pause'),
+        (RESUME, 'Resume'),
+        (COMPLETE, 'Complete'),
+    ]
+
+    task = models.ForeignKey(Task, related_name='events', on_delete=models.CASCADE)
+    event_type = models.PositiveSmallIntegerField(choices=EVENT_TYPE_CHOICES)
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', 'timestamp'], name='task_event_task_ts_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id} {self.get_event_type_display()} at {self.timestamp}"
+
+
+class DurationRollup(models.Model):
+    """Estimated vs actual time of tracked, completed tasks per day and priority"""
+    day = models.DateField()
+    priority = models.CharField(max_length=10, choices=Task.PRIORITY_CHOICES)
+    task_count = models.PositiveIntegerField(default=0)
+    estimated_minutes = models.PositiveBigIntegerField(default=0)
+    actual_seconds = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        unique_together = [('day', 'priority')]
+
+    def __str__(self):
+        return f"{self.day} {self.priority}: {self.task_count} tasks"
+
+
+class TaskListArchive(models.Model):
+    """Cold storage for a TaskList: tasks, dependencies and schedules in one compressed snapshot"""
+    original_id = models.PositiveBigIntegerField(unique=True, help_text="id of the archived TaskList")
+    name = models.CharField(max_length=200)
+    task_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(help_text="When the original TaskList was created")
+    archived_at = models.DateTimeField(auto_now_add=True)
+    snapshot = models.BinaryField(help_text="zlib-compressed JSON snapshot")
+
+    def __str__(self):
+        return f"{self.name} (archived)"
+
+    def load_snapshot(self):
+        from .compression import decompress_json
+        return decompress_json(self.snapshot)
+
+
+class TaskSignature(models.Model):
+    """MinHash signature of a task's title and description (tasks.dedup)"""
+    task = models.OneToOneField(Task, primary_key=True, related_name='signature', on_delete=models.CASCADE)
+    minhash = models.BinaryField(help_text="64 little-endian uint32 MinHash values")
+
+    def __str__(self):
+        return f"Signature of task {self.task_id}"
+
+
+class TaskBucket(models.Model):
+    """LSH band of a TaskSignature: tasks sharing a key are near-duplicate candidates"""
+    key = models.BigIntegerField()
+    task = models.ForeignKey(Task, related_name='+', on_delete=models.CASCADE)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['key', 'task'], name='task_bucket_key_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.key}: task {self.task_id}"
+
+
+
+class ProfilingRule(models.Model):
+    """Admin toggle: profile the next `remaining` requests whose path starts with path_prefix"""
+    path_prefix = models.CharField(max_length=200, default='/', help_text="e.g. /results/ or / for any request")
+    remaining = models.PositiveIntegerField(default=1, help_text="Matching requests still to profile")
+    enabled = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Profile {self.remaining} request(s) under {self.path_prefix}"
+
+
+class ProfileArtifact(models.Model):
+    """One profiled request: cProfile dump on disk plus a text report"""
+    path = models.CharField(max_length=500)
+    method = models.CharField(max_length=10)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    duration_ms = models.FloatField()
+    trigger = models.CharField(max_length=20, help_text="header or rule")
+    profile_file = models.CharField(max_length=500, help_text="pstats dump (open with pstats or snakeviz)")
+    report = models.TextField(help_text="Top functions and allocation diff")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
@@ -0,0 +1,153 @@
+"""
+On-demand request profiling.
+
+Off unless a request carries a valid signed X-MindTimer-Profile header (mint
+one with `manage.py profiling_token`) or matches an enabled ProfilingRule in
+the admin. A profiled request runs under cProfile with tracemalloc
+snapshots taken before and after, so the report covers the view, the
+templates and any ClaudeTaskGroomer calls it makes. The pstats dump is
+written to PROFILING_DIR and listed as a ProfileArtifact in the admin.
+"""
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import ProfileArtifact, ProfilingRule
+
+HEADER = 'X-MindTimer-Profile'
+SALT = 'mindtimer.profiling'
+RULES_CACHE_KEY = 'profiling:rules'
+RULES_CACHE_TIMEOUT = 30
+
+# Only one cProfile profiler can be active at a time
+_profiler_lock = threading.Lock()
+
+
+def make_token():
+    return signing.TimestampSigner(salt=SALT).sign('profile')
+
+
+def valid_token(token):
+    try:
+        signing.TimestampSigner(salt=SALT).unsign(token, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def active_rules():
+    """(pk, path_prefix) of enabled rules, cached briefly so most requests cost no query"""
+    rules = cache.get(RULES_CACHE_KEY)
+    if rules is None:
+        rules = list(
+            ProfilingRule.objects.filter(enabled=True, remaining__gt=0).values_list('pk', 'path_prefix')
+        )
+        cache.set(RULES_CACHE_KEY, rules, RULES_CACHE_TIMEOUT)
+    return rules
+
+
+def clear_rules_cache(**kwargs):
+    cache.delete(RULES_CACHE_KEY)
+
+
+def claim_rule(path):
+    """Use up one request from the first matching rule; True if one was claimed"""
+    for pk, prefix in active_rules():
+        if path.startswith(prefix):
+            claimed = ProfilingRule.objects.filter(pk=pk, remaining__gt=0).update(remaining=F('remaining') - 1)
+            clear_rules_cache()
+            if claimed:
+                return True
+    return False
+
+
+def build_report(request, stats, allocations, duration_ms, status_code):
+    out = io.StringIO()
+    out.write(f"{request.method} {request.get_full_path()} -> {status_code} in {duration_ms:.1f} ms\n\n")
+    stats.stream = out
+    out.write("Top functions by cumulative time\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(settings.PROFILING_TOP_N)
+    out.write(f"Top {settings.PROFILING_TOP_N} allocation changes\n")
+    for stat in allocations[:settings.PROFILING_TOP_N]:
+        out.write(f"  {stat}\n")
+    return out.getvalue()
+
+
+def profile_request(get_response, request, trigger):
+    """Run one request under cProfile and tracemalloc and save a ProfileArtifact"""
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(10)
+    before = tracemalloc.take_snapshot()
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        response = profiler.runcall(get_response, request)
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        after = tracemalloc.take_snapshot()
+        if started_tracing:
+            tracemalloc.stop()
+
+    allocations = after.compare_to(before, 'lineno')
+    stats = pstats.Stats(profiler)
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    profile_file = os.path.join(settings.PROFILING_DIR, f"{uuid.uuid4().hex}.prof")
+    stats.dump_stats(profile_file)
+    artifact = ProfileArtifact.objects.create(
+        path=request.path[:500],
+        method=request.method,
+        status_code=response.status_code,
+        duration_ms=duration_ms,
+        trigger=trigger,
+        profile_file=profile_file,
+        report=build_report(request, stats, allocations, duration_ms, response.status_code),
+    )
+    response['X-Profile-Id'] = str(artifact.pk)
+    return response
+
+
+class ProfilingMiddleware:
+    """
+    Profile single requests on demand (see module docstring). Async requests
+    such as the live timeline stream pass through unprofiled.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.get_response(request)
+
+        trigger = self.trigger(request)
+        if trigger and _profiler_lock.acquire(blocking=False):
+            try:
+                return profile_request(self.get_response, request, trigger)
+            finally:
+                _profiler_lock.release()
+        return self.get_response(request)
+
+    def trigger(self, request):
+        token = request.headers.get(HEADER)
+        if token and valid_token(token):
+            return 'header'
+        if claim_rule(request.path):
+            return 'rule'
+        return None
@@ -0,0 +1,358 @@
+"""
+Shortest schedules for a task list's dependency DAG on k parallel lanes.
+
+A plan puts a list's incomplete tasks on k lanes (hands free at once) so
+every task starts after its dependencies finish, and the list is done as
+early as possible. That is P|prec|Cmax, which is NP-hard, so optimize() is an
+anytime branch and bound. It keeps the best plan found so far and returns it
+when the time budget runs out:
+
+- The first plan is a critical-path list schedule. It is usually within a
+  few percent of optimal, and the search then improves on it.
+- Tasks are placed one at a time, in (start, topological index) order, on a
+  lane at the earliest time that lane and the task's dependencies allow.
+  Every left-justified schedule, so at least one optimal schedule, is
+  reachable, and each exactly once.
+- Lower bounds: from each unplaced task's earliest start, the longest chain of
+  dependents still to run; and the remaining work spread evenly over the
+  lanes. A branch is cut when its bound reaches the best plan's makespan.
+- Symmetry: lanes free at the same time are interchangeable, so only one of
+  them is tried. Of the lanes free before a task can start, only the last to
+  free up is tried, which leaves the others for later tasks. Interchangeable
+  tasks (same duration, same dependencies and dependents) are placed in
+  index order.
+
+Plan.optimal says whether the search finished, i.e. whether the plan is proven
+shortest. save_schedule() stores a plan as a Schedule with
+optimization_algorithm='dependency'. Its parallel_blocks hold one list of
+task_ids per lane, in start order.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from .caching import bump_task_list_version
+from .models import Schedule, Task, TaskDependency, TaskList
+
+# Deeper searches would hit the recursion limit; larger lists get the list schedule
+MAX_EXACT_TASKS = 400
+# Nodes between clock reads
+CHECK_EVERY = 256
+
+
+class Plan:
+    """start minute and lane per task (in the order given to optimize()), and how good the plan is"""
+
+    def __init__(self, starts, lanes, makespan, lower_bound, optimal, sequential, nodes=0, elapsed_ms=0.0):
+        self.starts = starts
+        self.lanes = lanes
+        self.makespan = makespan
+        self.lower_bound = lower_bound
+        self.sequential = sequential
+        self.optimal = optimal
+        self.nodes = nodes
+        self.elapsed_ms = elapsed_ms
+
+    def __repr__(self):
+        return f"<Plan makespan={self.makespan} lower_bound={self.lower_bound} optimal={self.optimal}>"
+
+    def lane_orders(self):
+        """Task indexes per lane, in start order; empty lanes are left out"""
+        lanes = {}
+        for index in sorted(range(len(self.starts)), key=lambda index: (self.starts[index], index)):
+            lanes.setdefault(self.lanes[index], []).append(index)
+        return [lanes[lane] for lane in sorted(lanes)]
+
+
+class CycleError(ValueError):
+    """The dependencies given to topological_order() are not a DAG"""
+
+
+def topological_order(dependencies):
+    """Task indexes with every task after its dependencies (lowest index first among ready ones)"""
+    waiting = [len(set(deps)) for deps in dependencies]
+    dependents = [[] for _ in dependencies]
+    for index, deps in enumerate(dependencies):
+        for dep in set(deps):
+            dependents[dep].append(index)
+    ready = [index for index, count in enumerate(waiting) if count == 0]
+    order = []
+    while ready:
+        ready.sort(reverse=True)
+        index = ready.pop()
+        order.append(index)
+        for dependent in dependents[index]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                ready.append(dependent)
+    if len(order) != len(dependencies):
+        raise CycleError("Task dependencies contain a cycle")
+    return order
+
+
+def sequential_makespan(durations):
+    """One task after another, as the task list page shows them"""
+    return sum(durations)
+
+
+def list_schedule(durations, dependencies, lanes, priority=None):
+    """
+    Greedy plan: repeatedly start the ready task that can start earliest
+    (ties go to the lowest priority value, by default the index), on the lane
+    that freed up last before it starts. Returns (starts, lanes).
+    """
+    count = len(durations)
+    priority = priority or list(range(count))
+    waiting = [len(set(deps)) for deps in dependencies]
+    dependents = [[] for _ in range(count)]
+    for index, deps in enumerate(dependencies):
+        for dep in set(deps):
+            dependents[dep].append(index)
+    release = [0] * count
+    free = [0] * lanes
+    starts, assigned = [0] * count, [0] * count
+    ready = {index for index in range(count) if waiting[index] == 0}
+    while ready:
+        earliest = min(free)
+        task = min(ready, key=lambda index: (max(earliest, release[index]), priority[index]))
+        ready.remove(task)
+        start = max(earliest, release[task])
+        lane = max((lane for lane in range(lanes) if free[lane] <= start), key=lambda lane: free[lane])
+        starts[task], assigned[task] = start, lane
+        free[lane] = starts[task] + durations[task]
+        for dependent in dependents[task]:
+            release[dependent] = max(release[dependent], free[lane])
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                ready.add(dependent)
+    return starts, assigned
+
+
+def critical_path_tails(durations, dependencies, order):
+    """Per task: its duration plus the longest chain of dependents after it"""
+    tails = list(durations)
+    dependents = [[] for _ in durations]
+    for index, deps in enumerate(dependencies):
+        for dep in set(deps):
+            dependents[dep].append(index)
+    for index in reversed(order):
+        tails[index] = durations[index] + max((tails[dependent] for dependent in dependents[index]), default=0)
+    return tails
+
+
+def makespan_of(starts, durations):
+    return max((start + duration for start, duration in zip(starts, durations)), default=0)
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+class BranchAndBound:
+    """
+    The search, over tasks renumbered in topological order, so a dependency
+    always has a lower index than its dependents.
+    """
+
+    def __init__(self, durations, dependencies, lanes, deadline):
+        count = len(durations)
+        self.count, self.k, self.deadline = count, lanes, deadline
+        self.durations = durations
+        self.dependencies = [sorted(set(deps)) for deps in dependencies]
+        self.dependents = [[] for _ in range(count)]
+        for index, deps in enumerate(self.dependencies):
+            for dep in deps:
+                self.dependents[dep].append(index)
+        self.tails = critical_path_tails(durations, self.dependencies, range(count))
+        # Every start and finish is a sum of durations, so a multiple of their gcd
+        self.step = math.gcd(*durations) or 1
+
+        # Each task's nearest interchangeable predecessor in index order, if any
+        self.twin = [None] * count
+        seen = {}
+        for index in range(count):
+            key = (durations[index], tuple(self.dependencies[index]), tuple(self.dependents[index]))
+            self.twin[index] = seen.get(key)
+            seen[key] = index
+
+        self.finish = [None] * count
+        self.starts = [0] * count
+        self.assigned = [0] * count
+        self.free = [0] * lanes
+        self.waiting = [len(deps) for deps in self.dependencies]
+        self.ready = {index for index in range(count) if self.waiting[index] == 0}
+        self.placed = 0
+        self.remaining = sum(durations)
+        self.estimates = [0] * count
+        self.nodes = 0
+        self.best = None
+        self.best_makespan = None
+
+    def offer(self, starts, assigned):
+        makespan = makespan_of(starts, self.durations)
+        if self.best_makespan is None or makespan < self.best_makespan:
+            self.best, self.best_makespan = (list(starts), list(assigned)), makespan
+
+    def bound(self, floor):
+        """Lower bound on the makespan of any completion; no unplaced task starts before floor"""
+        durations, finish, estimates, tails = self.durations, self.finish, self.estimates, self.tails
+        bound = max(self.free)
+        low = max(floor, min(self.free))
+        for index in range(self.count):
+            if finish[index] is not None:
+                continue
+            earliest = low
+            for dep in self.dependencies[index]:
+                done = finish[dep] if finish[dep] is not None else estimates[dep] + durations[dep]
+                if done > earliest:
+                    earliest = done
+            estimates[index] = earliest
+            if earliest + tails[index] > bound:
+                bound = earliest + tails[index]
+        load = sum(max(free, floor) for free in self.free) + self.remaining
+        return max(bound, -(-load // (self.k * self.step)) * self.step)
+
+    def children(self, floor, after):
+        """(start, -tail, task, lane free time) for every placement allowed after (floor, after)"""
+        frees = sorted(set(self.free))
+        found = []
+        for task in self.ready:
+            twin = self.twin[task]
+            if twin is not None and self.finish[twin] is None:
+                continue
+            release = max((self.finish[dep] for dep in self.dependencies[task]), default=0)
+            fitting = [free for free in frees if free <= release]
+            options = fitting[-1:] + [free for free in frees if free > release]
+            for free in options:
+                start = max(free, release)
+                if start > floor or (start == floor and task > after):
+                    found.append((start, -self.tails[task], task, free))
+        found.sort()
+        return found
+
+    def search(self, floor=0, after=-1):
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and time.perf_counter() > self.deadline:
+            raise BudgetExceeded
+        if self.placed == self.count:
+            self.offer(self.starts, self.assigned)
+            return
+        if self.bound(floor) >= self.best_makespan:
+            return
+        for start, _, task, free in self.children(floor, after):
+            if start + self.tails[task] >= self.best_makespan:
+                continue
+            lane = self.free.index(free)
+            self.place(task, lane, start)
+            try:
+                self.search(start, task)
+            finally:
+                self.unplace(task, lane, free)
+
+    def place(self, task, lane, start):
+        end = start + self.durations[task]
+        self.starts[task], self.assigned[task], self.finish[task] = start, lane, end
+        self.free[lane] = end
+        self.ready.remove(task)
+        self.placed += 1
+        self.remaining -= self.durations[task]
+        for dependent in self.dependents[task]:
+            self.waiting[dependent] -= 1
+            if self.waiting[dependent] == 0:
+                self.ready.add(dependent)
+
+    def unplace(self, task, lane, free):
+        for dependent in self.dependents[task]:
+            if self.waiting[dependent] == 0:
+                self.ready.discard(dependent)
+            self.waiting[dependent] += 1
+        self.remaining += self.durations[task]
+        self.placed -= 1
+        self.ready.add(task)
+        self.free[lane] = free
+        self.finish[task] = None
+
+
+def optimize(durations, dependencies, lanes=None, budget_ms=None):
+    """
+    Best plan found within budget_ms for tasks with durations (minutes) and
+    dependencies (per task, the indexes of the tasks it waits for) on lanes
+    parallel lanes. Defaults come from SCHEDULE_LANES and SCHEDULE_BUDGET_MS.
+    """
+    started = time.perf_counter()
+    lanes = max(1, lanes or settings.SCHEDULE_LANES)
+    budget_ms = settings.SCHEDULE_BUDGET_MS if budget_ms is None else budget_ms
+    order = topological_order(dependencies)
+    position = {index: new for new, index in enumerate(order)}
+    topo_durations = [max(0, durations[index]) for index in order]
+    topo_dependencies = [[position[dep] for dep in dependencies[index]] for index in order]
+
+    search = BranchAndBound(topo_durations, topo_dependencies, lanes, started + budget_ms / 1000)
+    search.offer(*list_schedule(topo_durations, topo_dependencies, lanes, [-tail for tail in search.tails]))
+    lower_bound = search.bound(0)
+    optimal = search.best_makespan <= lower_bound
+    if not optimal and search.count <= MAX_EXACT_TASKS:
+        try:
+            search.search()
+            optimal = True
+        except BudgetExceeded:
+            pass
+
+    starts, assigned = search.best
+    return Plan(
+        starts=[starts[position[index]] for index in range(len(order))],
+        lanes=[assigned[position[index]] for index in range(len(order))],
+        makespan=search.best_makespan,
+        lower_bound=search.best_makespan if optimal else lower_bound,
+        optimal=optimal,
+        sequential=sequential_makespan(topo_durations),
+        nodes=search.nodes,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+def plan_task_list(task_list, lanes=None, budget_ms=None):
+    """(incomplete tasks in schedule order, Plan) for a TaskList; completed dependencies are already met"""
+    tasks = list(
+        task_list.tasks.filter(completed=False).order_by(F('schedule_order').asc(nulls_last=True), 'id')
+    )
+    index = {task.pk: position for position, task in enumerate(tasks)}
+    dependencies = [[] for _ in tasks]
+    edges = TaskDependency.objects.filter(from_task_id__in=index).values_list('from_task_id', 'to_task_id')
+    for from_id, to_id in edges:
+        if to_id in index:
+            dependencies[index[from_id]].append(index[to_id])
+    plan = optimize([task.estimated_duration for task in tasks], dependencies, lanes, budget_ms)
+    return tasks, plan
+
+
+def save_schedule(task_list, lanes=None, budget_ms=None):
+    """
+    Plan a TaskList, store the plan as a 'dependency' Schedule and renumber the
+    incomplete tasks' schedule_order by planned start, after the completed
+    ones. Returns (Schedule, Plan).
+    """
+    tasks, plan = plan_task_list(task_list, lanes, budget_ms)
+    now = timezone.now()
+    with transaction.atomic():
+        done = task_list.tasks.filter(completed=True).aggregate(last=Max('schedule_order'))['last']
+        first = 0 if done is None else done + 1
+        by_start = sorted(range(len(tasks)), key=lambda index: (plan.starts[index], plan.lanes[index]))
+        for offset, index in enumerate(by_start):
+            tasks[index].schedule_order = first + offset
+            tasks[index].updated_at = now
+        Task.objects.bulk_update(tasks, ['schedule_order', 'updated_at'])
+        TaskList.objects.filter(pk=task_list.pk).update(updated_at=now)
+        schedule = Schedule.objects.create(
+            task_list=task_list,
+            optimization_algorithm='dependency',
+            total_estimated_duration=plan.makespan,
+            parallel_blocks=[[tasks[index].task_id for index in lane] for lane in plan.lane_orders()],
+        )
+    # bulk_update sends no signals, so invalidate cached pages here
+    bump_task_list_version(task_list.id)
+    return schedule, plan
@@ -0,0 +1,239 @@
+"""
+Full-text search over task titles/descriptions and task list names/raw input.
+
+SQLite: two FTS5 tables, tasks_task_fts and tasks_tasklist_fts. They are
+external-content indexes: they store only the inverted index and read text
+from tasks_task and tasks_tasklist by rowid. Triggers on those tables keep
+them in sync, including after QuerySet.update(), bulk_update() and raw SQL,
+which signals would miss. Ranking is bm25 with titles/names weighted above
+descriptions/raw input.
+
+PostgreSQL: GIN expression indexes on to_tsvector('english', ...), ranked
+by ts_rank_cd and highlighted by ts_headline.
+
+A search is two queries. The first ranks every match and takes one page by
+keyset on (rank, kind, id). The second highlights only the rows on that
+page. The cost is proportional to the number of matching rows, not to the
+table size.
+"""
+import re
+from html import escape
+
+from django.db import connections
+
+from .models import Task
+
+KINDS = ('task', 'task_list')
+# bm25 column weights: title/name count this much more than the text under it
+TITLE_WEIGHT = 10.0
+SNIPPET_TOKENS = 16
+# Highlight markers; the text is HTML-escaped around them, then they become <mark>
+START, STOP = '\x02', '\x03'
+MAX_TERMS = 16
+
+TERM_RE = re.compile(r'\w+')
+
+SQLITE_TABLES = {
+    'tasks_task_fts': ('tasks_task', 'title', 'description'),
+    'tasks_tasklist_fts': ('tasks_tasklist', 'name', 'raw_input'),
+}
+POSTGRES_INDEXES = {
+    'tasks_task_search_idx': ('tasks_task', 'title', 'description'),
+    'tasks_tasklist_search_idx': ('tasks_tasklist', 'name', 'raw_input'),
+}
+
+
+def sqlite_triggers(fts, table, title, body):
+    delete = f"INSERT INTO {fts}({fts}, rowid, {title}, {body}) VALUES ('delete', old.id, old.{title}, old.{body});"
+    insert = f"INSERT INTO {fts}(rowid, {title}, {body}) VALUES (new.id, new.{title}, new.{body});"
+    return {
+        f'{fts}_ai': f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f'{fts}_ad': f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+        f'{fts}_au': (
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {title}, {body} ON {table} "
+            f"WHEN old.{title} IS NOT new.{title} OR old.{body} IS NOT new.{body} BEGIN {delete} {insert} END"
+        ),
+    }
+
+
+def install(connection):
+    """
+    Create the search index for connection's backend, or repair it: SQLite
+    drops a table's triggers when a migration rebuilds the table, so this also
+    runs after every migrate and re-creates them, re-indexing if any were gone.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+            existing = {row[0] for row in cursor.fetchall()}
+            for fts, (table, title, body) in SQLITE_TABLES.items():
+                if table not in existing:
+                    continue
+                triggers = sqlite_triggers(fts, table, title, body)
+                if fts in existing and existing.issuperset(triggers):
+                    continue
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({title}, {body}, "
+                    f"content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+                )
+                for sql in triggers.values():
+                    cursor.execute(sql)
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        elif connection.vendor == 'postgresql':
+            for index, (table, title, body) in POSTGRES_INDEXES.items():
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index} ON {table} "
+                    f"USING GIN (to_tsvector('english', {title} || ' ' || {body}))"
+                )
+
+
+def uninstall(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for fts, (table, title, body) in SQLITE_TABLES.items():
+                for trigger in sqlite_triggers(fts, table, title, body):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                cursor.execute(f"DROP TABLE IF EXISTS {fts}")
+        elif connection.vendor == 'postgresql':
+            for index in POSTGRES_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+def install_after_migrate(sender, using, **kwargs):
+    """post_migrate handler"""
+    install(connections[using])
+
+
+def parse_terms(query):
+    """Words of a user's query; the last one is matched as a prefix, so results follow typing"""
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def sqlite_match(terms):
+    # Quoted, so FTS5 operators and column filters in user input are plain words
+    return ' '.join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*'
+
+
+def postgres_tsquery(terms):
+    return ' & '.join(f"'{term}'" for term in terms[:-1]) + (' & ' if len(terms) > 1 else '') + f"'{terms[-1]}':*"
+
+
+def render(text):
+    """Highlighted text from the database, HTML-escaped, with <mark> around the matches"""
+    return escape(text or '').replace(START, '<mark>').replace(STOP, '</mark>')
+
+
+def search(query, after=None, limit=20, kinds=KINDS, using='default'):
+    """
+    One page of matches for query, best first: a list of dicts with kind
+    ('task' or 'task_list'), id, rank (lower is better) and highlighted
+    title/snippet HTML, plus task_list_id, task_id and completed for tasks.
+    after is the (rank, kind, id) of the last result of the previous page.
+    """
+    terms = parse_terms(query)
+    if not terms or not kinds:
+        return []
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        backend = SqliteSearch(terms)
+    elif connection.vendor == 'postgresql':
+        backend = PostgresSearch(terms)
+    else:
+        raise NotImplementedError(f"Full-text search needs SQLite or PostgreSQL, not {connection.vendor}")
+
+    with connection.cursor() as cursor:
+        cursor.execute(*backend.page(kinds, after, limit))
+        page = [{'kind': kind, 'id': pk, 'rank': rank} for kind, pk, rank in cursor.fetchall()]
+        for kind in kinds:
+            ids = [hit['id'] for hit in page if hit['kind'] == kind]
+            if ids:
+                cursor.execute(*backend.highlights(kind, ids))
+                highlighted = {pk: (title, snippet) for pk, title, snippet in cursor.fetchall()}
+                for hit in page:
+                    if hit['kind'] == kind:
+                        title, snippet = highlighted[hit['id']]
+                        hit['title'], hit['snippet'] = render(title), render(snippet)
+
+    tasks = {
+        row['id']: row for row in Task.objects.using(using)
+        .filter(pk__in=[hit['id'] for hit in page if hit['kind'] == 'task'])
+        .values('id', 'task_list_id', 'task_id', 'completed')
+    }
+    for hit in page:
+        if hit['kind'] == 'task':
+            row = tasks[hit['id']]
+            hit.update(task_list_id=row['task_list_id'], task_id=row['task_id'], completed=row['completed'])
+        else:
+            hit['task_list_id'] = hit['id']
+    return page
+
+
+def keyset(after):
+    """SQL (and params) for rows after the (rank, kind, id) cursor, or none"""
+    if after is None:
+        return '', []
+    rank, kind, pk = after
+    return 'WHERE rank > %s OR (rank = %s AND (kind > %s OR (kind = %s AND id > %s)))', [rank, rank, kind, kind, pk]
+
+
+class SqliteSearch:
+    FTS = {'task': 'tasks_task_fts', 'task_list': 'tasks_tasklist_fts'}
+
+    def __init__(self, terms):
+        self.match = sqlite_match(terms)
+
+    def page(self, kinds, after, limit):
+        selects, params = [], []
+        for kind in kinds:
+            fts = self.FTS[kind]
+            selects.append(
+                f"SELECT '{kind}' AS kind, rowid AS id, bm25({fts}, {TITLE_WEIGHT}, 1.0) AS rank "
+                f"FROM {fts} WHERE {fts} MATCH %s"
+            )
+            params.append(self.match)
+        where, where_params = keyset(after)
+        sql = f"SELECT kind, id, rank FROM ({' UNION ALL '.join(selects)}) {where} ORDER BY rank, kind, id LIMIT %s"
+        return sql, [*params, *where_params, limit]
+
+    def highlights(self, kind, ids):
+        fts = self.FTS[kind]
+        sql = (
+            f"SELECT rowid, highlight({fts}, 0, %s, %s), snippet({fts}, 1, %s, %s, '…', {SNIPPET_TOKENS}) "
+            f"FROM {fts} WHERE {fts} MATCH %s AND rowid IN ({', '.join(['%s'] * len(ids))})"
+        )
+        return sql, [START, STOP, START, STOP, self.match, *ids]
+
+
+class PostgresSearch:
+    COLUMNS = {'task': ('tasks_task', 'title', 'description'), 'task_list': ('tasks_tasklist', 'name', 'raw_input')}
+    # Weights for ts_rank_cd's {D, C, B, A} labels; titles are labelled A
+    WEIGHTS = '{0.1, 0.2, 0.1, 1.0}'
+
+    def __init__(self, terms):
+        self.tsquery = postgres_tsquery(terms)
+
+    def page(self, kinds, after, limit):
+        selects, params = [], []
+        for kind in kinds:
+            table, title, body = self.COLUMNS[kind]
+            # The WHERE expression matches the GIN index; the weighted vector is only built for matches
+            selects.append(
+                f"SELECT '{kind}'::text AS kind, id, (-ts_rank_cd('{self.WEIGHTS}', "
+                f"setweight(to_tsvector('english', {title}), 'A') || to_tsvector('english', {body}), "
+                f"to_tsquery('english', %s)))::double precision AS rank FROM {table} "
+                f"WHERE to_tsvector('english', {title} || ' ' || {body}) @@ to_tsquery('english', %s)"
+            )
+            params += [self.tsquery, self.tsquery]
+        where, where_params = keyset(after)
+        sql = f"SELECT kind, id, rank FROM ({' UNION ALL '.join(selects)}) AS hits {where} ORDER BY rank, kind, id LIMIT %s"
+        return sql, [*params, *where_params, limit]
+
+    def highlights(self, kind, ids):
+        table, title, body = self.COLUMNS[kind]
+        options = f'StartSel={START}, StopSel={STOP}'
+        sql = (
+            f"SELECT id, ts_headline('english', {title}, q, %s), "
+            f"ts_headline('english', {body}, q, %s) FROM {table}, to_tsquery('english', %s) AS q "
+            f"WHERE id IN ({', '.join(['%s'] * len(ids))})"
+        )
+        return sql, [f'{options}, HighlightAll=true', f'{options}, MaxWords={SNIPPET_TOKENS}, MinWords=8', self.tsquery, *ids]
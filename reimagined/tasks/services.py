@@ -1,7 +1,16 @@
 import json
-import requests
+import time
 from django.conf import settings
+from . import cassettes
+from .dedup import merge_duplicates, tracked_minutes
+from .estimator import get_estimator
+from .lazy import lazy_import
+from .metrics import GROOM_ERRORS, GROOM_SECONDS, record_groom_tokens
 from .models import TaskList, Task
+from .tracing import CLIENT, mark_error, span, traced
+
+# Loaded on the first API call; most processes never groom
+requests = lazy_import('requests')
 
 
 class ClaudeTaskGroomer:
@@ -25,6 +34,7 @@ class ClaudeTaskGroomer:
             'anthropic-version': '2023-06-01'
         }
 
+    @traced('ClaudeTaskGroomer.groom_tasks')
     def groom_tasks(self, todo_text: str, context: str = ""):
         """
         Uses Claude Sonnet to groom and enhance a todo text statement from a user.
@@ -66,37 +76,33 @@ Format your response as a JSON.
             ]
         }
         
+        start = time.perf_counter()
         try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload)
-            response.raise_for_status()
+            with span('POST /v1/messages', CLIENT, {
+                'server.address': 'api.anthropic.com',
+                'gen_ai.system': 'anthropic',
+                'gen_ai.request.model': payload['model'],
+            }) as api_span:
+                response = cassettes.post(
+                    self.api_url, headers=self.headers, json=payload,
+                    inputs={'todo_text': todo_text, 'context': context},
+                )
+                if api_span is not None:
+                    api_span.set_attribute('http.response.status_code', response.status_code)
+                response.raise_for_status()
+                result = response.json()
+                usage = result.get('usage')
+                if api_span is not None and isinstance(usage, dict):
+                    api_span.set_attribute('gen_ai.usage.input_tokens', usage.get('input_tokens', 0))
+                    api_span.set_attribute('gen_ai.usage.output_tokens', usage.get('output_tokens', 0))
             
-            result = response.json()
+            record_groom_tokens(usage)
             groomed_content = result['content'][0]['text']
-            
-            # Parse the JSON response
-            try:
-                parsed_response = json.loads(groomed_content)
-                return {
-                    "success": True,
-                    "analysis": parsed_response.get("analysis", ""),
-                    "tasks": parsed_response.get("tasks", [])
-                }
-            except json.JSONDecodeError:
-                # If JSON parsing fails, try to extract JSON from the response
-                start_idx = groomed_content.find('{')
-                end_idx = groomed_content.rfind('}')
-                if start_idx != -1 and end_idx != -1:
-                    json_str = groomed_content[start_idx:end_idx + 1]
-                    parsed_response = json.loads(json_str)
-                    return {
-                        "success": True,
-                        "analysis": parsed_response.get("analysis", ""),
-                        "tasks": parsed_response.get("tasks", [])
-                    }
-                else:
-                    raise ValueError("Could not extract valid JSON from Claude response")
+            return self._parse_groomed_content(groomed_content)
             
         except requests.exceptions.RequestException as e:
+            GROOM_ERRORS.inc(reason='request')
+            mark_error(f"API request failed: {e}")
             return {
                 "success": False,
                 "error": f"API request failed: {str(e)}",
@@ -104,12 +110,34 @@ Format your response as a JSON.
                 "tasks": []
             }
         except Exception as e:
+            GROOM_ERRORS.inc(reason='response')
+            mark_error(f"Unexpected error: {e}")
             return {
                 "success": False,
                 "error": f"Unexpected error: {str(e)}",
                 "analysis": "",
                 "tasks": []
             }
+        finally:
+            GROOM_SECONDS.observe(time.perf_counter() - start)
+
+    @traced('ClaudeTaskGroomer.parse')
+    def _parse_groomed_content(self, groomed_content: str) -> dict:
+        """Parse Claude's reply into a groom_tasks() result; raises ValueError if it holds no JSON"""
+        try:
+            parsed_response = json.loads(groomed_content)
+        except json.JSONDecodeError:
+            # If JSON parsing fails, try to extract JSON from the response
+            start_idx = groomed_content.find('{')
+            end_idx = groomed_content.rfind('}')
+            if start_idx == -1 or end_idx == -1:
+                raise ValueError("Could not extract valid JSON from Claude response")
+            parsed_response = json.loads(groomed_content[start_idx:end_idx + 1])
+        return {
+            "success": True,
+            "analysis": parsed_response.get("analysis", ""),
+            "tasks": parsed_response.get("tasks", [])
+        }
 
     def parse_time_estimate(self, time_str: str) -> int:
         """Convert time estimate from 'hh:mm' format to minutes"""
@@ -126,39 +154,59 @@ Format your response as a JSON.
             # Default to 30 minutes if parsing fails
             return 30
 
+    @traced('ClaudeTaskGroomer.create_task_list_from_groomed_tasks')
     def create_task_list_from_groomed_tasks(self, name: str, raw_input: str, groomed_result: dict):
         task_list = TaskList.objects.create(
             name=name,
-            raw_input=raw_input
+            raw_input=raw_input,
+            analysis=groomed_result.get("analysis", "")
         )
         
         if not groomed_result.get("success"):
             raise ValueError(f"Claude API error: {groomed_result.get('error', 'Unknown error')}")
         
-        tasks_data = groomed_result.get("tasks", [])
+        # Claude sometimes lists the same task twice; keep the first and merge the rest into it
+        tasks_data, merged = merge_duplicates(groomed_result.get("tasks", []))
+        dependencies = {}
+        for task_data in groomed_result.get("tasks", []):
+            task_id = task_data.get("task_id", "00000000")
+            dependencies.setdefault(merged.get(task_id, task_id), set()).update(
+                merged.get(dep_id, dep_id) for dep_id in task_data.get("dependencies") or ()
+            )
+        titles = [task_data.get("task", "Untitled Task") for task_data in tasks_data]
+        # Near-duplicates of tasks already done and tracked say how long this one really takes
+        tracked = tracked_minutes(titles)
+        # Otherwise calibrate Claude's estimates against tracked actuals once a model is trained
+        estimator = get_estimator()
         
         # Create tasks first
         created_tasks = {}
-        for task_data in tasks_data:
+        for index, task_data in enumerate(tasks_data):
+            title = titles[index]
+            priority = task_data.get("priority", "medium")
             duration = self.parse_time_estimate(task_data.get("time_estimate", "00:30"))
+            if index in tracked:
+                estimated_duration = tracked[index]
+            elif estimator:
+                estimated_duration = estimator.predict(title, priority, duration)
+            else:
+                estimated_duration = duration
             task = Task.objects.create(
-                title=task_data.get("task", "Untitled Task"),
-                description=task_data.get("task", "Untitled Task"),
+                title=title,
+                description=title,
                 task_id=task_data.get("task_id", "00000000"),
-                priority=task_data.get("priority", "medium"),
-                estimated_duration=duration,
+                priority=priority,
+                estimated_duration=estimated_duration,
+                original_estimate=duration,
                 task_list=task_list
             )
             created_tasks[task_data.get("task_id", "00000000")] = task
         
         # Set up dependencies after all tasks are created
-        for task_data in tasks_data:
-            task_id = task_data.get("task_id", "00000000")
-            if task_id in created_tasks and task_data.get("dependencies"):
-                task = created_tasks[task_id]
-                for dep_id in task_data["dependencies"]:
-                    if dep_id in created_tasks:
-                        task.dependencies.add(created_tasks[dep_id])
+        for task_id, task in created_tasks.items():
+            for dep_id in dependencies.get(task_id, ()):
+                if dep_id in created_tasks and dep_id != task_id:
+                    task.dependencies.add(created_tasks[dep_id])
         
         return task_list, groomed_result.get("analysis", "")
 
@@ -0,0 +1,68 @@
+import os
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import bump_task_list_version
+from .models import ProfileArtifact, ProfilingRule, Task, TaskDependency, TaskList
+from .profiling import clear_rules_cache
+
+
+@receiver(post_save, sender=TaskList)
+@receiver(post_delete, sender=TaskList)
+def task_list_changed(sender, instance, **kwargs):
+    bump_task_list_version(instance.pk)
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, **kwargs):
+    bump_task_list_version(instance.task_list_id)
+
+
+@receiver(post_save, sender=Task)
+def index_task_text(sender, instance, created, update_fields, **kwargs):
+    from .dedup import index_task, index_tasks
+
+    if created:
+        index_tasks([instance])
+    elif update_fields is None or {'title', 'description'} & set(update_fields):
+        index_task(instance)
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    # A deleted task leaves no updated_at behind, so move Last-Modified forward on the list
+    if instance.task_list_id is not None:
+        TaskList.objects.filter(pk=instance.task_list_id).update(updated_at=timezone.now())
+    bump_task_list_version(instance.task_list_id)
+
+
+@receiver(m2m_changed, sender=TaskDependency)
+def task_dependencies_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    # Dependency edits don't save the Task, so touch updated_at to keep
+    # fragment cache keys honest
+    if reverse:
+        changed = Task.objects.filter(pk__in=pk_set or ())
+    else:
+        changed = Task.objects.filter(pk=instance.pk)
+    task_list_ids = set(changed.values_list('task_list_id', flat=True))
+    changed.update(updated_at=timezone.now())
+
+    for task_list_id in task_list_ids:
+        bump_task_list_version(task_list_id)
+
+
+post_save.connect(clear_rules_cache, sender=ProfilingRule, dispatch_uid='profiling_rules_saved')
+post_delete.connect(clear_rules_cache, sender=ProfilingRule, dispatch_uid='profiling_rules_deleted')
+
+
+@receiver(post_delete, sender=ProfileArtifact)
+def profile_artifact_deleted(sender, instance, **kwargs):
+    try:
+        os.remove(instance.profile_file)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,150 @@
+"""
+Synthetic task lists for load tests and benchmarks.
+
+Dependency graphs are generated acyclic by construction (a task only depends
+on tasks created before it) with at most MAX_DEPENDENCIES edges per task,
+like Task.add_dependency enforces. Everything is written with bulk_create.
+task_id is 4 hex characters and unique across the database, so at most
+65,536 tasks can exist in total.
+"""
+import random
+
+from django.db import transaction
+
+from .models import Task, TaskDependency, TaskList
+
+SHAPES = ('chain', 'layered', 'random', 'fanout')
+MAX_DEPENDENCIES = 4
+FANOUT = 4
+TASK_ID_SPACE = 16 ** 4
+NAME_PREFIX = 'Synthetic'
+# Starts the raw_input of every generated list; --clear deletes by it, not by name
+MARKER = '[seed_synthetic]'
+
+VERBS = (
+    'Draft', 'Review', 'Email', 'Call', 'Buy', 'Clean', 'Fix', 'Plan', 'Book', 'Update',
+    'Write', 'Schedule', 'Pay', 'Sort', 'Pack', 'Prepare', 'Research', 'Organize', 'Send', 'Read',
+)
+OBJECTS = (
+    'report', 'groceries', 'laundry', 'invoice', 'dentist appointment', 'presentation', 'budget',
+    'garage', 'tax forms', 'flight', 'résumé', 'kitchen', 'meeting notes', 'birthday gift',
+    'project proposal', 'bike', 'inbox', 'slides', 'rent', 'library books',
+)
+DURATIONS = (5, 10, 15, 20, 30, 45, 60, 90, 120)
+PRIORITIES = ('low', 'medium', 'medium', 'high')
+
+
+def dag_edges(count, shape='layered', density=0.3, rng=None):
+    """
+    (task, dependency) index pairs over range(count) with dependency < task.
+
+    chain: each task depends on the previous one.
+    layered: layers of about sqrt(count) tasks; each task depends on tasks of
+        the previous layer with probability density.
+    random: each task depends on about density * (tasks before it) earlier tasks.
+    fanout: a tree where every task unblocks FANOUT others.
+    """
+    rng = rng or random.Random()
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown DAG shape: {shape}")
+    edges = []
+    if shape == 'chain':
+        edges = [(i, i - 1) for i in range(1, count)]
+    elif shape == 'layered':
+        width = max(1, round(count ** 0.5))
+        for i in range(width, count):
+            layer_start = (i // width - 1) * width
+            previous = [j for j in range(layer_start, layer_start + width) if rng.random() < density]
+            edges.extend((i, j) for j in previous[:MAX_DEPENDENCIES])
+    elif shape == 'random':
+        for i in range(1, count):
+            expected = density * i
+            k = min(MAX_DEPENDENCIES, i, int(expected) + (rng.random() < expected % 1))
+            edges.extend((i, j) for j in rng.sample(range(i), k))
+    else:
+        edges = [(i, (i - 1) // FANOUT) for i in range(1, count)]
+    return edges
+
+
+def free_task_ids(count, rng=None):
+    """count unused task_ids, in random order"""
+    rng = rng or random.Random()
+    used = set(Task.objects.values_list('task_id', flat=True))
+    free = TASK_ID_SPACE - len(used)
+    if count > free:
+        raise ValueError(f"Only {free} task_ids are free; cannot create {count} tasks")
+    ids = []
+    while len(ids) < count:
+        task_id = f"{rng.randrange(TASK_ID_SPACE):04x}"
+        if task_id not in used:
+            used.add(task_id)
+            ids.append(task_id)
+    return ids
+
+
+def task_fields(index, rng):
+    """Field values for one synthetic task"""
+    return {
+        'title': f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}",
+        'priority': rng.choice(PRIORITIES),
+        'estimated_duration': rng.choice(DURATIONS),
+        'schedule_order': index,
+    }
+
+
+def seed_task_lists(lists=1, tasks_per_list=100, shape='layered', density=0.3, parallel_ratio=0.1, seed=None):
+    """Create synthetic TaskLists with bulk_create; returns the new TaskLists"""
+    rng = random.Random(seed)
+    task_ids = iter(free_task_ids(lists * tasks_per_list, rng))
+
+    with transaction.atomic():
+        task_lists = TaskList.objects.bulk_create([
+            TaskList(
+                name=f"{NAME_PREFIX} {shape} #{n + 1}",
+                raw_input=f"{MARKER} {tasks_per_list} synthetic tasks, {shape} dependencies",
+            )
+            for n in range(lists)
+        ])
+        for task_list in task_lists:
+            tasks = []
+            for index in range(tasks_per_list):
+                fields = task_fields(index, rng)
+                tasks.append(Task(
+                    task_list=task_list, task_id=next(task_ids), description=fields['title'],
+                    can_run_parallel=rng.random() < parallel_ratio, **fields
+                ))
+            tasks = Task.objects.bulk_create(tasks, batch_size=1000)
+            TaskDependency.objects.bulk_create(
+                [
+                    TaskDependency(from_task_id=tasks[i].pk, to_task_id=tasks[j].pk)
+                    for i, j in dag_edges(tasks_per_list, shape, density, rng)
+                ],
+                batch_size=1000,
+            )
+    return task_lists
+
+
+def synthetic_task_lists():
+    """TaskLists created by seed_task_lists()"""
+    return TaskList.objects.filter(raw_input__startswith=MARKER)
+
+
+def groomed_result(count, shape='layered', density=0.3, seed=None):
+    """A groom_tasks()-style result of count tasks with free task_ids"""
+    rng = random.Random(seed)
+    task_ids = free_task_ids(count, rng)
+    dependencies = {}
+    for i, j in dag_edges(count, shape, density, rng):
+        dependencies.setdefault(i, []).append(task_ids[j])
+    tasks = []
+    for index, task_id in enumerate(task_ids):
+        fields = task_fields(index, rng)
+        minutes = fields['estimated_duration']
+        tasks.append({
+            'task': fields['title'],
+            'task_id': task_id,
+            'time_estimate': f"{minutes // 60:02d}:{minutes % 60:02d}",
+            'dependencies': dependencies.get(index, []),
+            'priority': fields['priority'],
+        })
+    return {'success': True, 'analysis': f"{count} synthetic tasks.", 'tasks': tasks}
@@ -0,0 +1,164 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase
+from tasks.models import Schedule, Task, TaskList
+
+
+class ApiTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.task_list = TaskList.objects.create(name="API List", raw_input="Laundry", analysis="Laundry first.")
+        self.wash = Task.objects.create(
+            title="Wash", description="Wash clothes", task_id="b101",
+            estimated_duration=60, task_list=self.task_list
+        )
+        self.dry = Task.objects.create(
+            title="Dry", description="Dry clothes", task_id="b102",
+            estimated_duration=45, task_list=self.task_list
+        )
+        self.fold = Task.objects.create(
+            title="Fold", description="Fold clothes", task_id="b103",
+            estimated_duration=15, task_list=self.task_list
+        )
+        self.dry.dependencies.add(self.wash)
+        self.base = f'/api/v1/task-lists/{self.task_list.id}/'
+
+    def bulk(self, payload):
+        return self.client.post(self.base + 'tasks/bulk/', json.dumps(payload), content_type='application/json')
+
+
+class TestReadEndpoints(ApiTestCase):
+    def test_task_list_detail(self):
+        data = self.client.get(self.base).json()
+        self.assertEqual(data['name'], "API List")
+        self.assertEqual(data['analysis'], "Laundry first.")
+
+    def test_sparse_fieldsets(self):
+        data = self.client.get(self.base + 'tasks/?fields=task_id,completed').json()
+        self.assertEqual(data['results'][0], {'task_id': 'b101', 'completed': False})
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(self.base + 'tasks/?fields=task_id,secret')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', response.json()['error'])
+
+    def test_dependencies_are_included(self):
+        data = self.client.get(self.base + 'tasks/?fields=task_id,dependencies').json()
+        by_id = {row['task_id']: row['dependencies'] for row in data['results']}
+        self.assertEqual(by_id, {'b101': [], 'b102': ['b101'], 'b103': []})
+
+    def test_keyset_pagination(self):
+        first = self.client.get(self.base + 'tasks/?limit=2&fields=task_id').json()
+        self.assertEqual([row['task_id'] for row in first['results']], ['b101', 'b102'])
+        self.assertIsNotNone(first['next'])
+
+        second = self.client.get(first['next']).json()
+        self.assertEqual([row['task_id'] for row in second['results']], ['b103'])
+        self.assertIsNone(second['next'])
+
+    def test_task_lists_index(self):
+        data = self.client.get('/api/v1/task-lists/?fields=id,name').json()
+        self.assertEqual(data['results'], [{'id': self.task_list.id, 'name': "API List"}])
+
+    def test_schedules(self):
+        Schedule.objects.create(task_list=self.task_list, parallel_blocks=[['b101', 'b103']])
+        data = self.client.get(self.base + 'schedules/').json()
+        self.assertEqual(data['results'][0]['parallel_blocks'], [['b101', 'b103']])
+
+    def test_missing_task_list_returns_404(self):
+        response = self.client.get('/api/v1/task-lists/999/tasks/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_conditional_get(self):
+        etag = self.client.get(self.base + 'tasks/')['ETag']
+        response = self.client.get(self.base + 'tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+class TestBulkEndpoint(ApiTestCase):
+    def test_bulk_update_in_one_request(self):
+        response = self.bulk({
+            'complete': ['b101', 'b102'],
+            'durations': {'b103': 20},
+            'add_dependencies': {'b103': ['b102']},
+            'remove_dependencies': {'b102': ['b101']},
+        })
+        self.assertEqual(response.status_code, 200)
+
+        tasks = {task.task_id: task for task in Task.objects.filter(task_list=self.task_list)}
+        self.assertTrue(tasks['b101'].completed)
+        self.assertTrue(tasks['b102'].completed)
+        self.assertEqual(tasks['b103'].estimated_duration, 20)
+        self.assertEqual(tasks['b103'].get_dependency_ids(), ['b102'])
+        self.assertEqual(tasks['b102'].get_dependency_ids(), [])
+
+    def test_invalid_entry_rolls_back_everything(self):
+        response = self.bulk({'complete': ['b101'], 'durations': {'b103': -5}})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Task.objects.get(pk=self.wash.pk).completed)
+
+    def test_add_dependency_validation_applies(self):
+        for task in ['c201', 'c202', 'c203', 'c204', 'c205']:
+            Task.objects.create(title=task, description=task, task_id=task,
+                                estimated_duration=5, task_list=self.task_list)
+        response = self.bulk({'add_dependencies': {'b103': ['c201', 'c202', 'c203', 'c204', 'c205']}})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Maximum 4 dependencies', response.json()['error'])
+        self.assertEqual(Task.objects.get(pk=self.fold.pk).dependencies.count(), 0)
+
+    def test_malformed_task_ids_are_rejected(self):
+        for payload in ({'complete': [[1]]}, {'complete': 'b101'}, {'add_dependencies': {'b103': [{'id': 'b101'}]}}):
+            with self.subTest(payload=payload):
+                self.assertEqual(self.bulk(payload).status_code, 400)
+
+    def test_dependency_cycles_are_rejected(self):
+        for payload in ({'add_dependencies': {'b101': ['b102']}}, {'add_dependencies': {'b103': ['b103']}}):
+            with self.subTest(payload=payload):
+                self.assertEqual(self.bulk(payload).status_code, 400)
+        self.assertEqual(self.wash.get_dependency_ids(), [])
+        self.assertEqual(self.fold.get_dependency_ids(), [])
+        # Removing the edge that would close the cycle in the same request is fine
+        response = self.bulk({'add_dependencies': {'b101': ['b102']}, 'remove_dependencies': {'b102': ['b101']}})
+        self.assertEqual(response.status_code, 200)
+
+    def test_duration_is_bounded(self):
+        self.assertEqual(self.bulk({'durations': {'b101': 10 ** 12}}).status_code, 400)
+        self.assertEqual(Task.objects.get(pk=self.wash.pk).estimated_duration, 60)
+
+    def test_unknown_task_id_is_rejected(self):
+        response = self.bulk({'complete': ['ffff']})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ffff', response.json()['error'])
+
+    def test_bulk_invalidates_cached_pages(self):
+        url = f'/results/{self.task_list.id}/'
+        self.client.get(url)
+        self.bulk({'durations': {'b101': 99}})
+        self.assertContains(self.client.get(url), '99 min')
+
+    def test_bulk_requires_post(self):
+        self.assertEqual(self.client.get(self.base + 'tasks/bulk/').status_code, 405)
+
+
+class TestCompleteEndpoint(ApiTestCase):
+    def complete(self, task_ids):
+        return self.client.post(self.base + 'tasks/complete/', json.dumps({'tasks': task_ids}),
+                                content_type='application/json')
+
+    def test_complete_returns_unblocked_and_ready_tasks(self):
+        data = self.complete(['b101']).json()
+        self.assertEqual(data['completed'], ['b101'])
+        self.assertEqual([task['task_id'] for task in data['unblocked']], ['b102'])
+        self.assertEqual([task['task_id'] for task in data['ready']], ['b102', 'b103'])
+        self.assertEqual(data['ready'][0]['dependencies'], ['b101'])
+
+    def test_complete_rejects_unknown_tasks(self):
+        response = self.complete(['b101', 'ffff'])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Task.objects.get(pk=self.wash.pk).completed)
+        self.assertEqual(self.complete([['b101']]).status_code, 400)
+
+    def test_bulk_completion_reports_unblocked(self):
+        data = self.bulk({'complete': ['b101']}).json()
+        self.assertEqual(data['unblocked'], ['b102'])
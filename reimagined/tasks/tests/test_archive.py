@@ -0,0 +1,101 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from tasks.archive import archivable_task_lists, archive_task_list
+from tasks.models import Schedule, Task, TaskDependency, TaskList, TaskListArchive
+
+
+class TestArchiveTaskList(TestCase):
+    def setUp(self):
+        self.task_list = TaskList.objects.create(name="Done List", raw_input="Wash\nDry")
+        self.wash = Task.objects.create(
+            title="Wash", description="Wash clothes", task_id="a101",
+            estimated_duration=60, task_list=self.task_list, completed=True
+        )
+        self.dry = Task.objects.create(
+            title="Dry", description="Dry clothes", task_id="a102",
+            estimated_duration=45, task_list=self.task_list, completed=True
+        )
+        self.dry.dependencies.add(self.wash)
+        Schedule.objects.create(task_list=self.task_list, parallel_blocks=[["a101"]])
+
+    def test_completed_lists_are_archivable(self):
+        open_list = TaskList.objects.create(name="Open", raw_input="Todo")
+        Task.objects.create(title="Open", description="Open", estimated_duration=5, task_list=open_list)
+        TaskList.objects.create(name="Empty", raw_input="Nothing")
+
+        self.assertEqual(list(archivable_task_lists()), [self.task_list])
+
+    def test_old_lists_are_archivable(self):
+        stale = TaskList.objects.create(name="Stale", raw_input="Todo")
+        TaskList.objects.filter(pk=stale.pk).update(updated_at=timezone.now() - timedelta(days=90))
+
+        self.assertIn(stale, archivable_task_lists(older_than_days=30))
+        self.assertNotIn(stale, archivable_task_lists())
+
+    def test_archive_moves_rows_into_snapshot(self):
+        archive = archive_task_list(self.task_list, batch_size=1)
+
+        self.assertFalse(TaskList.objects.filter(pk=self.task_list.pk).exists())
+        self.assertFalse(Task.objects.filter(task_list_id=self.task_list.pk).exists())
+        self.assertFalse(TaskDependency.objects.exists())
+        self.assertFalse(Schedule.objects.exists())
+
+        snapshot = TaskListArchive.objects.get(pk=archive.pk).load_snapshot()
+        self.assertEqual(archive.task_count, 2)
+        self.assertEqual(snapshot['task_list']['name'], "Done List")
+        tasks = {task['task_id']: task for task in snapshot['tasks']}
+        self.assertEqual(tasks['a102']['dependencies'], ['a101'])
+        self.assertEqual(snapshot['schedules'][0]['parallel_blocks'], [["a101"]])
+
+    def test_cross_list_dependencies_are_recorded(self):
+        other = TaskList.objects.create(name="Other", raw_input="Iron\nSoap")
+        iron = Task.objects.create(title="Iron", description="Iron", task_id="a201", estimated_duration=10, task_list=other)
+        soap = Task.objects.create(
+            title="Soap", description="Soap", task_id="a202", estimated_duration=5, task_list=other, completed=True
+        )
+        iron.dependencies.add(self.dry)
+        self.wash.dependencies.add(soap)
+
+        archive_task_list(self.task_list)
+        tasks = {task['task_id']: task for task in TaskListArchive.objects.get().load_snapshot()['tasks']}
+        self.assertEqual(tasks['a101']['external_dependencies'], [{'task_list_id': other.id, 'task_id': 'a202'}])
+        self.assertEqual(tasks['a102']['external_dependents'], [{'task_list_id': other.id, 'task_id': 'a201'}])
+        self.assertEqual(tasks['a102']['dependencies'], ['a101'])
+        self.assertEqual(iron.get_dependency_ids(), [])
+
+    def test_snapshot_and_delete_share_a_transaction(self):
+        with mock.patch.object(Task.objects, 'filter', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                archive_task_list(self.task_list)
+        self.assertFalse(TaskListArchive.objects.exists())
+        self.assertEqual(Task.objects.filter(task_list=self.task_list).count(), 2)
+
+    def test_archive_resumes_partially_archived_list(self):
+        first = archive_task_list(self.task_list)
+        TaskList.objects.create(id=self.task_list.id, name="Done List", raw_input="Wash\nDry")
+
+        self.assertEqual(archive_task_list(self.task_list), first)
+        self.assertEqual(TaskListArchive.objects.count(), 1)
+
+    def test_archived_list_is_viewable(self):
+        task_list_id = self.task_list.id
+        archive_task_list(self.task_list)
+
+        response = self.client.get(f'/results/{task_list_id}/')
+        self.assertRedirects(response, f'/archive/{task_list_id}/')
+
+        response = self.client.get(f'/archive/{task_list_id}/')
+        self.assertContains(response, 'Done List')
+        self.assertContains(response, 'a101')
+        self.assertContains(response, 'read-only')
+
+    def test_management_command_archives_candidates(self):
+        out = StringIO()
+        call_command('archive_task_lists', stdout=out)
+        self.assertIn("Archived 1 task list(s)", out.getvalue())
+        self.assertTrue(TaskListArchive.objects.filter(original_id=self.task_list.id).exists())
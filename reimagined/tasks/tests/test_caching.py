@@ -0,0 +1,110 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from tasks.caching import bump_task_list_version, check_shared_cache, task_list_version
+from tasks.models import Task, TaskList
+
+
+class TestTaskListPageCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.task_list = TaskList.objects.create(name="Cached List", raw_input="Laundry")
+        self.laundry = Task.objects.create(
+            title="Do laundry", description="Wash and dry clothes", task_id="c101",
+            estimated_duration=120, task_list=self.task_list
+        )
+        self.groceries = Task.objects.create(
+            title="Buy groceries", description="Food for the week", task_id="c102",
+            estimated_duration=45, task_list=self.task_list
+        )
+        self.urls = [
+            f'/results/{self.task_list.id}/',
+            f'/personal-assistance/executive-function/todo-timeline/dependencies/{self.task_list.id}/',
+            f'/personal-assistance/executive-function/todo-timeline/execute/{self.task_list.id}/',
+        ]
+
+    def test_repeat_views_skip_the_orm(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                with self.assertNumQueries(0):
+                    second = self.client.get(url)
+                self.assertEqual(first.content, second.content)
+
+    def test_task_change_invalidates_pages(self):
+        for url in self.urls:
+            self.client.get(url)
+
+        self.laundry.title = "Fold laundry"
+        self.laundry.save()
+
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertContains(self.client.get(url), "Fold laundry")
+
+    def test_dependency_change_invalidates_pages_and_fragments(self):
+        url = self.urls[1]
+        self.assertContains(self.client.get(url), "Dependencies:</strong> &lt;None&gt;", count=2)
+        before = Task.objects.get(pk=self.groceries.pk).updated_at
+
+        self.groceries.add_dependency("c101")
+
+        self.assertGreater(Task.objects.get(pk=self.groceries.pk).updated_at, before)
+        self.assertContains(self.client.get(url), "Dependencies:</strong> &lt;c101&gt;")
+
+    def test_task_list_version_bumps(self):
+        version = task_list_version(self.task_list.id)
+        self.assertEqual(task_list_version(self.task_list.id), version)
+        bump_task_list_version(self.task_list.id)
+        self.assertNotEqual(task_list_version(self.task_list.id), version)
+
+
+class TestConditionalGet(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.task_list = TaskList.objects.create(name="Conditional List", raw_input="Laundry")
+        self.task = Task.objects.create(
+            title="Do laundry", description="Wash and dry clothes", task_id="e101",
+            estimated_duration=120, task_list=self.task_list
+        )
+        self.url = f'/results/{self.task_list.id}/'
+
+    def test_response_carries_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_matching_etag_returns_304_without_queries(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_if_modified_since_returns_304(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_task_change_produces_new_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.task.title = "Fold laundry"
+        self.task.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_missing_task_list_still_404s(self):
+        response = self.client.get('/results/999/')
+        self.assertEqual(response.status_code, 404)
+
+
+class TestSharedCacheCheck(SimpleTestCase):
+    def test_locmem_is_flagged_for_deploys(self):
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        filebased = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/tmp/x'}}
+        with override_settings(CACHES=locmem):
+            self.assertEqual([warning.id for warning in check_shared_cache(None)], ['tasks.W001'])
+        with override_settings(CACHES=filebased):
+            self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,115 @@
+import gzip
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from tasks import cassettes
+from tasks.cassettes import CassetteMiss, fingerprint, use_cassette
+from tasks.services import ClaudeTaskGroomer
+
+REPLY = {
+    'content': [{'type': 'text', 'text': json.dumps({
+        'analysis': 'Two errands.',
+        'tasks': [{'task': 'Buy milk', 'task_id': 'a1b2', 'time_estimate': '00:20', 'dependencies': [], 'priority': 'low'}],
+    })}],
+    'usage': {'input_tokens': 10, 'output_tokens': 20},
+}
+
+
+class ChunkedClaude(BaseHTTPRequestHandler):
+    """Answers every POST with REPLY, sent in three chunks"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.server.seen.append(self.headers.get('x-api-key'))
+        body = json.dumps(REPLY).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for start in range(0, len(body), len(body) // 3 + 1):
+            chunk = body[start:start + len(body) // 3 + 1]
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+        self.wfile.write(b'0\r\n\r\n')
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(CLAUDE_API_KEY='sk-secret', CLAUDE_CASSETTE_MODE='off')
+class TestCassettes(TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ChunkedClaude)
+        self.server.seen = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'groom.jsonl.gz'
+        self.groomer = ClaudeTaskGroomer()
+        self.groomer.api_url = f'http://127.0.0.1:{self.server.server_port}/v1/messages'
+
+    def test_record_then_replay_offline(self):
+        with use_cassette(self.path, 'record'):
+            recorded = self.groomer.groom_tasks('Buy milk')
+        self.assertTrue(recorded['success'])
+        self.assertEqual(self.server.seen, ['sk-secret'])
+
+        with gzip.open(self.path, 'rt') as fh:
+            stored = fh.read()
+        self.assertNotIn('sk-secret', stored)
+        exchange = json.loads(stored)
+        self.assertEqual(exchange['inputs'], {'todo_text': 'Buy milk', 'context': ''})
+        self.assertGreater(len(exchange['response']['chunks']), 1)
+
+        with use_cassette(self.path, 'replay'):
+            self.assertEqual(self.groomer.groom_tasks('Buy milk'), recorded)
+        self.assertEqual(len(self.server.seen), 1)
+
+    def test_replay_miss_never_reaches_the_network(self):
+        with use_cassette(self.path, 'replay') as cassette:
+            result = self.groomer.groom_tasks('Buy milk')
+            with self.assertRaises(CassetteMiss):
+                cassette.post(self.groomer.api_url, headers=self.groomer.headers, json={})
+        self.assertFalse(result['success'])
+        self.assertIn('No recording', result['error'])
+        self.assertEqual(self.server.seen, [])
+
+    def test_once_records_only_what_is_missing(self):
+        with use_cassette(self.path, 'once'):
+            self.groomer.groom_tasks('Buy milk')
+            self.groomer.groom_tasks('Buy milk')
+            self.groomer.groom_tasks('Buy bread')
+        self.assertEqual(len(self.server.seen), 2)
+
+    def test_fingerprint_ignores_the_api_key(self):
+        body = {'messages': [{'role': 'user', 'content': 'hi'}]}
+        self.assertEqual(
+            fingerprint('POST', 'https://x/v1', {'x-api-key': 'a', 'anthropic-version': '1'}, body),
+            fingerprint('POST', 'https://x/v1', {'X-Api-Key': 'b', 'anthropic-version': '1'}, body),
+        )
+        self.assertNotEqual(
+            fingerprint('POST', 'https://x/v1', {}, body),
+            fingerprint('POST', 'https://x/v1', {}, {'messages': []}),
+        )
+
+    def test_replay_traffic_command(self):
+        with use_cassette(self.path, 'record'):
+            self.groomer.groom_tasks('Buy milk')
+        out = StringIO()
+        call_command('replay_traffic', str(self.path), '--repeat', '3', stdout=out)
+        self.assertIn('3 request(s)', out.getvalue())
+        self.assertIn('0 failed', out.getvalue())
+        self.assertEqual(len(self.server.seen), 1)
+
+    def test_settings_select_the_default_cassette(self):
+        with self.settings(CLAUDE_CASSETTE_MODE='replay', CLAUDE_CASSETTE_DIR=self.path.parent, CLAUDE_CASSETTE='groom'):
+            self.assertEqual(cassettes.current().path, self.path)
+        self.assertIsNone(cassettes.current())
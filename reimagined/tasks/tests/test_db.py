@@ -0,0 +1,27 @@
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import TestCase, override_settings
+
+
+class TestSqliteTuning(TestCase):
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("SQLite-specific tuning")
+
+    def pragma_on_new_connection(self, name):
+        # A fresh connection fires connection_created outside the test transaction
+        new_connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        try:
+            with new_connection.cursor() as cursor:
+                cursor.execute(f"PRAGMA {name}")
+                return cursor.fetchone()[0]
+        finally:
+            new_connection.close()
+
+    @override_settings(SQLITE_PRAGMAS={'synchronous': 'NORMAL', 'temp_store': 'MEMORY'})
+    def test_pragmas_applied_to_new_connections(self):
+        self.assertEqual(self.pragma_on_new_connection('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma_on_new_connection('temp_store'), 2)  # MEMORY
+
+    @override_settings(SQLITE_PRAGMAS={})
+    def test_no_pragmas_keeps_sqlite_defaults(self):
+        self.assertEqual(self.pragma_on_new_connection('synchronous'), 2)  # FULL
@@ -0,0 +1,134 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from tasks import dedup
+from tasks.models import Task, TaskList, TaskSignature
+from tasks.services import ClaudeTaskGroomer
+
+
+class TestSignatures(SimpleTestCase):
+    def test_similar_text_scores_high_and_unrelated_text_low(self):
+        dentist = dedup.minhash("Call the dentist to book a cleaning")
+        self.assertGreaterEqual(dedup.similarity(dentist, dedup.minhash("Call dentist and book a cleaning")), 0.7)
+        self.assertLess(dedup.similarity(dentist, dedup.minhash("Buy groceries for the week")), 0.2)
+
+    def test_signature_packs_into_256_bytes(self):
+        signature = dedup.minhash("Email project proposal")
+        self.assertEqual(len(dedup.pack(signature)), 256)
+        self.assertEqual(dedup.unpack(dedup.pack(signature)), signature)
+        self.assertEqual(len(dedup.band_keys(signature)), dedup.BANDS)
+
+    def test_merge_duplicates_keeps_the_first(self):
+        kept, merged = dedup.merge_duplicates([
+            {'task': 'Call the dentist', 'task_id': 'd001'},
+            {'task': 'Buy milk', 'task_id': 'd002'},
+            {'task': 'Call dentist!', 'task_id': 'd003'},
+        ])
+        self.assertEqual([task['task_id'] for task in kept], ['d001', 'd002'])
+        self.assertEqual(merged, {'d003': 'd001'})
+
+    def test_near_duplicates_are_not_merged(self):
+        titles = ['Write chapter 1', 'Write chapter 2', 'Write chapter 3', 'Email Bob', 'Email Rob', 'Review PR 123', 'Review PR 124']
+        self.assertGreaterEqual(
+            dedup.similarity(dedup.minhash('Review PR 123'), dedup.minhash('Review PR 124')), dedup.threshold()
+        )
+        kept, merged = dedup.merge_duplicates([{'task': title, 'task_id': f'd1{i:02}'} for i, title in enumerate(titles)])
+        self.assertEqual(len(kept), len(titles))
+        self.assertEqual(merged, {})
+
+    def test_repeats_joined_by_a_dependency_path_are_kept(self):
+        # c repeats a's title but depends on it through b; merging would make a <-> b
+        kept, merged = dedup.merge_duplicates([
+            {'task': 'Pack', 'task_id': 'a001', 'dependencies': []},
+            {'task': 'Load van', 'task_id': 'b002', 'dependencies': ['a001']},
+            {'task': 'Pack', 'task_id': 'c003', 'dependencies': ['b002']},
+        ])
+        self.assertEqual(len(kept), 3)
+        self.assertEqual(merged, {})
+
+
+class TestIndex(TestCase):
+    def setUp(self):
+        self.home = TaskList.objects.create(name="Home", raw_input="")
+        self.work = TaskList.objects.create(name="Work", raw_input="")
+        self.dentist = Task.objects.create(
+            title="Call the dentist", description="Call the dentist", task_id="e001",
+            estimated_duration=15, task_list=self.home,
+        )
+
+    def test_created_and_renamed_tasks_are_indexed(self):
+        other = Task.objects.create(
+            title="Call dentist", description="Call dentist", task_id="e002", estimated_duration=10, task_list=self.work,
+        )
+        self.assertEqual([(task, score) for task, score in dedup.similar_tasks(self.dentist)], [(other, 1.0)])
+
+        other.title = other.description = "Renew passport"
+        other.save()
+        self.assertEqual(dedup.similar_tasks(self.dentist), [])
+
+    def test_same_list_is_not_a_suggestion(self):
+        Task.objects.create(title="Call the dentist", description="", task_id="e003", estimated_duration=5, task_list=self.home)
+        self.assertEqual(dedup.similar_tasks(self.dentist), [])
+        self.assertEqual([task.task_id for task, _ in dedup.similar_tasks(self.dentist, same_list=True)], ['e003'])
+
+    def test_backfill_command_indexes_bulk_created_tasks(self):
+        Task.objects.bulk_create([
+            Task(title="Call the dentist", description="", task_id="e004", estimated_duration=5, task_list=self.work),
+        ])
+        out = StringIO()
+        call_command('index_similar_tasks', stdout=out)
+        self.assertIn('Indexed 1 task(s)', out.getvalue())
+        self.assertEqual(TaskSignature.objects.count(), 2)
+        self.assertEqual([task.task_id for task, _ in dedup.similar_tasks(self.dentist)], ['e004'])
+
+    def test_similar_endpoint(self):
+        Task.objects.create(
+            title="Call the dentist", description="", task_id="e005", estimated_duration=20,
+            task_list=self.work, completed=True, actual_seconds=1500,
+        )
+        data = self.client.get(f'/api/v1/task-lists/{self.home.id}/tasks/e001/similar/').json()
+        self.assertEqual(data['results'], [{
+            'task_list_id': self.work.id, 'task_id': 'e005', 'title': 'Call the dentist', 'estimated_duration': 20,
+            'actual_seconds': 1500, 'completed': True, 'similarity': 1.0,
+        }])
+        self.assertEqual(self.client.get(f'/api/v1/task-lists/{self.home.id}/tasks/ffff/similar/').status_code, 404)
+
+
+@override_settings(CLAUDE_API_KEY='test-key')
+class TestImport(TestCase):
+    def test_duplicates_are_merged_and_tracked_durations_seed_estimates(self):
+        earlier = TaskList.objects.create(name="Last week", raw_input="")
+        Task.objects.create(
+            title="Call the dentist", description="Call the dentist", task_id="f001", estimated_duration=10,
+            task_list=earlier, completed=True, actual_seconds=25 * 60,
+        )
+        groomed = {'success': True, 'analysis': '', 'tasks': [
+            {'task': 'Call dentist', 'task_id': 'f002', 'time_estimate': '00:10', 'dependencies': [], 'priority': 'high'},
+            {'task': 'Buy floss', 'task_id': 'f003', 'time_estimate': '00:30', 'dependencies': ['f004'], 'priority': 'low'},
+            {'task': 'Call the dentist', 'task_id': 'f004', 'time_estimate': '00:10', 'dependencies': [], 'priority': 'high'},
+        ]}
+        with mock.patch('tasks.services.get_estimator', return_value=None):
+            task_list, _ = ClaudeTaskGroomer().create_task_list_from_groomed_tasks("Errands", "", groomed)
+
+        tasks = {task.task_id: task for task in task_list.tasks.all()}
+        self.assertEqual(sorted(tasks), ['f002', 'f003'])
+        self.assertEqual(tasks['f003'].get_dependency_ids(), ['f002'])
+        self.assertEqual(tasks['f002'].estimated_duration, 25)
+        self.assertEqual(tasks['f002'].original_estimate, 10)
+        self.assertEqual(tasks['f003'].estimated_duration, 30)
+
+    def test_near_duplicates_and_dependent_repeats_are_imported_separately(self):
+        groomed = {'success': True, 'analysis': '', 'tasks': [
+            {'task': 'Write chapter 1', 'task_id': 'f011', 'time_estimate': '01:00', 'dependencies': []},
+            {'task': 'Write chapter 2', 'task_id': 'f012', 'time_estimate': '01:00', 'dependencies': ['f011']},
+            {'task': 'Write chapter 1', 'task_id': 'f013', 'time_estimate': '00:30', 'dependencies': ['f012']},
+        ]}
+        with mock.patch('tasks.services.get_estimator', return_value=None):
+            task_list, _ = ClaudeTaskGroomer().create_task_list_from_groomed_tasks("Book", "", groomed)
+
+        tasks = {task.task_id: task for task in task_list.tasks.all()}
+        self.assertEqual(sorted(tasks), ['f011', 'f012', 'f013'])
+        self.assertEqual(tasks['f011'].get_dependency_ids(), [])
+        self.assertEqual(tasks['f013'].get_dependency_ids(), ['f012'])
@@ -0,0 +1,91 @@
+import math
+import os
+import tempfile
+import unittest
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from tasks import estimator
+from tasks.estimator import LOG_ESTIMATE, N_FEATURES, DurationEstimator, get_estimator, title_buckets
+from tasks.models import Task, TaskList
+from tasks.services import ClaudeTaskGroomer
+
+
+def identity_weights():
+    """Weights that reproduce the groomer's estimate"""
+    weights = [0.0] * N_FEATURES
+    weights[LOG_ESTIMATE] = 1.0
+    return weights
+
+
+class TestDurationEstimator(TestCase):
+    def test_identity_model_keeps_estimate(self):
+        self.assertEqual(DurationEstimator(identity_weights()).predict("Do laundry", 'medium', 45), 45)
+
+    def test_title_tokens_scale_estimate(self):
+        weights = identity_weights()
+        for bucket in title_buckets("laundry"):
+            weights[bucket] = math.log(2)
+        model = DurationEstimator(weights)
+        self.assertEqual(model.predict("Do the LAUNDRY", 'medium', 30), 60)
+        self.assertEqual(model.predict("Write report", 'medium', 30), 30)
+
+    def test_adjustment_is_bounded(self):
+        weights = identity_weights()
+        weights[estimator.BIAS] = 10.0
+        self.assertEqual(DurationEstimator(weights).predict("Anything", 'low', 30), 120)
+
+    def test_artifact_round_trip_and_reload(self):
+        path = os.path.join(tempfile.mkdtemp(), 'duration_model.json')
+        with override_settings(DURATION_MODEL_PATH=path):
+            self.assertIsNone(get_estimator())
+            DurationEstimator(identity_weights(), samples=3).save(path)
+            self.assertEqual(get_estimator().samples, 3)
+            DurationEstimator(identity_weights(), samples=7).save(path)
+            self.assertEqual(get_estimator().samples, 7)
+
+    def test_import_calibrates_and_keeps_original(self):
+        path = os.path.join(tempfile.mkdtemp(), 'duration_model.json')
+        weights = identity_weights()
+        for bucket in title_buckets("laundry"):
+            weights[bucket] = math.log(2)
+        DurationEstimator(weights).save(path)
+        groomed = {
+            'success': True,
+            'tasks': [{'task_id': 'd101', 'task': 'Laundry', 'priority': 'medium', 'time_estimate': '00:30'}],
+        }
+        with override_settings(DURATION_MODEL_PATH=path, CLAUDE_API_KEY='x'):
+            task_list, _ = ClaudeTaskGroomer().create_task_list_from_groomed_tasks("List", "Laundry", groomed)
+        task = task_list.tasks.get()
+        self.assertEqual((task.estimated_duration, task.original_estimate), (60, 30))
+
+
+@unittest.skipUnless(estimator.np is not None, "NumPy is required for training")
+class TestTraining(TestCase):
+    def setUp(self):
+        task_list = TaskList.objects.create(name="History", raw_input="")
+        tasks = []
+        for n in range(80):
+            laundry = n % 2 == 0
+            estimate = 20 + n % 5 * 10
+            tasks.append(Task(
+                title=f"{'Laundry load' if laundry else 'Answer email'} {n}", description="", task_id=f"{n:04x}",
+                estimated_duration=estimate, original_estimate=estimate, completed=True, task_list=task_list,
+                actual_seconds=estimate * 60 * (2 if laundry else 1),
+            ))
+        Task.objects.bulk_create(tasks)
+
+    def test_learns_per_token_overruns(self):
+        model = estimator.train(alpha=0.1)
+        self.assertEqual(model.samples, 80)
+        self.assertAlmostEqual(model.predict("Laundry load", 'medium', 30), 60, delta=6)
+        self.assertAlmostEqual(model.predict("Answer email", 'medium', 30), 30, delta=3)
+        self.assertLess(model.metrics['holdout_mae_minutes'], model.metrics['groomer_mae_minutes'])
+
+    def test_command_writes_artifact(self):
+        path = os.path.join(tempfile.mkdtemp(), 'duration_model.json')
+        out = StringIO()
+        call_command('train_duration_model', output=path, min_samples=10, stdout=out)
+        self.assertIn('Trained on 80 tasks', out.getvalue())
+        self.assertEqual(DurationEstimator.load(path).samples, 80)
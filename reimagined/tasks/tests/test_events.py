@@ -0,0 +1,125 @@
+import asyncio
+import json
+import tempfile
+import threading
+from unittest import mock
+
+from django.test import TestCase
+from tasks.events import EventBroker, format_sse, get_broker, task_list_channel
+from tasks.models import Task, TaskList
+
+
+class TestEventBroker(TestCase):
+    def test_in_process_fan_out(self):
+        broker = EventBroker('tasks.events.InProcessBackend', {})
+
+        async def listen():
+            async with broker.subscribe('tasklist:1') as first, broker.subscribe('tasklist:1') as second:
+                # Publish from another thread, as a WSGI request would
+                threading.Thread(target=broker.publish, args=('tasklist:1', {'type': 'ping'})).start()
+                return await asyncio.wait_for(asyncio.gather(first.get(), second.get()), 2)
+
+        self.assertEqual(asyncio.run(listen()), [{'type': 'ping'}, {'type': 'ping'}])
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    def test_file_spool_crosses_brokers(self):
+        directory = tempfile.mkdtemp()
+        options = {'directory': directory, 'poll_interval': 0.01}
+        publisher = EventBroker('tasks.events.FileSpoolBackend', options)
+        subscriber = EventBroker('tasks.events.FileSpoolBackend', options)
+        publisher.publish('tasklist:2', {'type': 'before'})
+
+        async def listen():
+            async with subscriber.subscribe('tasklist:2') as queue:
+                publisher.publish('tasklist:2', {'type': 'after'})
+                return await asyncio.wait_for(queue.get(), 2)
+
+        # Events spooled before subscribing are not replayed
+        self.assertEqual(asyncio.run(listen()), {'type': 'after'})
+
+    def test_slow_consumer_drops_oldest(self):
+        broker = EventBroker('tasks.events.InProcessBackend', {})
+
+        async def listen():
+            async with broker.subscribe('tasklist:3') as queue:
+                for n in range(queue.maxsize + 5):
+                    broker.publish('tasklist:3', {'type': 'tick', 'n': n})
+                await asyncio.sleep(0)
+                return queue.qsize(), queue.get_nowait()['n']
+
+        self.assertEqual(asyncio.run(listen()), (100, 5))
+
+
+class TestCompletionEvents(TestCase):
+    def setUp(self):
+        self.task_list = TaskList.objects.create(name="Events", raw_input="Laundry")
+        self.wash = Task.objects.create(title="Wash", task_id="e101", estimated_duration=60, task_list=self.task_list)
+        self.dry = Task.objects.create(title="Dry", task_id="e102", estimated_duration=45, task_list=self.task_list)
+        self.dry.dependencies.add(self.wash)
+
+    def test_complete_publishes_after_commit(self):
+        with mock.patch('tasks.events.get_broker') as get_broker:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                Task.objects.filter(pk=self.wash.pk).complete()
+                self.assertFalse(get_broker.return_value.publish.called)
+        self.assertEqual(len(callbacks), 1)
+        channel, event = get_broker.return_value.publish.call_args.args
+        self.assertEqual(channel, task_list_channel(self.task_list.id))
+        self.assertEqual(event['type'], 'task_completed')
+        self.assertEqual(event['completed'], ['e101'])
+        self.assertEqual([task['task_id'] for task in event['ready']], ['e102'])
+        self.assertEqual(event['remaining_minutes'], 45)
+
+    def test_mark_completed_publishes(self):
+        with mock.patch('tasks.events.get_broker') as get_broker:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.dry.mark_completed()
+        event = get_broker.return_value.publish.call_args.args[1]
+        self.assertEqual(event['completed'], ['e102'])
+
+    def test_api_completion_publishes(self):
+        url = f'/api/v1/task-lists/{self.task_list.id}/tasks/complete/'
+        with mock.patch('tasks.events.get_broker') as get_broker:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(url, json.dumps({'tasks': ['e101']}), content_type='application/json')
+        self.assertTrue(get_broker.return_value.publish.called)
+
+
+class TestTimelineEventStream(TestCase):
+    async def test_streams_published_events(self):
+        task_list = await TaskList.objects.acreate(name="Stream", raw_input="Laundry")
+        url = f'/personal-assistance/executive-function/todo-timeline/execute/{task_list.id}/events/'
+        response = await self.async_client.get(url, headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        stream = response.streaming_content
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+
+        # The subscription opens on the first read; publish once it exists
+        channel = task_list_channel(task_list.id)
+        pending = asyncio.ensure_future(anext(stream))
+        while not get_broker().subscriber_count(channel):
+            await asyncio.sleep(0.01)
+        event = {'type': 'task_completed', 'completed': ['e101']}
+        get_broker().publish(channel, event)
+        self.assertEqual(await asyncio.wait_for(pending, 2), format_sse(event).encode())
+        await stream.aclose()
+
+    async def test_unknown_task_list_is_404(self):
+        response = await self.async_client.get('/personal-assistance/executive-function/todo-timeline/execute/999/events/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_wsgi_gets_no_stream(self):
+        # self.client goes through a WSGI handler, like runserver and gthread workers
+        task_list = TaskList.objects.create(name="Threads", raw_input="Laundry")
+        page = f'/personal-assistance/executive-function/todo-timeline/execute/{task_list.id}/'
+        self.assertNotContains(self.client.get(page), 'data-events-url')
+        response = self.client.get(f'{page}events/')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(response.streaming)
+
+    async def test_asgi_page_links_the_stream(self):
+        task_list = await TaskList.objects.acreate(name="Coroutines", raw_input="Laundry")
+        page = f'/personal-assistance/executive-function/todo-timeline/execute/{task_list.id}/'
+        self.assertContains(await self.async_client.get(page), f'data-events-url="{page}events/"')
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+from tasks.export import export, ics_fold
+from tasks.models import Task, TaskList
+
+
+class ExportTestCase(TestCase):
+    def setUp(self):
+        self.task_list = TaskList.objects.create(name="Export, List", raw_input="Laundry")
+        self.wash = Task.objects.create(
+            title="Wash", description="", task_id="f101", estimated_duration=60, schedule_order=1,
+            task_list=self.task_list
+        )
+        self.dry = Task.objects.create(
+            title="Dry; then fold", description="", task_id="f102", estimated_duration=45, schedule_order=2,
+            task_list=self.task_list
+        )
+        self.music = Task.objects.create(
+            title="Music", description="", task_id="f103", estimated_duration=30, schedule_order=3,
+            can_run_parallel=True, task_list=self.task_list
+        )
+        self.dry.dependencies.add(self.wash, self.music)
+        other = TaskList.objects.create(name="Other", raw_input="")
+        Task.objects.create(title="Elsewhere", description="", task_id="f201", estimated_duration=5, task_list=other)
+
+    def url(self, fmt):
+        return f'/results/{self.task_list.id}/export.{fmt}'
+
+    def content(self, response):
+        return b''.join(response.streaming_content).decode('utf-8')
+
+
+class TestExportFormats(ExportTestCase):
+    def test_csv_merges_dependencies(self):
+        response = self.client.get(self.url('csv'))
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.DictReader(io.StringIO(self.content(response))))
+        self.assertEqual([row['task_id'] for row in rows], ['f101', 'f102', 'f103'])
+        self.assertEqual(rows[1]['dependencies'], 'f101 f103')
+        self.assertEqual(rows[0]['task_list'], "Export, List")
+
+    def test_jsonl(self):
+        lines = self.content(self.client.get(self.url('jsonl'))).splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1]['dependencies'], ['f101', 'f103'])
+
+    def test_ics_lays_out_schedule_order(self):
+        content = self.content(self.client.get(self.url('ics'), {'start': '2025-03-01T09:00:00+00:00'}))
+        self.assertTrue(content.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertEqual(content.count('BEGIN:VEVENT'), 3)
+        self.assertIn('DTSTART:20250301T090000Z\r\nDTEND:20250301T100000Z', content)
+        self.assertIn('DTSTART:20250301T100000Z\r\nDTEND:20250301T104500Z', content)
+        # Parallel tasks start alongside without moving the clock
+        self.assertIn('DTSTART:20250301T104500Z\r\nDTEND:20250301T111500Z', content)
+        self.assertIn('SUMMARY:Dry\; then fold', content)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get(self.url('xml')).status_code, 404)
+        self.assertEqual(self.client.get(self.url('ics') + '?start=tomorrow').status_code, 400)
+        self.assertEqual(self.client.get('/results/999/export.csv').status_code, 404)
+
+    def test_small_chunks_give_the_same_rows(self):
+        self.assertEqual(''.join(export('jsonl', chunk_size=1)), ''.join(export('jsonl')))
+
+    def test_ics_fold(self):
+        folded = ics_fold('SUMMARY:' + 'é' * 60)
+        self.assertTrue(all(len(line.encode('utf-8')) <= 75 for line in folded.split('\r\n')))
+        self.assertEqual(folded.replace('\r\n ', ''), 'SUMMARY:' + 'é' * 60 + '\r\n')
+
+
+class TestExportCommand(ExportTestCase):
+    def test_exports_every_task_by_default(self):
+        out = io.StringIO()
+        call_command('export_tasks', format='jsonl', stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 4)
+
+    def test_selected_task_list_to_file(self):
+        path = os.path.join(tempfile.mkdtemp(), 'tasks.csv')
+        call_command('export_tasks', task_lists=[self.task_list.id], output=path, stderr=io.StringIO())
+        with open(path, newline='') as fh:
+            self.assertEqual(len(list(csv.DictReader(fh))), 3)
@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from tasks import metrics
+from tasks.models import TaskList
+from tasks.services import ClaudeTaskGroomer
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def sample(self, text, line_start):
+        for line in text.splitlines():
+            if line.startswith(line_start + ' '):
+                return float(line.rsplit(' ', 1)[1])
+        return None
+
+
+class TestExposition(MetricsTestCase):
+    def test_counter_and_histogram_format(self):
+        counter = metrics.Counter('test_things_total', "Things", ('kind',))
+        histogram = metrics.Histogram('test_wait_seconds', "Waits", buckets=(0.1, 1))
+        self.addCleanup(metrics.REGISTRY.pop, 'test_things_total')
+        self.addCleanup(metrics.REGISTRY.pop, 'test_wait_seconds')
+        counter.inc(kind='a "quoted"\nvalue')
+        counter.inc(2, kind='b')
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value)
+
+        text = metrics.render()
+        self.assertIn('# TYPE test_things_total counter', text)
+        self.assertIn('test_things_total{kind="a \\"quoted\\"\\nvalue"} 1', text)
+        self.assertIn('test_things_total{kind="b"} 2', text)
+        self.assertIn('# TYPE test_wait_seconds histogram', text)
+        self.assertIn('test_wait_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('test_wait_seconds_bucket{le="1"} 2', text)
+        self.assertIn('test_wait_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn('test_wait_seconds_sum 5.55', text)
+        self.assertIn('test_wait_seconds_count 3', text)
+
+    def test_sums_other_processes_snapshots(self):
+        directory = tempfile.mkdtemp()
+        metrics.PAGE_CACHE.inc(view='results', result='hit')
+        with override_settings(METRICS_DIR=directory):
+            metrics.flush(force=True)
+            with open(os.path.join(directory, f'{os.getpid()}.json')) as fh:
+                other = json.load(fh)
+            # Pretend two more workers wrote the same values
+            for pid in (1, 2):
+                with open(os.path.join(directory, f'{pid}.json'), 'w') as fh:
+                    json.dump(other, fh)
+            with open(os.path.join(directory, '3.json'), 'w') as fh:
+                fh.write('{"truncated')
+            text = metrics.render()
+        self.assertEqual(self.sample(text, 'mindtimer_page_cache_requests_total{view="results",result="hit"}'), 3)
+
+
+class TestInstrumentation(MetricsTestCase):
+    def test_middleware_records_view_latency_and_queries(self):
+        task_list = TaskList.objects.create(name="Metrics", raw_input="")
+        self.client.get(f'/results/{task_list.id}/')
+        self.client.get(f'/results/{task_list.id}/')
+        text = self.client.get('/metrics').content.decode()
+
+        self.assertEqual(
+            self.sample(text, 'mindtimer_http_requests_total{view="results",method="GET",status="200"}'), 2
+        )
+        self.assertEqual(self.sample(text, 'mindtimer_http_request_duration_seconds_count{view="results"}'), 2)
+        self.assertGreater(self.sample(text, 'mindtimer_db_queries_total{view="results"}'), 0)
+        self.assertEqual(self.sample(text, 'mindtimer_page_cache_requests_total{view="results",result="miss"}'), 1)
+        self.assertEqual(self.sample(text, 'mindtimer_page_cache_requests_total{view="results",result="hit"}'), 1)
+
+    def test_groom_tasks_latency_tokens_and_errors(self):
+        response = mock.Mock()
+        response.json.return_value = {
+            'content': [{'text': '{"analysis": "ok", "tasks": []}'}],
+            'usage': {'input_tokens': 120, 'output_tokens': 45},
+        }
+        with override_settings(CLAUDE_API_KEY='test'):
+            groomer = ClaudeTaskGroomer()
+            with mock.patch('tasks.services.requests.post', return_value=response):
+                self.assertTrue(groomer.groom_tasks("Laundry")['success'])
+            with mock.patch('tasks.services.requests.post', side_effect=requests.ConnectionError("down")):
+                self.assertFalse(groomer.groom_tasks("Laundry")['success'])
+
+        text = metrics.render()
+        self.assertEqual(self.sample(text, 'mindtimer_groom_duration_seconds_count'), 2)
+        self.assertEqual(self.sample(text, 'mindtimer_groom_tokens_total{direction="input"}'), 120)
+        self.assertEqual(self.sample(text, 'mindtimer_groom_tokens_total{direction="output"}'), 45)
+        self.assertEqual(self.sample(text, 'mindtimer_groom_errors_total{reason="request"}'), 1)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token_protects_endpoint(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer secret'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.core.exceptions import ValidationError
 from tasks.models import Task, TaskList, Schedule
 
@@ -81,6 +83,26 @@ class TestTaskList(TestCase):
         self.assertEqual(task_list.total_estimated_time(), 75)
 
 
+class TestTaskListAnalysis(TestCase):
+    def test_analysis_defaults_to_empty_string(self):
+        task_list = TaskList.objects.create(name="List", raw_input="Tasks")
+        self.assertEqual(task_list.analysis, "")
+        self.assertEqual(TaskList.objects.get(pk=task_list.pk).analysis, "")
+
+    def test_short_analysis_round_trips(self):
+        task_list = TaskList.objects.create(name="List", raw_input="Tasks", analysis="Split into two steps.")
+        self.assertEqual(TaskList.objects.get(pk=task_list.pk).analysis, "Split into two steps.")
+
+    def test_long_analysis_is_stored_compressed(self):
+        analysis = "Break the move into packing, transport and unpacking. " * 100
+        task_list = TaskList.objects.create(name="List", raw_input="Tasks", analysis=analysis)
+
+        stored = TaskList.objects.filter(pk=task_list.pk).values_list('analysis', flat=True).get()
+        self.assertEqual(stored, analysis)
+        raw = TaskList._meta.get_field('analysis').get_prep_value(analysis)
+        self.assertLess(len(raw), len(analysis.encode()) / 4)
+
+
 class TestSchedule(TestCase):
     def test_schedule_creation(self):
         task_list = TaskList.objects.create(
@@ -136,4 +158,87 @@ class TestSchedule(TestCase):
             schedule_order=2
         )
         
-        self.assertEqual(schedule.total_duration(), 55)
\ No newline at end of file
+        self.assertEqual(schedule.total_duration(), 55)
+
+class TestTaskReadyFrontier(TestCase):
+    def setUp(self):
+        self.task_list = TaskList.objects.create(name="Frontier", raw_input="Tasks")
+        self.wash = Task.objects.create(
+            title="Wash", description="Wash clothes", estimated_duration=60,
+            task_list=self.task_list, schedule_order=1
+        )
+        self.dry = Task.objects.create(
+            title="Dry", description="Dry clothes", estimated_duration=45,
+            task_list=self.task_list, schedule_order=2
+        )
+        self.call = Task.objects.create(
+            title="Call mom", description="Check in", estimated_duration=10,
+            task_list=self.task_list, schedule_order=3
+        )
+        self.dry.dependencies.add(self.wash)
+
+    def test_ready_excludes_tasks_with_incomplete_dependencies(self):
+        ready = list(Task.objects.filter(task_list=self.task_list).ready())
+        self.assertEqual(ready, [self.wash, self.call])
+
+    def test_completing_dependency_unblocks_task(self):
+        self.wash.mark_completed()
+        ready = list(Task.objects.filter(task_list=self.task_list).ready())
+        self.assertEqual(ready, [self.dry, self.call])
+
+    def test_ready_excludes_completed_tasks(self):
+        self.call.mark_completed()
+        ready = list(Task.objects.filter(task_list=self.task_list).ready())
+        self.assertNotIn(self.call, ready)
+
+    def test_ready_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            list(Task.objects.filter(task_list=self.task_list).ready())
+
+
+class TestTaskCompletion(TestCase):
+    def setUp(self):
+        self.task_list = TaskList.objects.create(name="Completion", raw_input="Tasks")
+        self.wash = Task.objects.create(
+            title="Wash", description="Wash clothes", estimated_duration=60, task_list=self.task_list
+        )
+        self.dry = Task.objects.create(
+            title="Dry", description="Dry clothes", estimated_duration=45, task_list=self.task_list
+        )
+        self.fold = Task.objects.create(
+            title="Fold", description="Fold clothes", estimated_duration=15, task_list=self.task_list
+        )
+        self.dry.dependencies.add(self.wash)
+        self.fold.dependencies.add(self.wash, self.dry)
+
+    def test_mark_completed_updates_only_completion_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.wash.mark_completed()
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "tasks_task"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"completed"', updates[0])
+        self.assertNotIn('"title"', updates[0])
+        self.assertTrue(Task.objects.get(pk=self.wash.pk).completed)
+
+    def test_bulk_complete_returns_newly_unblocked_tasks(self):
+        unblocked = Task.objects.filter(pk=self.wash.pk).complete()
+        self.assertEqual(unblocked, [self.dry])
+
+        unblocked = Task.objects.filter(pk=self.dry.pk).complete()
+        self.assertEqual(unblocked, [self.fold])
+
+    def test_bulk_complete_uses_one_update_for_tasks(self):
+        with CaptureQueriesContext(connection) as queries:
+            Task.objects.filter(task_list=self.task_list).complete()
+        task_updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE "tasks_task"')]
+        self.assertEqual(len(task_updates), 1)
+        self.assertFalse(Task.objects.filter(task_list=self.task_list, completed=False).exists())
+
+    def test_bulk_complete_touches_task_list(self):
+        before = TaskList.objects.get(pk=self.task_list.pk).updated_at
+        Task.objects.filter(pk=self.wash.pk).complete()
+        self.assertGreater(TaskList.objects.get(pk=self.task_list.pk).updated_at, before)
+
+    def test_bulk_complete_skips_already_completed(self):
+        self.wash.mark_completed()
+        self.assertEqual(Task.objects.filter(pk=self.wash.pk).complete(), [])
@@ -0,0 +1,79 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from tasks.models import ProfileArtifact, ProfilingRule, TaskList
+from tasks.profiling import HEADER, make_token
+from tasks.synthetic import groomed_result
+
+
+class ProfilingTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.profile_dir = tempfile.mkdtemp()
+        override = override_settings(PROFILING_DIR=self.profile_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.task_list = TaskList.objects.create(name="Profiled", raw_input="")
+        self.url = f'/results/{self.task_list.id}/'
+
+
+class TestProfilingMiddleware(ProfilingTestCase):
+    def test_off_by_default(self):
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header('X-Profile-Id'))
+        self.assertFalse(ProfileArtifact.objects.exists())
+
+    def test_signed_header_profiles_request(self):
+        response = self.client.get(self.url, headers={HEADER: make_token()})
+        artifact = ProfileArtifact.objects.get(pk=response['X-Profile-Id'])
+        self.assertEqual((artifact.path, artifact.status_code, artifact.trigger), (self.url, 200, 'header'))
+        self.assertIn('Top functions by cumulative time', artifact.report)
+        self.assertIn('allocation changes', artifact.report)
+        self.assertTrue(os.path.exists(artifact.profile_file))
+
+    def test_tampered_or_expired_header_is_ignored(self):
+        self.client.get(self.url, headers={HEADER: make_token() + 'x'})
+        with override_settings(PROFILING_TOKEN_MAX_AGE=-1):
+            self.client.get(self.url, headers={HEADER: make_token()})
+        self.assertFalse(ProfileArtifact.objects.exists())
+
+    def test_admin_rule_profiles_next_matching_requests(self):
+        rule = ProfilingRule.objects.create(path_prefix='/results/', remaining=1)
+        self.client.get('/personal-assistance/')
+        self.assertIn('X-Profile-Id', self.client.get(self.url))
+        self.assertNotIn('X-Profile-Id', self.client.get(self.url))
+        rule.refresh_from_db()
+        self.assertEqual(rule.remaining, 0)
+        self.assertEqual(ProfileArtifact.objects.get().trigger, 'rule')
+
+    @override_settings(CLAUDE_API_KEY='test')
+    def test_covers_groomer_calls(self):
+        groomed = groomed_result(3, seed=1)
+        with mock.patch('tasks.services.ClaudeTaskGroomer.groom_tasks', return_value=groomed):
+            self.client.post(
+                '/personal-assistance/executive-function/todo-timeline/process/',
+                {'task_list_name': 'Profiled', 'todo_text': 'Laundry'}, headers={HEADER: make_token()},
+            )
+        self.assertIn('create_task_list_from_groomed_tasks', ProfileArtifact.objects.get().report)
+
+    def test_deleting_artifact_removes_file(self):
+        self.client.get(self.url, headers={HEADER: make_token()})
+        artifact = ProfileArtifact.objects.get()
+        artifact.delete()
+        self.assertFalse(os.path.exists(artifact.profile_file))
+
+
+class TestProfilingAdmin(ProfilingTestCase):
+    def test_artifacts_listed_in_admin(self):
+        self.client.get(self.url, headers={HEADER: make_token()})
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(admin)
+        response = self.client.get('/admin/tasks/profileartifact/')
+        self.assertContains(response, self.url)
+        artifact = ProfileArtifact.objects.get()
+        response = self.client.get(f'/admin/tasks/profileartifact/{artifact.pk}/change/')
+        self.assertContains(response, 'Top functions by cumulative time')
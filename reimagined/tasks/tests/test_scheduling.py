@@ -0,0 +1,147 @@
+import json
+import random
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+from tasks import scheduling
+from tasks.models import Schedule, Task, TaskList
+from tasks.synthetic import DURATIONS, dag_edges
+
+
+def assert_feasible(test, plan, durations, dependencies, lanes):
+    for task, deps in enumerate(dependencies):
+        for dep in deps:
+            test.assertGreaterEqual(plan.starts[task], plan.starts[dep] + durations[dep])
+    for lane in plan.lane_orders():
+        test.assertLess(plan.lanes[lane[0]], lanes)
+        for before, after in zip(lane, lane[1:]):
+            test.assertGreaterEqual(plan.starts[after], plan.starts[before] + durations[before])
+    test.assertEqual(plan.makespan, scheduling.makespan_of(plan.starts, durations))
+
+
+class TestOptimize(SimpleTestCase):
+    def test_beats_greedy_list_scheduling(self):
+        # Greedy starts the two 30s first; the optimum pairs 30+30 against 20+20+20
+        durations = [30, 30, 20, 20, 20]
+        self.assertEqual(scheduling.makespan_of(scheduling.list_schedule(durations, [[]] * 5, 2)[0], durations), 70)
+        plan = scheduling.optimize(durations, [[]] * 5, lanes=2, budget_ms=5000)
+        self.assertEqual((plan.makespan, plan.optimal, plan.sequential), (60, True, 120))
+
+    def test_dependencies_and_critical_path(self):
+        # 0 -> 1 -> 2 is a 90 minute chain; 3 and 4 fit beside it
+        durations = [30, 30, 30, 40, 40]
+        dependencies = [[], [0], [1], [], []]
+        plan = scheduling.optimize(durations, dependencies, lanes=2, budget_ms=5000)
+        assert_feasible(self, plan, durations, dependencies, 2)
+        self.assertEqual(plan.makespan, 90)
+        self.assertTrue(plan.optimal)
+
+    def test_matches_exhaustive_search_on_small_lists(self):
+        rng = random.Random(7)
+        for _ in range(40):
+            count, lanes = rng.randint(1, 6), rng.randint(1, 3)
+            durations = [rng.choice((0, 10, 15, 20, 45)) for _ in range(count)]
+            dependencies = [[] for _ in range(count)]
+            for task, dependency in dag_edges(count, 'random', rng.random(), rng):
+                dependencies[task].append(dependency)
+            plan = scheduling.optimize(durations, dependencies, lanes, budget_ms=5000)
+            assert_feasible(self, plan, durations, dependencies, lanes)
+            self.assertTrue(plan.optimal)
+            self.assertEqual(plan.makespan, exhaustive(durations, dependencies, lanes))
+
+    def test_budget_returns_best_plan_so_far(self):
+        rng = random.Random(3)
+        durations = [rng.choice(DURATIONS) + 1 for _ in range(60)]
+        dependencies = [[] for _ in durations]
+        for task, dependency in dag_edges(60, 'random', 0.05, rng):
+            dependencies[task].append(dependency)
+        plan = scheduling.optimize(durations, dependencies, lanes=3, budget_ms=1)
+        assert_feasible(self, plan, durations, dependencies, 3)
+        self.assertLessEqual(plan.lower_bound, plan.makespan)
+        self.assertLess(plan.makespan, plan.sequential)
+
+    def test_cycle_is_rejected(self):
+        with self.assertRaises(scheduling.CycleError):
+            scheduling.optimize([10, 10], [[1], [0]], lanes=2)
+
+
+def exhaustive(durations, dependencies, lanes):
+    """Every task order on every lane, no pruning"""
+    finish, free, best = [None] * len(durations), [0] * lanes, [sum(durations)]
+
+    def place(placed):
+        if placed == len(durations):
+            best[0] = min(best[0], max(free))
+            return
+        for task, deps in enumerate(dependencies):
+            if finish[task] is None and all(finish[dep] is not None for dep in deps):
+                release = max((finish[dep] for dep in deps), default=0)
+                for lane in range(lanes):
+                    previous = free[lane]
+                    finish[task] = free[lane] = max(previous, release) + durations[task]
+                    place(placed + 1)
+                    finish[task], free[lane] = None, previous
+
+    place(0)
+    return best[0]
+
+
+class TestSaveSchedule(TestCase):
+    def setUp(self):
+        self.task_list = TaskList.objects.create(name="Move out", raw_input="")
+        self.tasks = {
+            task_id: Task.objects.create(
+                title=title, description="", task_id=task_id, estimated_duration=minutes,
+                task_list=self.task_list, schedule_order=order,
+            )
+            for order, (task_id, title, minutes) in enumerate([
+                ('d101', "Pack books", 30), ('d102', "Load van", 60),
+                ('d103', "Clean kitchen", 45), ('d104', "Return keys", 15),
+            ])
+        }
+        self.tasks['d102'].dependencies.add(self.tasks['d101'])
+        self.tasks['d104'].dependencies.add(self.tasks['d102'], self.tasks['d103'])
+
+    def test_saves_dependency_schedule_and_reorders_tasks(self):
+        schedule, plan = scheduling.save_schedule(self.task_list, lanes=2, budget_ms=1000)
+        self.assertEqual(schedule.optimization_algorithm, 'dependency')
+        self.assertEqual(schedule.total_estimated_duration, 105)
+        self.assertTrue(plan.optimal)
+        self.assertEqual(sorted(schedule.parallel_blocks), [['d101', 'd102', 'd104'], ['d103']])
+        order = list(self.task_list.tasks.order_by('schedule_order').values_list('task_id', flat=True))
+        self.assertEqual(order[-1], 'd104')
+
+    def test_completed_tasks_are_left_out(self):
+        Task.objects.filter(task_id__in=['d101', 'd102']).update(completed=True)
+        schedule, _ = scheduling.save_schedule(self.task_list, lanes=2, budget_ms=1000)
+        self.assertEqual(schedule.total_estimated_duration, 60)
+        self.assertEqual(sorted(schedule.parallel_blocks), [['d103', 'd104']])
+        self.assertGreater(Task.objects.get(task_id='d103').schedule_order, 1)
+
+    def test_optimize_endpoint(self):
+        url = f'/api/v1/task-lists/{self.task_list.id}/schedules/optimize/'
+        response = self.client.post(url, json.dumps({'lanes': 2, 'budget_ms': 500}), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual((data['total_estimated_duration'], data['sequential_duration']), (105, 150))
+        self.assertTrue(data['optimal'])
+        self.assertEqual(Schedule.objects.get().optimization_algorithm, 'dependency')
+        self.assertEqual(
+            self.client.post(url, json.dumps({'lanes': 0}), content_type='application/json').status_code, 400
+        )
+
+    def test_command(self):
+        out = StringIO()
+        call_command('optimize_schedule', str(self.task_list.id), '--lanes', '1', stdout=out)
+        self.assertIn('150 min on 1 lane(s) (optimal)', out.getvalue())
+
+    def test_cycle_is_a_bad_request(self):
+        self.tasks['d101'].dependencies.add(self.tasks['d104'])
+        url = f'/api/v1/task-lists/{self.task_list.id}/schedules/optimize/'
+        response = self.client.post(url, '{}', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cycle', response.json()['error'])
+        self.assertFalse(Schedule.objects.exists())
+        with self.assertRaisesMessage(CommandError, 'cycle'):
+            call_command('optimize_schedule', str(self.task_list.id), stdout=StringIO())
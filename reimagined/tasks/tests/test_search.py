@@ -0,0 +1,68 @@
+from django.db import connection
+from django.test import TestCase
+from tasks import search
+from tasks.models import Task, TaskList
+
+
+class SearchTestCase(TestCase):
+    def setUp(self):
+        self.task_list = TaskList.objects.create(name="Health", raw_input="Call the <b>dentist</b>, then groceries")
+        self.dentist = Task.objects.create(
+            title="Call the dentist", description="Book a cleaning", task_id="c101",
+            estimated_duration=10, task_list=self.task_list,
+        )
+        self.groceries = Task.objects.create(
+            title="Buy groceries", description="Milk and toothpaste for the dentist visit", task_id="c102",
+            estimated_duration=30, task_list=self.task_list,
+        )
+
+    def titles(self, query, **kwargs):
+        return [hit['title'] for hit in search.search(query, **kwargs)]
+
+
+class TestSearch(SearchTestCase):
+    def test_title_matches_rank_first_and_are_highlighted(self):
+        hits = search.search('dentist', kinds=('task',))
+        self.assertEqual([hit['task_id'] for hit in hits], ['c101', 'c102'])
+        self.assertEqual(hits[0]['title'], 'Call the <mark>dentist</mark>')
+        self.assertIn('<mark>dentist</mark> visit', hits[1]['snippet'])
+
+    def test_raw_input_is_searched_and_escaped(self):
+        [hit] = search.search('groceries', kinds=('task_list',))
+        self.assertEqual(hit['task_list_id'], self.task_list.id)
+        self.assertEqual(hit['snippet'], 'Call the &lt;b&gt;dentist&lt;/b&gt;, then <mark>groceries</mark>')
+
+    def test_last_word_is_a_prefix_and_operators_are_plain_words(self):
+        self.assertEqual(self.titles('call dent', kinds=('task',)), ['<mark>Call</mark> the <mark>dentist</mark>'])
+        self.assertEqual(search.search('NOT "dentist" OR title:*', kinds=('task',)), [])
+
+    def test_index_follows_updates_and_deletes_without_signals(self):
+        Task.objects.filter(pk=self.groceries.pk).update(title="Buy floss")
+        self.assertEqual(self.titles('floss'), ['Buy <mark>floss</mark>'])
+        Task.objects.filter(pk=self.dentist.pk).delete()
+        self.assertEqual(self.titles('cleaning'), [])
+
+    def test_install_repairs_dropped_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER tasks_task_fts_ai")
+        search.install(connection)
+        Task.objects.create(title="Renew passport", description="", task_id="c103", estimated_duration=20)
+        self.assertEqual(self.titles('passport'), ['Renew <mark>passport</mark>'])
+
+
+class TestSearchEndpoint(SearchTestCase):
+    def test_keyset_pagination(self):
+        first = self.client.get('/api/v1/search/?q=dentist&limit=2').json()
+        self.assertEqual(len(first['results']), 2)
+        self.assertIsNotNone(first['next'])
+
+        second = self.client.get(first['next']).json()
+        self.assertEqual(len(second['results']), 1)
+        self.assertIsNone(second['next'])
+        seen = [(hit['kind'], hit['id']) for hit in first['results'] + second['results']]
+        self.assertEqual(len(set(seen)), 3)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get('/api/v1/search/').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/search/?q=x&after=nope').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/search/?q=x&in=schedule').status_code, 400)
@@ -0,0 +1,84 @@
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template import engines
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from mindtimer import serving
+
+
+class TestWarmUp(TestCase):
+    def test_loads_urlconf_templates_and_requests(self):
+        serving.warm_up()
+        cached = engines['django'].engine.template_loaders[0]
+        self.assertIn('tasks/timeline_execution.html', {key.split('-')[0] for key in cached.get_template_cache})
+        self.assertIn('urllib3', sys.modules)
+
+
+class TestPostWorkerInit(TransactionTestCase):
+    def test_opens_a_connection_in_every_thread(self):
+        opened = set()
+
+        def created(sender, connection, **kwargs):
+            opened.add(threading.get_ident())
+
+        connection_created.connect(created)
+        self.addCleanup(connection_created.disconnect, created)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            serving.post_worker_init(SimpleNamespace(tpool=pool, cfg=SimpleNamespace(threads=4)))
+            pool.submit(lambda: connections.close_all()).result()
+        self.assertEqual(len(opened), 4)
+
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+FILE_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/tmp/x'}}
+SPOOL = {'BACKEND': 'tasks.events.FileSpoolBackend', 'OPTIONS': {'directory': '/tmp/x'}}
+
+
+class TestPerProcessState(SimpleTestCase):
+    @override_settings(CACHES=LOCMEM)
+    def test_one_worker_may_keep_state_in_process(self):
+        self.assertEqual(serving.per_process_state(1, asgi=True), [])
+
+    @override_settings(CACHES=LOCMEM)
+    def test_locmem_cache_with_several_workers(self):
+        [problem] = serving.per_process_state(4)
+        self.assertIn('CACHE_BACKEND=locmem', problem)
+
+    @override_settings(CACHES=FILE_CACHE)
+    def test_in_process_events_only_matter_under_asgi(self):
+        self.assertEqual(serving.per_process_state(4), [])
+        [problem] = serving.per_process_state(4, asgi=True)
+        self.assertIn('TIMELINE_EVENTS_BACKEND=inprocess', problem)
+        with override_settings(TIMELINE_EVENTS=SPOOL):
+            self.assertEqual(serving.per_process_state(4, asgi=True), [])
+
+    @override_settings(CACHES=LOCMEM)
+    def test_gunicorn_hook_refuses_to_start(self):
+        server = SimpleNamespace(cfg=SimpleNamespace(workers=3, worker_class_str='gthread'))
+        with self.assertRaisesMessage(RuntimeError, 'Refusing to start 3 workers'):
+            serving.on_starting(server)
+
+
+@unittest.skipUnless(find_spec('gunicorn'), "gunicorn is not installed")
+class TestServeCommand(TestCase):
+    def test_asgi_without_uvicorn(self):
+        with mock.patch.object(serving, 'ASGI_WORKER_CLASSES', ('missing_server.workers.Worker',)):
+            with mock.patch('gunicorn.app.base.BaseApplication.run') as run:
+                with self.assertRaisesMessage(CommandError, 'uvicorn'):
+                    call_command('serve', '--asgi')
+        run.assert_not_called()
+
+    @override_settings(CACHES=LOCMEM)
+    def test_refuses_several_workers_over_locmem_cache(self):
+        with mock.patch('gunicorn.app.base.BaseApplication.run') as run:
+            with self.assertRaisesMessage(CommandError, 'CACHE_BACKEND=locmem'):
+                call_command('serve', '--workers', '2')
+        run.assert_not_called()
@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+from django.conf import settings
+
+# Seconds for a cold import of mindtimer.wsgi plus the URLconf. It takes about
+# 0.35 s on one CPU core (0.5 s when requests and NumPy were imported eagerly).
+# The budget leaves room for slow CI machines; IMPORT_TIME_BUDGET overrides it.
+IMPORT_BUDGET = float(os.getenv('IMPORT_TIME_BUDGET', '1.0'))
+
+PROBE = """
+import json, os, sys, time
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mindtimer.settings')
+start = time.perf_counter()
+import mindtimer.wsgi
+from django.urls import get_resolver
+get_resolver().url_patterns
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'seconds': elapsed,
+    'loaded': [name for name in ('urllib3', 'requests.sessions', 'numpy.linalg') if name in sys.modules],
+}))
+"""
+
+
+class TestStartup(unittest.TestCase):
+    def probe(self):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE], cwd=Path(settings.BASE_DIR), capture_output=True, text=True,
+            env={**os.environ, 'CLAUDE_API_KEY': 'startup-test'}, check=True,
+        )
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_heavy_modules_are_not_imported_at_boot(self):
+        self.assertEqual(self.probe()['loaded'], [])
+
+    def test_cold_import_within_budget(self):
+        # Best of three, so one noisy run doesn't fail the build
+        seconds = min(self.probe()['seconds'] for _ in range(3))
+        self.assertLess(seconds, IMPORT_BUDGET, f"Importing mindtimer.wsgi took {seconds:.3f}s")
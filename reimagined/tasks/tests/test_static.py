@@ -0,0 +1,79 @@
+import gzip
+import os
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+COMPRESSED_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'mindtimer.storage.CompressedManifestStaticFilesStorage'},
+}
+
+
+class TestStaticAssetPipeline(TestCase):
+    def setUp(self):
+        self.static_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.static_root.cleanup)
+        overrides = override_settings(
+            STATIC_ROOT=self.static_root.name, STORAGES=COMPRESSED_STORAGES, SERVE_STATIC=True
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def test_collectstatic_writes_hashed_and_gzipped_files(self):
+        hashed = staticfiles_storage.stored_name('css/base.css')
+        self.assertRegex(hashed, r'^css/base\.[0-9a-f]{12}\.css$')
+
+        path = os.path.join(self.static_root.name, hashed)
+        with open(path, 'rb') as original, gzip.open(path + '.gz') as compressed:
+            self.assertEqual(compressed.read(), original.read())
+
+    def test_hashed_files_are_served_compressed_with_far_future_caching(self):
+        url = staticfiles_storage.url('css/base.css')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_identity_encoding_when_client_does_not_accept_gzip(self):
+        url = staticfiles_storage.url('css/base.css')
+        response = self.client.get(url)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn(b'--primary-color', b''.join(response.streaming_content))
+
+    def test_zero_quality_refuses_an_encoding(self):
+        url = staticfiles_storage.url('css/base.css')
+        for header in ['gzip;q=0', 'br;q=0, gzip; q=0.0', '*;q=0', 'identity, gzip;q=0']:
+            with self.subTest(header=header):
+                response = self.client.get(url, HTTP_ACCEPT_ENCODING=header)
+                self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(self.client.get(url, HTTP_ACCEPT_ENCODING='br;q=0, *;q=0.5')['Content-Encoding'], 'gzip')
+
+    def test_missing_and_traversal_paths_404(self):
+        self.assertEqual(self.client.get('/static/css/missing.css').status_code, 404)
+        self.assertEqual(self.client.get('/static/../manage.py').status_code, 404)
+
+
+class TestPagesUseExternalStylesheets(TestCase):
+    def test_pages_link_stylesheets_instead_of_inlining(self):
+        for url in ['/personal-assistance/', '/personal-assistance/executive-function/',
+                    '/personal-assistance/executive-function/todo-timeline/']:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertNotContains(response, '<style>')
+                self.assertContains(response, 'rel="stylesheet"', count=2)
+
+    def test_html_is_gzipped_for_accepting_clients(self):
+        response = self.client.get('/personal-assistance/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_html_is_not_gzipped_for_gzip_q_zero(self):
+        response = self.client.get('/personal-assistance/', HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', response['Vary'])
@@ -0,0 +1,58 @@
+import random
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from tasks.models import Task, TaskDependency, TaskList
+from tasks.synthetic import MAX_DEPENDENCIES, SHAPES, dag_edges, free_task_ids, groomed_result, seed_task_lists
+
+
+class TestDagEdges(TestCase):
+    def test_shapes_are_acyclic_and_capped(self):
+        for shape in SHAPES:
+            edges = dag_edges(200, shape, density=0.5, rng=random.Random(1))
+            self.assertTrue(edges, shape)
+            self.assertTrue(all(dependency < task for task, dependency in edges), shape)
+            per_task = {}
+            for task, _ in edges:
+                per_task[task] = per_task.get(task, 0) + 1
+            self.assertLessEqual(max(per_task.values()), MAX_DEPENDENCIES, shape)
+
+    def test_chain(self):
+        self.assertEqual(dag_edges(4, 'chain'), [(1, 0), (2, 1), (3, 2)])
+
+
+class TestSeedTaskLists(TestCase):
+    def test_bulk_creates_lists_tasks_and_dependencies(self):
+        task_lists = seed_task_lists(lists=3, tasks_per_list=20, shape='chain', seed=7)
+        self.assertEqual(TaskList.objects.count(), 3)
+        self.assertEqual(Task.objects.filter(task_list=task_lists[0]).count(), 20)
+        self.assertEqual(TaskDependency.objects.count(), 3 * 19)
+        second = Task.objects.filter(task_list=task_lists[0]).order_by('schedule_order')[1]
+        self.assertEqual(second.get_dependency_ids(), [Task.objects.get(task_list=task_lists[0], schedule_order=0).task_id])
+
+    def test_task_id_space_is_respected(self):
+        Task.objects.create(title="Existing", description="", task_id="0000", estimated_duration=5)
+        with mock.patch('tasks.synthetic.TASK_ID_SPACE', 4):
+            self.assertEqual(len(set(free_task_ids(3))), 3)
+            self.assertNotIn('0000', free_task_ids(3))
+            with self.assertRaises(ValueError):
+                free_task_ids(4)
+
+    def test_groomed_result_matches_groomer_format(self):
+        result = groomed_result(10, shape='fanout', seed=1)
+        self.assertEqual(len(result['tasks']), 10)
+        self.assertEqual(result['tasks'][1]['dependencies'], [result['tasks'][0]['task_id']])
+        self.assertRegex(result['tasks'][0]['time_estimate'], r'^\d\d:\d\d$')
+
+    def test_command(self):
+        out = StringIO()
+        call_command('seed_synthetic', lists=2, tasks=5, shape='random', seed=1, stdout=out)
+        mine = TaskList.objects.create(name="Synthetic biology homework", raw_input="Read chapter 3")
+        call_command('seed_synthetic', lists=1, tasks=5, clear=True, stdout=out)
+        self.assertEqual(TaskList.objects.count(), 2)
+        self.assertTrue(TaskList.objects.filter(pk=mine.pk).exists())
+        with self.assertRaises(CommandError):
+            call_command('seed_synthetic', lists=1, tasks=70000, stdout=out)
@@ -0,0 +1,46 @@
+import tempfile
+import unittest
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from mindtimer.testing import TimedTestRunner, assign_shards, migrations_fingerprint, parse_shard
+
+
+class TestSharding(SimpleTestCase):
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard('2/4'), (2, 4))
+        for value in ('0/4', '5/4', '2', 'a/b'):
+            with self.assertRaises(ValueError):
+                parse_shard(value)
+
+    def test_balances_by_recorded_duration(self):
+        cases = {'slow': ['slow.a', 'slow.b'], 'mid': ['mid.a'], 'fast': ['fast.a'], 'new': ['new.a']}
+        durations = {'slow.a': 3.0, 'slow.b': 2.0, 'mid.a': 3.0, 'fast.a': 1.0}
+        shards = assign_shards(cases, durations, 2)
+        self.assertEqual(shards['slow'], 1)
+        self.assertEqual(shards['mid'], 2)
+        # 'new' has no duration yet, so it weighs the median (2.5s) and evens out shard 2
+        self.assertEqual(shards['new'], 2)
+        self.assertEqual(shards['fast'], 1)
+
+    def test_shards_cover_the_suite_once(self):
+        class First(unittest.TestCase):
+            def test_a(self): pass
+            def test_b(self): pass
+
+        class Second(unittest.TestCase):
+            def test_c(self): pass
+
+        tests = [First('test_a'), First('test_b'), Second('test_c')]
+        seen = []
+        for index in (1, 2, 3):
+            with tempfile.NamedTemporaryFile(suffix='.json') as fh:
+                runner = TimedTestRunner(shard=f'{index}/3', durations_file=fh.name, verbosity=0)
+                seen.extend(test.id() for test in runner.test_suite(tests))
+        self.assertCountEqual(seen, [test.id() for test in tests])
+
+
+class TestTemplateDatabase(TestCase):
+    def test_fingerprint_is_stable(self):
+        self.assertEqual(migrations_fingerprint(connection.alias), migrations_fingerprint(connection.alias))
+        self.assertRegex(migrations_fingerprint(connection.alias), r'^[0-9a-f]{16}$')
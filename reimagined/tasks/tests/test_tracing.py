@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from tasks import tracing
+from tasks.models import TaskList
+from tasks.synthetic import groomed_result
+
+
+class TracingTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.trace_file = os.path.join(tempfile.mkdtemp(), 'spans.jsonl')
+        override = override_settings(TRACING_ENABLED=True, TRACING_SAMPLE_RATE=1.0, TRACING_FILE=self.trace_file)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def exported(self):
+        """Spans of every exported trace, one list per line"""
+        if not os.path.exists(self.trace_file):
+            return []
+        with open(self.trace_file) as fh:
+            return [
+                json.loads(line)['resourceSpans'][0]['scopeSpans'][0]['spans']
+                for line in fh
+            ]
+
+
+class TestSpans(TracingTestCase):
+    def test_nested_spans_share_a_trace(self):
+        with tracing.span('outer') as outer:
+            with tracing.span('inner', attributes={'answer': 42}):
+                pass
+        [spans] = self.exported()
+        inner, root = spans
+        self.assertEqual((root['name'], inner['name']), ('outer', 'inner'))
+        self.assertEqual(root['traceId'], inner['traceId'])
+        self.assertEqual(len(root['traceId']), 32)
+        self.assertEqual(root['parentSpanId'], '')
+        self.assertEqual(inner['parentSpanId'], outer.span_id)
+        self.assertEqual(inner['attributes'], [{'key': 'answer', 'value': {'intValue': '42'}}])
+        self.assertLessEqual(int(root['startTimeUnixNano']), int(inner['startTimeUnixNano']))
+
+    def test_exception_marks_span_as_error(self):
+        with self.assertRaises(KeyError):
+            with tracing.span('failing'):
+                raise KeyError('missing')
+        [[failing]] = self.exported()
+        self.assertEqual(failing['status']['code'], tracing.STATUS_ERROR)
+
+    def test_disabled_or_unsampled_records_nothing(self):
+        with override_settings(TRACING_ENABLED=False):
+            with tracing.span('off') as off:
+                self.assertIsNone(off)
+        with override_settings(TRACING_SAMPLE_RATE=0.0):
+            with tracing.span('unsampled') as unsampled:
+                self.assertIsNone(unsampled)
+        self.assertEqual(self.exported(), [])
+
+
+class TestRequestTracing(TracingTestCase):
+    def test_request_span_with_sql_children(self):
+        task_list = TaskList.objects.create(name="Traced", raw_input="")
+        self.client.get(f'/results/{task_list.id}/')
+        [spans] = self.exported()
+        root = spans[-1]
+        self.assertEqual(root['name'], 'GET results/<int:task_list_id>/')
+        self.assertEqual(root['kind'], tracing.SERVER)
+        sql = [s for s in spans if s['kind'] == tracing.CLIENT]
+        self.assertTrue(sql)
+        self.assertTrue(all(s['parentSpanId'] == root['spanId'] for s in sql))
+        self.assertIn('SELECT', {s['name'] for s in sql})
+
+    def test_grooming_flow_spans(self):
+        response = mock.Mock(status_code=200)
+        groomed = groomed_result(3, seed=1)
+        response.json.return_value = {
+            'content': [{'text': "Here you go:\n" + json.dumps({'analysis': 'ok', 'tasks': groomed['tasks']})}],
+            'usage': {'input_tokens': 10, 'output_tokens': 20},
+        }
+        with override_settings(CLAUDE_API_KEY='test'), \
+                mock.patch('tasks.services.requests.post', return_value=response):
+            self.client.post(
+                '/personal-assistance/executive-function/todo-timeline/process/',
+                {'task_list_name': 'Traced', 'todo_text': 'Laundry'},
+            )
+        [spans] = self.exported()
+        by_name = {s['name']: s for s in spans}
+        root = by_name['POST personal-assistance/executive-function/todo-timeline/process/']
+        groom = by_name['ClaudeTaskGroomer.groom_tasks']
+        self.assertEqual(groom['parentSpanId'], root['spanId'])
+        self.assertEqual(by_name['POST /v1/messages']['parentSpanId'], groom['spanId'])
+        self.assertEqual(by_name['ClaudeTaskGroomer.parse']['parentSpanId'], groom['spanId'])
+        create = by_name['ClaudeTaskGroomer.create_task_list_from_groomed_tasks']
+        self.assertEqual(create['parentSpanId'], root['spanId'])
+        self.assertIn('INSERT', {s['name'] for s in spans if s['parentSpanId'] == create['spanId']})
@@ -0,0 +1,148 @@
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from tasks.models import DurationRollup, Task, TaskEvent, TaskList
+from tasks.tracking import duration_report, record_events
+
+T0 = datetime(2025, 3, 1, 9, 0, tzinfo=dt_timezone.utc)
+
+
+class TrackingTestCase(TestCase):
+    def setUp(self):
+        self.task_list = TaskList.objects.create(name="Tracked", raw_input="Laundry")
+        self.wash = Task.objects.create(
+            title="Wash", task_id="c101", estimated_duration=30, priority='high', task_list=self.task_list
+        )
+        self.dry = Task.objects.create(title="Dry", task_id="c102", estimated_duration=20, task_list=self.task_list)
+        self.dry.dependencies.add(self.wash)
+
+
+class TestRecordEvents(TrackingTestCase):
+    def test_materializes_actual_seconds(self):
+        record_events([
+            (self.wash.pk, TaskEvent.START, T0),
+            (self.wash.pk, TaskEvent.PAUSE, T0 + timedelta(minutes=10)),
+            (self.wash.pk, TaskEvent.RESUME, T0 + timedelta(minutes=15)),
+        ])
+        self.wash.refresh_from_db()
+        self.assertEqual(self.wash.actual_seconds, 600)
+        self.assertEqual(self.wash.running_since, T0 + timedelta(minutes=15))
+        self.assertEqual(TaskEvent.objects.filter(task=self.wash).count(), 3)
+
+        # A later batch continues from the materialized state
+        completed, unblocked = record_events([(self.wash.pk, TaskEvent.COMPLETE, T0 + timedelta(minutes=35))])
+        self.wash.refresh_from_db()
+        self.assertEqual(self.wash.actual_seconds, 1800)
+        self.assertIsNone(self.wash.running_since)
+        self.assertTrue(self.wash.completed)
+        self.assertEqual([task.pk for task in completed], [self.wash.pk])
+        self.assertEqual([task.pk for task in unblocked], [self.dry.pk])
+
+    def test_touches_updated_at(self):
+        before = self.wash.updated_at
+        record_events([(self.wash.pk, TaskEvent.START, T0)])
+        self.wash.refresh_from_db()
+        self.assertGreater(self.wash.updated_at, before)
+
+    def test_applies_batch_in_timestamp_order(self):
+        record_events([
+            (self.wash.pk, TaskEvent.PAUSE, T0 + timedelta(minutes=5)),
+            (self.wash.pk, TaskEvent.START, T0),
+        ])
+        self.wash.refresh_from_db()
+        self.assertEqual(self.wash.actual_seconds, 300)
+
+    def test_ignores_events_after_completion(self):
+        record_events([
+            (self.wash.pk, TaskEvent.START, T0),
+            (self.wash.pk, TaskEvent.COMPLETE, T0 + timedelta(minutes=5)),
+            (self.wash.pk, TaskEvent.RESUME, T0 + timedelta(minutes=6)),
+        ])
+        self.wash.refresh_from_db()
+        self.assertEqual(self.wash.actual_seconds, 300)
+        self.assertIsNone(self.wash.running_since)
+
+
+class TestDurationRollups(TrackingTestCase):
+    def test_completions_roll_up_incrementally(self):
+        record_events([(self.wash.pk, TaskEvent.START, T0), (self.wash.pk, TaskEvent.COMPLETE, T0 + timedelta(minutes=45))])
+        record_events([(self.dry.pk, TaskEvent.START, T0), (self.dry.pk, TaskEvent.COMPLETE, T0 + timedelta(minutes=10))])
+
+        rollup = DurationRollup.objects.get(day=T0.date(), priority='high')
+        self.assertEqual((rollup.task_count, rollup.estimated_minutes, rollup.actual_seconds), (1, 30, 2700))
+        report = {row['priority']: row for row in duration_report()}
+        self.assertEqual(report['medium']['actual_seconds'], 600)
+
+    def test_untracked_completions_are_not_rolled_up(self):
+        record_events([(self.wash.pk, TaskEvent.COMPLETE, T0)])
+        self.assertFalse(DurationRollup.objects.exists())
+
+    def test_completing_outside_events_stops_the_clock(self):
+        record_events([(self.wash.pk, TaskEvent.START, T0)])
+        response = self.client.post(
+            f'/api/v1/task-lists/{self.task_list.id}/tasks/complete/', json.dumps({'tasks': ['c101']}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.wash.refresh_from_db()
+        self.assertIsNone(self.wash.running_since)
+        self.assertGreater(self.wash.actual_seconds, 0)
+        self.assertEqual(TaskEvent.objects.filter(task=self.wash, event_type=TaskEvent.COMPLETE).count(), 1)
+        rollup = DurationRollup.objects.get(priority='high')
+        self.assertEqual((rollup.task_count, rollup.actual_seconds), (1, self.wash.actual_seconds))
+
+    def test_mark_completed_stops_the_clock(self):
+        record_events([(self.dry.pk, TaskEvent.START, T0)])
+        self.dry.refresh_from_db()
+        self.dry.mark_completed()
+        self.dry.refresh_from_db()
+        self.assertTrue(self.dry.completed)
+        self.assertIsNone(self.dry.running_since)
+        self.assertEqual(DurationRollup.objects.get(priority='medium').actual_seconds, self.dry.actual_seconds)
+
+    def test_report_command(self):
+        record_events([(self.wash.pk, TaskEvent.START, T0), (self.wash.pk, TaskEvent.COMPLETE, T0 + timedelta(minutes=45))])
+        out = StringIO()
+        call_command('duration_report', stdout=out)
+        self.assertIn('high', out.getvalue())
+        self.assertIn('1.50', out.getvalue())
+
+
+class TestEventsEndpoint(TrackingTestCase):
+    def post(self, events):
+        return self.client.post(
+            f'/api/v1/task-lists/{self.task_list.id}/events/', json.dumps({'events': events}),
+            content_type='application/json'
+        )
+
+    def test_batched_events(self):
+        start = T0.timestamp()
+        response = self.post([
+            {'task': 'c101', 'type': 'start', 'at': start},
+            {'task': 'c101', 'type': 'complete', 'at': '2025-03-01T09:20:00+00:00'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['recorded'], 2)
+        self.assertEqual(data['completed'], ['c101'])
+        self.assertEqual([task['task_id'] for task in data['ready']], ['c102'])
+        self.assertEqual(data['tasks'][0]['actual_seconds'], 1200)
+
+    def test_rejects_unknown_type_and_task(self):
+        self.assertEqual(self.post([{'task': 'c101', 'type': 'stop'}]).status_code, 400)
+        self.assertEqual(self.post([{'task': 'ffff', 'type': 'start'}]).status_code, 400)
+        self.assertFalse(TaskEvent.objects.exists())
+
+    def test_rejects_non_string_fields(self):
+        self.assertEqual(self.post([{'task': ['c101'], 'type': 'start'}]).status_code, 400)
+        self.assertEqual(self.post([{'task': 'c101', 'type': ['start']}]).status_code, 400)
+        self.assertEqual(self.post([{'type': 'start'}]).status_code, 400)
+        self.assertFalse(TaskEvent.objects.exists())
+
+    def test_future_times_are_clamped(self):
+        self.post([{'task': 'c101', 'type': 'start', 'at': 4102444800}])
+        self.wash.refresh_from_db()
+        self.assertLess(self.wash.running_since.year, 2100)
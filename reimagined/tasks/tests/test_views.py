@@ -51,6 +51,12 @@ class TestResultsView(TestCase):
         response = self.client.get(f'/results/{self.task_list.id}/')
         self.assertContains(response, 'Can run in parallel')
 
+    def test_results_view_reads_analysis_from_task_list(self):
+        self.task_list.analysis = "Laundry first, groceries can overlap."
+        self.task_list.save()
+        response = self.client.get(f'/results/{self.task_list.id}/')
+        self.assertContains(response, 'Laundry first, groceries can overlap.')
+
     def test_results_view_invalid_task_list_id_returns_404(self):
         response = self.client.get('/results/999/')
         self.assertEqual(response.status_code, 404)
@@ -160,6 +166,36 @@ class TestNavigationViews(TestCase):
         self.assertContains(response, 'Home')
         self.assertContains(response, 'Back')
 
+    def test_timeline_execution_now_skips_blocked_tasks(self):
+        task_list = TaskList.objects.create(
+            name="Test Tasks",
+            raw_input="Wash clothes then dry them"
+        )
+        wash = Task.objects.create(
+            title="Wash clothes",
+            description="Run the washer",
+            estimated_duration=60,
+            task_list=task_list,
+            schedule_order=2
+        )
+        dry = Task.objects.create(
+            title="Dry clothes",
+            description="Run the dryer",
+            estimated_duration=45,
+            task_list=task_list,
+            schedule_order=1
+        )
+        dry.dependencies.add(wash)
+
+        response = self.client.get(f'/personal-assistance/executive-function/todo-timeline/execute/{task_list.id}/')
+        self.assertEqual(response.context['current_task'], wash)
+        self.assertEqual(response.context['next_task'], dry)
+
+        wash.mark_completed()
+        response = self.client.get(f'/personal-assistance/executive-function/todo-timeline/execute/{task_list.id}/')
+        self.assertEqual(response.context['current_task'], dry)
+        self.assertIsNone(response.context['next_task'])
+
     def test_timeline_execution_view_invalid_id_returns_404(self):
         response = self.client.get('/personal-assistance/executive-function/todo-timeline/execute/999/')
         self.assertEqual(response.status_code, 404)
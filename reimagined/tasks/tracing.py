@@ -0,0 +1,248 @@
+"""
+Lightweight request tracing, exported as OTLP JSON.
+
+Spans nest through a contextvar. TracingMiddleware opens a server span per
+request, and while a request is sampled each SQL statement becomes a client
+span. The groomer adds spans for its API call, the JSON parse and the task
+inserts. Anything left after those, up to the end of the request span, is
+the view and its template or redirect.
+
+When a trace's root span ends, the whole trace is appended to TRACING_FILE
+as one OTLP/JSON ExportTraceServiceRequest per line. This is the format the
+OpenTelemetry Collector's file exporter writes and its otlpjsonfile receiver
+reads. Off unless TRACING_ENABLED is set; TRACING_SAMPLE_RATE picks the
+share of root spans that are recorded.
+"""
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# OTLP SpanKind and StatusCode values
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+SERVICE_NAME = 'mindtimer'
+SCOPE_NAME = 'tasks.tracing'
+MAX_STATEMENT_LENGTH = 2000
+
+_current_span = ContextVar('mindtimer_current_span', default=None)
+_export_lock = threading.Lock()
+
+
+class Trace:
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans = []
+
+
+class Span:
+    __slots__ = (
+        'trace', 'name', 'kind', 'span_id', 'parent_span_id', 'attributes',
+        'start_ns', 'end_ns', 'status_code', 'status_message',
+    )
+
+    def __init__(self, trace, name, parent=None, kind=INTERNAL, attributes=None):
+        self.trace = trace
+        self.name = name
+        self.kind = kind
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent.span_id if parent else ''
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status_code = STATUS_UNSET
+        self.status_message = ''
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_error(self, message):
+        self.status_code = STATUS_ERROR
+        self.status_message = message
+
+    def end(self):
+        self.end_ns = time.time_ns()
+        self.trace.spans.append(self)
+
+
+def current_span():
+    return _current_span.get()
+
+
+@contextmanager
+def span(name, kind=INTERNAL, attributes=None):
+    """
+    Record a span as a child of the current one. Outside a trace it starts a
+    new trace when tracing is enabled and the trace is sampled; otherwise it
+    yields None and records nothing.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        if not settings.TRACING_ENABLED or random.random() >= settings.TRACING_SAMPLE_RATE:
+            yield None
+            return
+        trace = Trace()
+    else:
+        trace = parent.trace
+
+    current = Span(trace, name, parent, kind, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.set_attribute('exception.type', type(exc).__name__)
+        current.set_error(str(exc))
+        raise
+    finally:
+        current.end()
+        _current_span.reset(token)
+        if parent is None:
+            export(trace)
+
+
+def traced(name):
+    """Decorator running the function inside span(name)"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def mark_error(message):
+    """Flag the current span as failed, for errors that are returned rather than raised"""
+    current = _current_span.get()
+    if current is not None:
+        current.set_error(message)
+
+
+# OTLP/JSON export --------------------------------------------------------------
+
+def otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def otlp_attributes(attributes):
+    return [{'key': key, 'value': otlp_value(value)} for key, value in attributes.items()]
+
+
+def otlp_span(span):
+    data = {
+        'traceId': span.trace.trace_id,
+        'spanId': span.span_id,
+        'parentSpanId': span.parent_span_id,
+        'name': span.name,
+        'kind': span.kind,
+        'startTimeUnixNano': str(span.start_ns),
+        'endTimeUnixNano': str(span.end_ns),
+        'attributes': otlp_attributes(span.attributes),
+        'status': {'code': span.status_code},
+    }
+    if span.status_message:
+        data['status']['message'] = span.status_message
+    return data
+
+
+def otlp_request(spans):
+    """An ExportTraceServiceRequest holding spans"""
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': otlp_attributes({'service.name': SERVICE_NAME, 'process.pid': os.getpid()})},
+            'scopeSpans': [{'scope': {'name': SCOPE_NAME}, 'spans': [otlp_span(s) for s in spans]}],
+        }],
+    }
+
+
+def export(trace):
+    line = json.dumps(otlp_request(trace.spans), separators=(',', ':')) + '\n'
+    path = settings.TRACING_FILE
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with _export_lock, open(path, 'a', encoding='utf-8') as fh:
+            fh.write(line)
+    except OSError as exc:
+        logger.warning("Could not write trace %s to %s: %s", trace.trace_id, path, exc)
+
+
+# Request and SQL instrumentation ---------------------------------------------
+
+def trace_sql(execute, sql, params, many, context):
+    """execute_wrapper recording each statement as a client span"""
+    operation = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else 'SQL'
+    attributes = {
+        'db.system': connection.vendor,
+        'db.operation': operation,
+        'db.statement': sql[:MAX_STATEMENT_LENGTH],
+    }
+    if many:
+        attributes['db.executemany'] = True
+    with span(operation, CLIENT, attributes):
+        return execute(sql, params, many, context)
+
+
+def name_request_span(request_span, request, response):
+    match = getattr(request, 'resolver_match', None)
+    if match is not None:
+        request_span.name = f"{request.method} {match.route or match.view_name}"
+        request_span.set_attribute('http.route', match.route)
+        request_span.set_attribute('mindtimer.view', match.view_name or match._func_path)
+    request_span.set_attribute('http.response.status_code', response.status_code)
+    if response.status_code >= 500:
+        request_span.set_error(f"HTTP {response.status_code}")
+
+
+class TracingMiddleware:
+    """
+    Open a server span around every sampled request, with SQL spans beneath
+    it. Async requests get the request span only: their queries run in
+    worker threads without the execute_wrapper.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def request_attributes(self, request):
+        return {'http.request.method': request.method, 'url.path': request.path}
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with span(request.method, SERVER, self.request_attributes(request)) as request_span:
+            if request_span is None:
+                return self.get_response(request)
+            with connection.execute_wrapper(trace_sql):
+                response = self.get_response(request)
+            name_request_span(request_span, request, response)
+            return response
+
+    async def __acall__(self, request):
+        with span(request.method, SERVER, self.request_attributes(request)) as request_span:
+            response = await self.get_response(request)
+            if request_span is not None:
+                name_request_span(request_span, request, response)
+            return response
@@ -0,0 +1,131 @@
+"""
+Time tracking.
+
+TaskEvent rows are append-only. Recording a batch also folds it into the
+materialized Task.actual_seconds / Task.running_since and, for completions,
+into DurationRollup, so duration reports read a few hundred rollup rows
+instead of scanning the event log.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .caching import bump_task_list_version
+from .models import DurationRollup, Task, TaskEvent
+
+EVENT_TYPES = {
+    'start': TaskEvent.START,
+    'pause': TaskEvent.PAUSE,
+    'resume': TaskEvent.RESUME,
+    'complete': TaskEvent.COMPLETE,
+}
+
+
+def stop_clock(task, timestamp):
+    if task.running_since is not None:
+        task.actual_seconds += max(0, int((timestamp - task.running_since).total_seconds()))
+        task.running_since = None
+
+
+def apply_event(task, event_type, timestamp):
+    """Fold one event into the task's materialized state; return True on completion"""
+    if task.completed:
+        return False
+    if event_type in (TaskEvent.START, TaskEvent.RESUME):
+        if task.running_since is None:
+            task.running_since = timestamp
+    elif event_type == TaskEvent.PAUSE:
+        stop_clock(task, timestamp)
+    elif event_type == TaskEvent.COMPLETE:
+        stop_clock(task, timestamp)
+        task.completed = True
+        return True
+    return False
+
+
+def record_events(events):
+    """
+    Append a batch of (task pk, event_type, timestamp) events and update the
+    materialized durations and rollups in the same transaction.
+
+    Events are applied in timestamp order; transitions that don't apply (a
+    pause while not running, anything after completion) are logged but
+    change nothing. Returns (completed tasks, tasks they unblocked).
+    """
+    events = sorted(events, key=lambda event: event[2])
+    if not events:
+        return [], []
+
+    with transaction.atomic():
+        tasks = Task.objects.select_for_update().in_bulk({pk for pk, _, _ in events})
+        completed = []
+        for pk, event_type, timestamp in events:
+            if apply_event(tasks[pk], event_type, timestamp):
+                completed.append((tasks[pk], timestamp))
+
+        TaskEvent.objects.bulk_create(
+            [TaskEvent(task_id=pk, event_type=event_type, timestamp=timestamp) for pk, event_type, timestamp in events]
+        )
+        # bulk_update skips auto_now; the API's Last-Modified validators read updated_at
+        now = timezone.now()
+        for task in tasks.values():
+            task.updated_at = now
+        Task.objects.bulk_update(tasks.values(), ['actual_seconds', 'running_since', 'updated_at'])
+        unblocked = Task.objects.filter(pk__in=[task.pk for task, _ in completed]).complete(track=False)
+        add_to_rollups(completed)
+
+    for task_list_id in {task.task_list_id for task in tasks.values()}:
+        bump_task_list_version(task_list_id)
+    return [task for task, _ in completed], unblocked
+
+
+def close_tracking(tasks, timestamp):
+    """
+    Stop the clocks of tracked tasks completed outside record_events() (the
+    /complete/ endpoints, mark_completed()): log their COMPLETE events and add
+    them to the rollups. Returns the tasks that had been tracked.
+    """
+    tracked = [task for task in tasks if task.running_since is not None or task.actual_seconds]
+    for task in tracked:
+        stop_clock(task, timestamp)
+    TaskEvent.objects.bulk_create(
+        [TaskEvent(task=task, event_type=TaskEvent.COMPLETE, timestamp=timestamp) for task in tracked]
+    )
+    add_to_rollups([(task, timestamp) for task in tracked])
+    return tracked
+
+
+def add_to_rollups(completed):
+    """Add newly completed, tracked tasks to their (day, priority) rollup rows"""
+    totals = defaultdict(lambda: [0, 0, 0])
+    for task, timestamp in completed:
+        if not task.actual_seconds:
+            continue
+        total = totals[(timezone.localdate(timestamp), task.priority)]
+        total[0] += 1
+        total[1] += task.estimated_duration
+        total[2] += task.actual_seconds
+
+    for (day, priority), (count, estimated, actual) in totals.items():
+        rollup, _ = DurationRollup.objects.get_or_create(day=day, priority=priority)
+        DurationRollup.objects.filter(pk=rollup.pk).update(
+            task_count=F('task_count') + count,
+            estimated_minutes=F('estimated_minutes') + estimated,
+            actual_seconds=F('actual_seconds') + actual,
+        )
+
+
+def duration_report(since=None, group_by='priority'):
+    """Estimated vs actual totals from the rollups, grouped by 'priority' or 'day'"""
+    rollups = DurationRollup.objects.all()
+    if since is not None:
+        rollups = rollups.filter(day__gte=since)
+    return list(
+        rollups.values(group_by).annotate(
+            tasks=Sum('task_count'),
+            estimated_minutes=Sum('estimated_minutes'),
+            actual_seconds=Sum('actual_seconds'),
+        ).order_by(group_by)
+    )
@@ -1,11 +1,13 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 urlpatterns = [
     # Original home and process routes
     path('', views.home, name='home'),
     path('process/', views.process_todo, name='process_todo'),
     path('results/<int:task_list_id>/', views.results, name='results'),
+    path('results/<int:task_list_id>/export.<str:fmt>', views.export_task_list, name='export_task_list'),
+    path('archive/<int:task_list_id>/', views.archived_task_list, name='archived_task_list'),
     
     # New navigation routes
     path('personal-assistance/', views.personal_assistance, name='personal_assistance'),
@@ -14,4 +16,20 @@ urlpatterns = [
     path('personal-assistance/executive-function/todo-timeline/process/', views.process_todo_timeline, name='process_todo_timeline'),
     path('personal-assistance/executive-function/todo-timeline/dependencies/<int:task_list_id>/', views.todo_dependencies, name='todo_dependencies'),
     path('personal-assistance/executive-function/todo-timeline/execute/<int:task_list_id>/', views.timeline_execution, name='timeline_execution'),
-]
\ No newline at end of file
+    path('personal-assistance/executive-function/todo-timeline/execute/<int:task_list_id>/events/', views.timeline_events, name='timeline_events'),
+
+    # JSON API
+    path('api/v1/task-lists/', api.task_lists, name='api_task_lists'),
+    path('api/v1/task-lists/<int:task_list_id>/', api.task_list_detail, name='api_task_list_detail'),
+    path('api/v1/task-lists/<int:task_list_id>/tasks/', api.task_list_tasks, name='api_task_list_tasks'),
+    path('api/v1/task-lists/<int:task_list_id>/tasks/bulk/', api.task_list_bulk, name='api_task_list_bulk'),
+    path('api/v1/task-lists/<int:task_list_id>/tasks/complete/', api.task_list_complete, name='api_task_list_complete'),
+    path('api/v1/task-lists/<int:task_list_id>/tasks/<str:task_id>/similar/', api.task_similar, name='api_task_similar'),
+    path('api/v1/task-lists/<int:task_list_id>/events/', api.task_list_events, name='api_task_list_events'),
+    path('api/v1/task-lists/<int:task_list_id>/schedules/', api.task_list_schedules, name='api_task_list_schedules'),
+    path('api/v1/task-lists/<int:task_list_id>/schedules/optimize/', api.task_list_optimize, name='api_task_list_optimize'),
+    path('api/v1/search/', api.search, name='api_search'),
+
+    # Prometheus scrape endpoint
+    path('metrics', views.metrics, name='metrics'),
+]
@@ -1,7 +1,14 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpResponse
-from .models import TaskList, Task
+from django.conf import settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.crypto import constant_time_compare
+from django.db.models import F
+from .models import TaskList, Task, TaskListArchive
 from .services import TaskGroomer
+from .caching import cache_task_list_page, task_list_conditional
+from .events import can_stream, event_stream, task_list_channel
+from .export import FORMATS, export, parse_start
+from . import metrics as metrics_registry
 
 
 def home(request):
@@ -26,8 +33,7 @@ def process_todo(request):
     
     try:
         groomer = TaskGroomer()
-        task_list, analysis = groomer.process_todo(task_list_name, todo_text)
-        request.session['analysis'] = analysis
+        task_list, _ = groomer.process_todo(task_list_name, todo_text)
         return redirect('results', task_list_id=task_list.id)
     except ValueError as e:
         return render(request, 'tasks/home.html', {
@@ -52,8 +58,7 @@ def process_todo_timeline(request):
     
     try:
         groomer = TaskGroomer()
-        task_list, analysis = groomer.process_todo(task_list_name, todo_text, context=context)
-        request.session['analysis'] = analysis
+        task_list, _ = groomer.process_todo(task_list_name, todo_text, context=context)
         return redirect('todo_dependencies', task_list_id=task_list.id)
     except ValueError as e:
         return render(request, 'tasks/todo_timeline_input.html', {
@@ -63,16 +68,49 @@ def process_todo_timeline(request):
         })
 
 
+@task_list_conditional
+@cache_task_list_page
 def results(request, task_list_id):
-    task_list = get_object_or_404(TaskList, id=task_list_id)
+    task_list = TaskList.objects.filter(id=task_list_id).first()
+    if task_list is None:
+        # Archived lists stay viewable from their snapshot
+        get_object_or_404(TaskListArchive, original_id=task_list_id)
+        return redirect('archived_task_list', task_list_id=task_list_id)
     tasks = task_list.tasks.all()
-    analysis = request.session.get('analysis', '')
     
     return render(request, 'tasks/results.html', {
         'task_list': task_list,
         'tasks': tasks,
         'total_time': task_list.total_estimated_time(),
-        'analysis': analysis
+        'analysis': task_list.analysis
+    })
+
+
+def export_task_list(request, task_list_id, fmt):
+    """Stream a task list as CSV, JSONL or iCalendar (?start=<ISO 8601> for calendars)"""
+    if fmt not in FORMATS:
+        raise Http404("Unknown export format")
+    task_list = get_object_or_404(TaskList, id=task_list_id)
+    try:
+        start = parse_start(request.GET['start']) if request.GET.get('start') else None
+    except ValueError:
+        return HttpResponse("start must be an ISO 8601 date/time", status=400)
+
+    response = StreamingHttpResponse(export(fmt, [task_list.id], start=start), content_type=FORMATS[fmt])
+    response['Content-Disposition'] = f'attachment; filename="task-list-{task_list.id}.{fmt}"'
+    return response
+
+
+def archived_task_list(request, task_list_id):
+    archive = get_object_or_404(TaskListArchive, original_id=task_list_id)
+    snapshot = archive.load_snapshot()
+    tasks = snapshot['tasks']
+
+    return render(request, 'tasks/archived_task_list.html', {
+        'archive': archive,
+        'task_list': snapshot['task_list'],
+        'tasks': tasks,
+        'total_time': sum(task['estimated_duration'] for task in tasks)
     })
 
 
@@ -89,30 +127,79 @@ def todo_timeline_input(request):
     return render(request, 'tasks/todo_timeline_input.html')
 
 
+@task_list_conditional
+@cache_task_list_page
 def todo_dependencies(request, task_list_id):
     task_list = get_object_or_404(TaskList, id=task_list_id)
     tasks = task_list.tasks.all()
-    analysis = request.session.get('analysis', '')
     
     return render(request, 'tasks/todo_dependencies.html', {
         'task_list': task_list,
         'tasks': tasks,
-        'analysis': analysis
+        'analysis': task_list.analysis
     })
 
 
+@task_list_conditional
+@cache_task_list_page
 def timeline_execution(request, task_list_id):
     task_list = get_object_or_404(TaskList, id=task_list_id)
     tasks = task_list.tasks.all()
+    remaining_minutes = sum(task.estimated_duration for task in tasks if not task.completed)
+    
+    # Now/Next/parallel panels come from the ready frontier: incomplete tasks
+    # whose dependencies are all completed (one NOT EXISTS query)
+    ready_tasks = list(Task.objects.filter(task_list=task_list).ready())
+    sequential_tasks = [task for task in ready_tasks if not task.can_run_parallel]
+    parallel_tasks = [task for task in ready_tasks if task.can_run_parallel]
     
-    # Separate current task and parallel tasks for timeline display
-    current_task = tasks.filter(can_run_parallel=False).first()
-    parallel_tasks = tasks.filter(can_run_parallel=True)
+    current_task = sequential_tasks[0] if sequential_tasks else None
+    if len(sequential_tasks) > 1:
+        next_task = sequential_tasks[1]
+    elif current_task:
+        # Nothing else is ready yet: show the next blocked task in order
+        next_task = tasks.filter(completed=False, can_run_parallel=False).exclude(pk=current_task.pk).order_by(
+            F('schedule_order').asc(nulls_last=True), 'id'
+        ).first()
+    else:
+        next_task = None
     
     return render(request, 'tasks/timeline_execution.html', {
         'task_list': task_list,
         'tasks': tasks,
         'current_task': current_task,
+        'next_task': next_task,
         'parallel_tasks': parallel_tasks,
-        'total_time': task_list.total_estimated_time()
+        'total_time': task_list.total_estimated_time(),
+        'remaining_minutes': remaining_minutes,
+        'stream_events': can_stream(request),
     })
+
+
+async def timeline_events(request, task_list_id):
+    """
+    Server-Sent Events stream of a task list's timeline changes.
+
+    Needs an ASGI server (mindtimer.asgi): each open connection is an idle
+    coroutine, not a worker thread. Under WSGI this answers 204, which tells
+    EventSource not to reconnect.
+    """
+    if not await TaskList.objects.filter(id=task_list_id).aexists():
+        raise Http404("No TaskList matches the given query.")
+    if not can_stream(request):
+        return HttpResponse(status=204)
+    response = StreamingHttpResponse(
+        event_stream(task_list_channel(task_list_id), settings.TIMELINE_EVENTS_HEARTBEAT),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def metrics(request):
+    """Prometheus scrape endpoint (see tasks.metrics)"""
+    token = settings.METRICS_TOKEN
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    return HttpResponse(metrics_registry.render(), content_type=metrics_registry.CONTENT_TYPE)
@@ -141,6 +141,7 @@ class TestClaudeTaskGroomerUnit(BaseClaudeTestCase):
         self.assertEqual(task_list.name, "Test Grocery List")
         self.assertEqual(task_list.raw_input, "Buy groceries and cook dinner")
         self.assertEqual(analysis, GROCERY_TODO_RESPONSE['analysis'])
+        self.assertEqual(TaskList.objects.get(pk=task_list.pk).analysis, GROCERY_TODO_RESPONSE['analysis'])
         
         # Verify Tasks creation
         tasks = task_list.tasks.all()
@@ -5,6 +5,7 @@ import os
 import sys
 from django.test import TestCase
 from django.conf import settings
+from tasks.cassettes import cassette_path, use_cassette
 from tasks.models import TaskList, Task
 from tasks.services import ClaudeTaskGroomer
 
@@ -14,7 +15,12 @@ class BaseClaudeTestCase(TestCase):
     
     def setUp(self):
         """Common setup for Claude tests"""
-        self.groomer = ClaudeTaskGroomer()
+        if not settings.CLAUDE_API_KEY and cassette_path(self.id()).exists():
+            # A replayed test never sends the key
+            with self.settings(CLAUDE_API_KEY='cassette-replay'):
+                self.groomer = ClaudeTaskGroomer()
+        else:
+            self.groomer = ClaudeTaskGroomer()
         
     def create_test_task_list(self, name="Test List", raw_input="Test todo"):
         """Create a test TaskList for testing"""
@@ -87,13 +93,40 @@ def is_ai_testing_enabled():
 class ClaudeTestSkipMixin:
     """Mixin to skip tests when Claude API key is not available or AI testing is disabled"""
     
+    def use_claude_cassette(self):
+        """
+        Route this test's Claude calls through its cassette, tests/cassettes/<test id>.jsonl.gz.
+        A recorded test replays offline, even with AI testing disabled. With AI testing on,
+        CLAUDE_CASSETTE_MODE=record (re-record) or once (record what is missing) records it.
+        Returns True if the test is replaying.
+        """
+        cassette = getattr(self, '_claude_cassette', None)
+        if cassette is None:
+            path = cassette_path(self.id())
+            mode = settings.CLAUDE_CASSETTE_MODE
+            if is_ai_testing_enabled() and mode in ('record', 'once'):
+                if mode == 'record':
+                    path.unlink(missing_ok=True)
+            elif path.exists():
+                mode = 'replay'
+            else:
+                return False
+            context = use_cassette(path, mode)
+            cassette = self._claude_cassette = context.__enter__()
+            self.addCleanup(context.__exit__, None, None, None)
+        return cassette.mode != 'record' and cassette.path.exists()
+    
     def skip_if_no_claude_key(self):
         """Skip test if Claude API key is not configured"""
+        if self.use_claude_cassette():
+            return
         if not hasattr(settings, 'CLAUDE_API_KEY') or not settings.CLAUDE_API_KEY:
             self.skipTest("CLAUDE_API_KEY not configured - skipping integration test")
     
     def skip_if_claude_key_invalid(self):
         """Skip test if Claude API key appears to be placeholder"""
+        if self.use_claude_cassette():
+            return
         if (not hasattr(settings, 'CLAUDE_API_KEY') or 
             not settings.CLAUDE_API_KEY or
             'your_claude_api_key_here' in settings.CLAUDE_API_KEY.lower()):
@@ -101,6 +134,8 @@ class ClaudeTestSkipMixin:
     
     def skip_if_ai_testing_disabled(self):
         """Skip test if AI testing flag is not enabled"""
+        if self.use_claude_cassette():
+            return
         if not is_ai_testing_enabled():
             self.skipTest("AI testing disabled - use '--AItest-ON' flag or set AI_TEST_ENABLED=true to enable expensive AI tests")
 
@@ -142,6 +177,10 @@ def clean_test_data():
 def requires_claude_api(test_func):
     """Decorator to skip test if Claude API is not available or AI testing is disabled"""
     def wrapper(self, *args, **kwargs):
+        # Recorded tests replay from their cassette
+        if isinstance(self, ClaudeTestSkipMixin) and self.use_claude_cassette():
+            return test_func(self, *args, **kwargs)
+        
         # First check if AI testing is enabled
         if not is_ai_testing_enabled():
             self.skipTest("AI testing disabled - use '--AItest-ON' flag or set AI_TEST_ENABLED=true to enable expensive AI tests")